@@ -0,0 +1 @@
+"""Benchmarks for the Public Pool integration."""
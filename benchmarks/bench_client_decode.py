@@ -0,0 +1,52 @@
+"""Measure per-update CPU time of decoding and parsing /api/client payloads.
+
+Run from the repository root with Home Assistant installed:
+
+    python -m benchmarks.bench_client_decode
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import time
+
+from custom_components.public_pool.api import json_loads
+from custom_components.public_pool.coordinator import PublicPoolCoordinator
+
+from .payloads import client_payload
+
+WORKER_COUNTS = (10, 1_000, 10_000)
+
+
+def _cpu_per_call(func, iterations: int) -> float:
+    """Return the mean CPU time of func in milliseconds."""
+    start = time.process_time()
+    for _ in range(iterations):
+        func()
+    return (time.process_time() - start) * 1000 / iterations
+
+
+def main() -> None:
+    """Print a table of CPU time per update for each decoding path."""
+    # The parser does not touch coordinator state, so skip __init__
+    coordinator = PublicPoolCoordinator.__new__(PublicPoolCoordinator)
+    parse = coordinator._parse_client_data
+
+    print(f"decoder: {json_loads.__module__}")
+    print(f"{'workers':>8} {'bytes':>10} {'stdlib ms':>10} {'fast ms':>10} {'unchanged ms':>13}")
+
+    for workers in WORKER_COUNTS:
+        body = json.dumps(client_payload(workers)).encode()
+        iterations = max(5, 20_000 // workers)
+
+        stdlib = _cpu_per_call(lambda: parse(json.loads(body)), iterations)
+        fast = _cpu_per_call(lambda: parse(json_loads(body)), iterations)
+        unchanged = _cpu_per_call(
+            lambda: hashlib.blake2b(body, digest_size=16).digest(), iterations
+        )
+
+        print(f"{workers:>8} {len(body):>10} {stdlib:>10.3f} {fast:>10.3f} {unchanged:>13.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,22 @@
+"""Measure coordinator refreshes against the local stub server.
+
+Each round refreshes every entry's coordinator once; no entities are
+attached. Run from the repository root with Home Assistant installed:
+
+    python -m benchmarks.bench_coordinator --entries 1 50 --workers 10 1000
+"""
+from __future__ import annotations
+
+import asyncio
+
+from .harness import async_create_coordinators, async_run_matrix, parse_args
+
+
+def main() -> None:
+    """Print wall time, CPU, allocations and loop blocking per round."""
+    args = parse_args(__doc__.splitlines()[0])
+    asyncio.run(async_run_matrix(args, async_create_coordinators))
+
+
+if __name__ == "__main__":
+    main()
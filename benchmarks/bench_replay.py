@@ -0,0 +1,127 @@
+"""Replay a response capture through a coordinator and measure each refresh.
+
+Feeds the responses written by the public_pool.capture service to one
+entry coordinator tracking every captured address, with the sensor
+platform set up unless --no-sensors is given. With --speed 0 (the
+default) the capture runs as fast as possible, one refresh per update
+interval of capture time; with --speed 1 it runs in real time. No network
+access is needed. Run from the repository root with Home Assistant
+installed:
+
+    python -m benchmarks.bench_replay capture_20240101_120000.jsonl.gz --speed 0
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+
+from custom_components.public_pool.capture import read_captures
+from custom_components.public_pool.coordinator import (
+    PublicPoolCoordinator,
+    PublicPoolSharedCoordinator,
+)
+from custom_components.public_pool.ratelimit import host_rate_limiter
+
+from .harness import (
+    HEADER,
+    UNLIMITED_RATE,
+    Measurement,
+    async_bench_hass,
+    async_setup_sensors,
+    measure,
+    median,
+)
+from .replay import REPLAY_URL, ReplaySession
+
+
+def report(label: str, workers: int, result: Measurement) -> str:
+    """Format one report row, labelled in the entries column."""
+    return (
+        f"{label:>7} {workers:>7} {result.wall_ms:>9.1f} {result.cpu_ms:>9.1f} "
+        f"{result.peak_kib:>10.0f} {result.max_lag_ms:>10.1f} {result.blocked_ms:>10.1f}"
+    )
+
+
+async def async_replay(args: argparse.Namespace) -> None:
+    """Refresh through the whole capture and print the cost of the refreshes."""
+    session = ReplaySession(read_captures(args.capture), args.speed)
+    addresses = session.addresses
+    if not addresses:
+        print(f"No client responses in {args.capture}")
+        return
+    limiter = host_rate_limiter(REPLAY_URL)
+    limiter.rate = limiter.burst = UNLIMITED_RATE
+
+    async with async_bench_hass() as hass:
+        shared = PublicPoolSharedCoordinator(hass, REPLAY_URL, 300, session)
+        coordinator = PublicPoolCoordinator(
+            hass, "replay", addresses, REPLAY_URL, 60, session, shared
+        )
+        shared.async_add_listener(coordinator.async_handle_shared_update)
+        if not args.no_sensors:
+            await async_setup_sensors(hass, coordinator, 0)
+
+        async def refresh() -> None:
+            # As the refresh service does: pool data first, nothing reused
+            await shared.async_refresh_requested(0)
+            await coordinator.async_refresh_requested(None, 0)
+
+        results: list[Measurement] = []
+        workers = 0
+        while not session.finished:
+            results.append(await measure(refresh))
+            # Worker entities are added from a coordinator listener
+            await hass.async_block_till_done()
+            workers = max(
+                workers,
+                sum(
+                    len(address_data["workers"])
+                    for address_data in coordinator.data["addresses"].values()
+                ),
+            )
+            await session.async_advance(coordinator.update_interval.total_seconds())
+
+        await coordinator.async_shutdown()
+        await shared.async_shutdown()
+
+    span = (session.end - session.start) / 60
+    print(
+        f"{len(results)} refreshes of {len(addresses)} addresses over "
+        f"{span:.0f} minutes of capture; responses served {dict(session.served)}"
+    )
+    print(HEADER.replace("entries", "refresh"))
+    print(report("first", workers, results[0]))
+    if len(results) > 1:
+        print(report("median", workers, median(results[1:])))
+        print(
+            report(
+                "max",
+                workers,
+                Measurement(
+                    *(
+                        max(getattr(result, field) for result in results[1:])
+                        for field in Measurement.__dataclass_fields__
+                    )
+                ),
+            )
+        )
+
+
+def main() -> None:
+    """Print wall time, CPU and loop blocking of the replayed refreshes."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("capture", help="file written by the capture service")
+    parser.add_argument(
+        "--speed",
+        type=float,
+        default=0.0,
+        help="multiple of real time, 0 = as fast as possible",
+    )
+    parser.add_argument(
+        "--no-sensors", action="store_true", help="refresh without the sensor platform"
+    )
+    asyncio.run(async_replay(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""Measure refreshes including sensor state writes against the stub server.
+
+Like bench_coordinator, but with the sensor platform set up for every
+entry, so each round also pays for change detection and state writes.
+Run from the repository root with Home Assistant installed:
+
+    python -m benchmarks.bench_sensors --entries 1 50 --workers 10 1000
+"""
+from __future__ import annotations
+
+import asyncio
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.public_pool.coordinator import PublicPoolCoordinator
+
+from .harness import (
+    async_create_coordinators,
+    async_run_matrix,
+    async_setup_sensors,
+    parse_args,
+)
+
+
+async def async_prepare(
+    hass: HomeAssistant, pool_url: str, entries: int
+) -> list[PublicPoolCoordinator]:
+    """Create the coordinators and set up sensors for each of them."""
+    coordinators = await async_create_coordinators(hass, pool_url, entries)
+    for index, coordinator in enumerate(coordinators):
+        await async_setup_sensors(hass, coordinator, index)
+    return coordinators
+
+
+def main() -> None:
+    """Print wall time, CPU, allocations and loop blocking per round."""
+    args = parse_args(__doc__.splitlines()[0])
+    asyncio.run(async_run_matrix(args, async_prepare))
+
+
+if __name__ == "__main__":
+    main()
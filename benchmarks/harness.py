@@ -0,0 +1,316 @@
+"""Shared pieces of the load benchmarks: Home Assistant setup and meters."""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections.abc import AsyncIterator, Awaitable, Callable
+import contextlib
+from dataclasses import dataclass
+from datetime import timedelta
+import logging
+import statistics
+import tempfile
+import time
+import tracemalloc
+
+# config_entries first: importing loader before core is circular
+from homeassistant import config_entries, loader
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import (
+    device_registry as dr,
+    entity,
+    entity_registry as er,
+    translation,
+)
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.entity_platform import EntityPlatform
+
+from custom_components.public_pool import sensor
+from custom_components.public_pool.const import (
+    CONF_BITCOIN_ADDRESS,
+    CONF_BITCOIN_ADDRESSES,
+    CONF_POOL_URL,
+    DOMAIN,
+)
+from custom_components.public_pool.coordinator import (
+    PublicPoolCoordinator,
+    async_acquire_shared_coordinator,
+)
+from custom_components.public_pool.ratelimit import host_rate_limiter
+
+from .stub_server import StubPublicPool
+
+_LOGGER = logging.getLogger(__name__)
+
+# How often the lag probe wakes up; lag is any delay beyond this
+PROBE_INTERVAL = 0.005
+
+# Rate limit standing in for "unlimited", in requests per second
+UNLIMITED_RATE = 1e12
+
+
+@dataclass
+class Measurement:
+    """Cost of one measured round."""
+
+    wall_ms: float
+    cpu_ms: float
+    peak_kib: float
+    max_lag_ms: float
+    blocked_ms: float
+
+
+class LoopLagProbe:
+    """Measure how long the event loop was blocked.
+
+    A task sleeps PROBE_INTERVAL in a loop; any extra delay before it runs
+    again is time the loop spent in some other callback.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the probe."""
+        self.max_lag = 0.0
+        self.total_lag = 0.0
+        self._running = False
+        self._task: asyncio.Task | None = None
+
+    async def _run(self) -> None:
+        """Record the overshoot of every sleep."""
+        loop = asyncio.get_running_loop()
+        while self._running:
+            start = loop.time()
+            await asyncio.sleep(PROBE_INTERVAL)
+            lag = loop.time() - start - PROBE_INTERVAL
+            if lag > 0:
+                self.max_lag = max(self.max_lag, lag)
+                self.total_lag += lag
+
+    def start(self) -> None:
+        """Start probing."""
+        self._running = True
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop probing once the pending sleep, and its lag, is recorded."""
+        self._running = False
+        if self._task is not None:
+            await self._task
+
+
+async def measure(
+    round_: Callable[[], Awaitable[object]], trace_allocations: bool = False
+) -> Measurement:
+    """Run one round and measure it.
+
+    CPU time is the main thread's only, so the stub server thread does not
+    count. tracemalloc slows everything down, so the allocation peak is only
+    measured, and only meaningful, when trace_allocations is set.
+    """
+    probe = LoopLagProbe()
+    probe.start()
+    # Let the probe take its first sleep before the round starts
+    await asyncio.sleep(0)
+    if trace_allocations:
+        tracemalloc.start()
+    wall = time.perf_counter()
+    cpu = time.thread_time()
+
+    await round_()
+
+    cpu = time.thread_time() - cpu
+    wall = time.perf_counter() - wall
+    peak = 0
+    if trace_allocations:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    await probe.stop()
+
+    return Measurement(
+        wall_ms=wall * 1000,
+        cpu_ms=cpu * 1000,
+        peak_kib=peak / 1024,
+        max_lag_ms=probe.max_lag * 1000,
+        blocked_ms=probe.total_lag * 1000,
+    )
+
+
+def median(measurements: list[Measurement]) -> Measurement:
+    """Return the per-field median of several rounds."""
+    return Measurement(
+        *(
+            statistics.median(getattr(measurement, field) for measurement in measurements)
+            for field in Measurement.__dataclass_fields__
+        )
+    )
+
+
+HEADER = (
+    f"{'entries':>7} {'workers':>7} {'wall ms':>9} {'cpu ms':>9} "
+    f"{'peak KiB':>10} {'max lag ms':>10} {'blocked ms':>10}"
+)
+
+
+def row(entries: int, workers: int, result: Measurement) -> str:
+    """Format one report row."""
+    return (
+        f"{entries:>7} {workers:>7} {result.wall_ms:>9.1f} {result.cpu_ms:>9.1f} "
+        f"{result.peak_kib:>10.0f} {result.max_lag_ms:>10.1f} {result.blocked_ms:>10.1f}"
+    )
+
+
+@contextlib.asynccontextmanager
+async def async_bench_hass() -> AsyncIterator[HomeAssistant]:
+    """Yield a Home Assistant instance with the registries loaded."""
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        # Quiet the custom integration warning
+        logging.getLogger(loader.__name__).setLevel(logging.ERROR)
+        # The parts of bootstrap the sensor platform relies on
+        loader.async_setup(hass)
+        translation.async_setup(hass)
+        entity.async_setup(hass)
+        hass.config_entries = config_entries.ConfigEntries(hass, {})
+        await dr.async_load(hass)
+        await er.async_load(hass)
+        hass.data.setdefault(DOMAIN, {})
+        try:
+            yield hass
+        finally:
+            await hass.async_stop(force=True)
+
+
+def bench_address(index: int) -> str:
+    """Return a distinct fake address per entry."""
+    return f"bc1qbench{index:06d}"
+
+
+async def async_create_coordinators(
+    hass: HomeAssistant, pool_url: str, entries: int
+) -> list[PublicPoolCoordinator]:
+    """Create entry coordinators sharing one pool poller, as setup does."""
+    coordinators = []
+    for index in range(entries):
+        shared = await async_acquire_shared_coordinator(hass, pool_url, True, 300)
+        coordinators.append(
+            PublicPoolCoordinator(
+                hass,
+                f"bench{index}",
+                [bench_address(index)],
+                pool_url,
+                60,
+                async_get_clientsession(hass),
+                shared,
+            )
+        )
+    await coordinators[0].shared.async_ensure_first_refresh()
+    return coordinators
+
+
+async def async_setup_sensors(
+    hass: HomeAssistant, coordinator: PublicPoolCoordinator, index: int
+) -> EntityPlatform:
+    """Set up the sensor platform for one coordinator, as Home Assistant does."""
+    entry = config_entries.ConfigEntry(
+        version=1,
+        minor_version=1,
+        domain=DOMAIN,
+        title=f"bench {index}",
+        data={
+            CONF_POOL_URL: coordinator.pool_url,
+            CONF_BITCOIN_ADDRESS: coordinator.bitcoin_address,
+            CONF_BITCOIN_ADDRESSES: coordinator.bitcoin_addresses,
+        },
+        source="user",
+        entry_id=f"bench{index}",
+    )
+    # Registered without setting it up, like MockConfigEntry.add_to_hass
+    hass.config_entries._entries[entry.entry_id] = entry
+    hass.data[DOMAIN][entry.entry_id] = coordinator
+    platform = EntityPlatform(
+        hass=hass,
+        logger=_LOGGER,
+        domain="sensor",
+        platform_name=DOMAIN,
+        platform=sensor,
+        scan_interval=timedelta(seconds=60),
+        entity_namespace=None,
+    )
+    await platform.async_setup_entry(entry)
+    return platform
+
+
+ENTRY_COUNTS = (1, 50, 500)
+WORKER_COUNTS = (10, 1_000, 10_000)
+
+
+def parse_args(description: str) -> argparse.Namespace:
+    """Parse the options shared by the load benchmarks."""
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("--entries", type=int, nargs="+", default=ENTRY_COUNTS)
+    parser.add_argument("--workers", type=int, nargs="+", default=WORKER_COUNTS)
+    parser.add_argument("--rounds", type=int, default=5, help="measured refreshes per case")
+    parser.add_argument("--latency", type=float, default=0.0, help="stub seconds per request")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="stub 503 rate, 0-1")
+    parser.add_argument(
+        "--rate-limit",
+        type=float,
+        default=0.0,
+        help="host rate limit in requests per second, 0 = unlimited",
+    )
+    parser.add_argument(
+        "--max-total-workers",
+        type=int,
+        default=1_000_000,
+        help="skip cases where entries x workers exceeds this",
+    )
+    return parser.parse_args()
+
+
+async def async_run_matrix(
+    args: argparse.Namespace,
+    prepare: Callable[[HomeAssistant, str, int], Awaitable[list[PublicPoolCoordinator]]],
+) -> None:
+    """Measure refresh rounds of all coordinators for each case.
+
+    prepare creates the coordinators of a case; one refresh round runs
+    unmeasured first so entity creation and cold parsing are not counted.
+    Reported times are medians per round, where a round refreshes every
+    entry once; the allocation peak comes from one extra traced round.
+    """
+    print(HEADER)
+
+    for workers in args.workers:
+        stub = StubPublicPool(workers, args.latency, args.error_rate)
+        url = stub.start_in_thread()
+        limiter = host_rate_limiter(url)
+        if args.rate_limit:
+            limiter.rate = args.rate_limit
+        else:
+            limiter.rate = limiter.burst = UNLIMITED_RATE
+        try:
+            for entries in args.entries:
+                if entries * workers > args.max_total_workers:
+                    print(f"{entries:>7} {workers:>7} skipped")
+                    continue
+                async with async_bench_hass() as hass:
+                    coordinators = await prepare(hass, url, entries)
+
+                    async def refresh_all() -> None:
+                        await asyncio.gather(
+                            *(coordinator.async_refresh() for coordinator in coordinators)
+                        )
+
+                    await refresh_all()
+                    # Worker entities are added from a coordinator listener
+                    await hass.async_block_till_done()
+                    results = [await measure(refresh_all) for _ in range(args.rounds)]
+                    result = median(results)
+                    result.peak_kib = (await measure(refresh_all, True)).peak_kib
+                    print(row(entries, workers, result))
+
+                    # Cancel scheduled refreshes before the session closes
+                    for coordinator in coordinators:
+                        await coordinator.async_shutdown()
+                    await coordinators[0].shared.async_shutdown()
+        finally:
+            stub.stop_thread()
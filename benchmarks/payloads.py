@@ -0,0 +1,50 @@
+"""Synthetic Public Pool API payloads for benchmarks."""
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+import random
+
+
+def client_payload(workers: int, seed: int = 0) -> dict:
+    """Return an /api/client/{address} payload with the given worker count."""
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+
+    return {
+        "bestDifficulty": rng.uniform(1e6, 1e9),
+        "workersCount": workers,
+        "workers": [
+            {
+                "sessionId": f"{index:08x}",
+                "name": f"worker-{index}",
+                "bestDifficulty": rng.uniform(1e3, 1e8),
+                "hashRate": rng.uniform(0.4e12, 1.2e12),
+                "startTime": (now - timedelta(hours=rng.uniform(1, 72))).isoformat(),
+                "lastSeen": (now - timedelta(seconds=rng.uniform(0, 600))).isoformat(),
+            }
+            for index in range(workers)
+        ],
+    }
+
+
+def pool_payload(blocks: int = 25, height: int = 850_000) -> dict:
+    """Return an /api/pool payload."""
+    return {
+        "totalHashRate": 4.2e15,
+        "totalMiners": 120,
+        "blockHeight": height,
+        "fee": 0,
+        "blocksFound": [
+            {"height": height - 1000 * index, "minerAddress": "bc1qexample", "worker": "worker-0"}
+            for index in range(blocks)
+        ],
+    }
+
+
+def network_payload(height: int = 850_000) -> dict:
+    """Return an /api/network payload."""
+    return {
+        "blocks": height,
+        "difficulty": 8.6e13,
+        "networkhashps": 6.1e20,
+    }
@@ -0,0 +1,161 @@
+"""Replay of captured Public Pool responses, in place of an aiohttp session.
+
+ReplaySession answers session.get with the responses written by the
+capture service. Each path is answered with its latest response captured
+at or before the replay clock, so a coordinator polling on its own
+schedule sees the pool as it looked at that time, worker list churn and
+block changes included. The clock follows the wall clock times the
+speed, or only moves when advanced, to run through a capture as fast as
+possible.
+"""
+from __future__ import annotations
+
+import asyncio
+from bisect import bisect_right
+from collections import Counter, defaultdict
+from collections.abc import Iterable
+from dataclasses import dataclass
+import time
+from typing import Any
+from urllib.parse import urlsplit
+
+from aiohttp import hdrs
+from multidict import CIMultiDict, CIMultiDictProxy
+
+from custom_components.public_pool.const import API_CLIENT
+
+# Stands in for the pool URL; requests never leave the process
+REPLAY_URL = "http://replay.invalid"
+
+CLIENT_PREFIX = API_CLIENT.format(address="")
+
+
+@dataclass
+class ReplayedResponse:
+    """One captured response, as the API client reads it."""
+
+    status: int
+    headers: CIMultiDictProxy[str]
+    body: bytes
+    elapsed: float
+
+    async def read(self) -> bytes:
+        """Return the body."""
+        return self.body
+
+
+NOT_CAPTURED = ReplayedResponse(404, CIMultiDictProxy(CIMultiDict()), b"", 0.0)
+
+
+class _ReplayRequest:
+    """Awaitable context of session.get, sleeping the captured latency first."""
+
+    def __init__(self, response: ReplayedResponse, delay: float) -> None:
+        """Initialize with the response and how long to wait for it."""
+        self._response = response
+        self._delay = delay
+
+    async def __aenter__(self) -> ReplayedResponse:
+        """Wait as long as the pool took, then return the response."""
+        if self._delay:
+            await asyncio.sleep(self._delay)
+        return self._response
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        """Leave the request context."""
+
+
+class ReplaySession:
+    """Serve captured responses through the session.get interface.
+
+    With a speed, the replay clock runs at that multiple of the wall clock
+    from the first request on, and responses wait their captured latency
+    divided by it. With a speed of 0, the clock only moves through
+    async_advance and responses are immediate.
+
+    A captured 304 is replayed as 304 to conditional requests; other
+    requests get the last 200 captured before it, as the client that
+    captured it had cached that one.
+    """
+
+    def __init__(self, records: Iterable[dict[str, Any]], speed: float = 0.0) -> None:
+        """Index records, as yielded by read_captures, by path."""
+        self.speed = speed
+        self._times: dict[str, list[float]] = defaultdict(list)
+        self._responses: dict[str, list[tuple[ReplayedResponse, ReplayedResponse | None]]] = (
+            defaultdict(list)
+        )
+        last_ok: dict[str, ReplayedResponse] = {}
+        for record in sorted(records, key=lambda record: record["t"]):
+            path = record["path"]
+            response = ReplayedResponse(
+                record["status"],
+                CIMultiDictProxy(CIMultiDict(record["headers"])),
+                record["body"],
+                record["elapsed"],
+            )
+            if response.status == 200:
+                last_ok[path] = response
+            self._times[path].append(record["t"])
+            self._responses[path].append((response, last_ok.get(path)))
+
+        self.start = min((times[0] for times in self._times.values()), default=0.0)
+        self.end = max((times[-1] for times in self._times.values()), default=0.0)
+        self._offset = 0.0
+        # Real time replays start with the first request
+        self._started: float | None = None
+        self.served: Counter[int] = Counter()
+
+    @property
+    def addresses(self) -> list[str]:
+        """Return the addresses with captured client responses."""
+        return [
+            path.removeprefix(CLIENT_PREFIX)
+            for path in self._times
+            if path.startswith(CLIENT_PREFIX)
+        ]
+
+    @property
+    def now(self) -> float:
+        """Return the capture time being replayed."""
+        now = self.start + self._offset
+        if self.speed and self._started is not None:
+            now += (time.monotonic() - self._started) * self.speed
+        return now
+
+    @property
+    def finished(self) -> bool:
+        """Return whether the clock is past the last captured response."""
+        return self.now > self.end
+
+    async def async_advance(self, seconds: float) -> None:
+        """Move the clock on by seconds of capture time, waiting if in real time."""
+        if self.speed:
+            await asyncio.sleep(seconds / self.speed)
+        else:
+            self._offset += seconds
+
+    def _response(self, path: str, conditional: bool) -> ReplayedResponse:
+        """Return the response to a request for path at the current time."""
+        responses = self._responses.get(path)
+        if not responses:
+            return NOT_CAPTURED
+        # Before its first capture, a path answers with that first one
+        index = max(bisect_right(self._times[path], self.now) - 1, 0)
+        response, last_ok = responses[index]
+        if response.status == 304 and not conditional and last_ok is not None:
+            return last_ok
+        return response
+
+    def get(
+        self, url: str, headers: dict[str, str] | None = None, **kwargs: Any
+    ) -> _ReplayRequest:
+        """Answer a GET like aiohttp.ClientSession.get; other arguments are ignored."""
+        if self._started is None:
+            self._started = time.monotonic()
+        headers = headers or {}
+        conditional = hdrs.IF_NONE_MATCH in headers or hdrs.IF_MODIFIED_SINCE in headers
+        response = self._response(urlsplit(url).path, conditional)
+        self.served[response.status] += 1
+        delay = response.elapsed / self.speed if self.speed else 0.0
+        return _ReplayRequest(response, delay)
@@ -0,0 +1,156 @@
+"""Local stand-in for a Public Pool server, for offline benchmarks.
+
+Serves /api/pool, /api/network, /api/client/{address}, /api/info and
+/api/share/top-difficulties from pre-encoded bodies, with configurable
+latency and error rate. Client bodies rotate between a few variants so
+successive polls see changed data, as they would on a live pool.
+
+Run standalone from the repository root:
+
+    python -m benchmarks.stub_server --workers 1000 --latency 0.05 --port 8080
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from dataclasses import dataclass
+import itertools
+import json
+import random
+import threading
+
+from aiohttp import web
+
+from .payloads import client_payload, network_payload, pool_payload
+
+# Distinct client bodies served in rotation
+CLIENT_VARIANTS = 3
+
+
+@dataclass
+class StubStats:
+    """Requests served by the stub."""
+
+    requests: int = 0
+    errors: int = 0
+
+
+class StubPublicPool:
+    """aiohttp application imitating the Public Pool API."""
+
+    def __init__(
+        self,
+        workers: int = 10,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int = 0,
+    ) -> None:
+        """Pre-encode the bodies served for the given worker count."""
+        self.latency = latency
+        self.error_rate = error_rate
+        self.stats = StubStats()
+        self._rng = random.Random(seed)
+        self._client_bodies = itertools.cycle(
+            [
+                json.dumps(client_payload(workers, seed + variant)).encode()
+                for variant in range(CLIENT_VARIANTS)
+            ]
+        )
+        self._pool_body = json.dumps(pool_payload()).encode()
+        self._network_body = json.dumps(network_payload()).encode()
+        self._info_body = json.dumps({"uptime": "2024-01-01T00:00:00.000Z"}).encode()
+        self._top_body = json.dumps(
+            [{"bestDifficulty": 1e12 / rank, "bestDifficultyUserAgent": "bench"} for rank in range(1, 11)]
+        ).encode()
+        self._runner: web.AppRunner | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self.url = ""
+
+    def _app(self) -> web.Application:
+        """Return the application with all routes."""
+        app = web.Application()
+        app.router.add_get("/api/pool", self._route(lambda: self._pool_body))
+        app.router.add_get("/api/network", self._route(lambda: self._network_body))
+        app.router.add_get("/api/info", self._route(lambda: self._info_body))
+        app.router.add_get(
+            "/api/share/top-difficulties", self._route(lambda: self._top_body)
+        )
+        app.router.add_get(
+            "/api/client/{address}", self._route(lambda: next(self._client_bodies))
+        )
+        return app
+
+    def _route(self, body):
+        """Return a handler serving body() after the configured latency."""
+
+        async def handler(request: web.Request) -> web.Response:
+            self.stats.requests += 1
+            if self.latency:
+                await asyncio.sleep(self.latency)
+            if self._rng.random() < self.error_rate:
+                self.stats.errors += 1
+                return web.Response(status=503)
+            return web.Response(body=body(), content_type="application/json")
+
+        return handler
+
+    async def async_start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Serve on the running loop and return the base URL."""
+        self._runner = web.AppRunner(self._app(), access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        bound_port = site._server.sockets[0].getsockname()[1]
+        self.url = f"http://{host}:{bound_port}"
+        return self.url
+
+    async def async_stop(self) -> None:
+        """Stop serving."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def start_in_thread(self) -> str:
+        """Serve from a background thread with its own loop.
+
+        Keeps the stub's own work off the event loop being measured.
+        """
+        started = threading.Event()
+
+        def run() -> None:
+            self._loop = asyncio.new_event_loop()
+            self._loop.run_until_complete(self.async_start())
+            started.set()
+            self._loop.run_forever()
+            self._loop.run_until_complete(self.async_stop())
+            self._loop.close()
+
+        self._thread = threading.Thread(target=run, name="public-pool-stub", daemon=True)
+        self._thread.start()
+        started.wait()
+        return self.url
+
+    def stop_thread(self) -> None:
+        """Stop a stub started with start_in_thread."""
+        if self._loop is not None and self._thread is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._thread = None
+
+
+def main() -> None:
+    """Serve the stub until interrupted."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds per request")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="0-1, answered with 503")
+    parser.add_argument("--port", type=int, default=8080)
+    args = parser.parse_args()
+
+    stub = StubPublicPool(args.workers, args.latency, args.error_rate)
+    web.run_app(stub._app(), port=args.port, access_log=None)
+
+
+if __name__ == "__main__":
+    main()
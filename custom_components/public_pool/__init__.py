@@ -7,49 +7,123 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.typing import ConfigType
 
 from .const import (
     CONF_BITCOIN_ADDRESS,
+    CONF_BITCOIN_ADDRESSES,
+    CONF_HASHRATE_THRESHOLD,
+    CONF_MAX_CONCURRENCY,
+    CONF_MIRROR_URLS,
+    CONF_POOL_SCAN_INTERVAL,
     CONF_POOL_URL,
     CONF_SCAN_INTERVAL,
+    CONF_STALE_TTL,
+    CONF_SUMMARY_MODE,
     CONF_VERIFY_SSL,
+    CONF_WORKER_STATISTICS,
+    DEFAULT_HASHRATE_THRESHOLD,
+    DEFAULT_MAX_CONCURRENCY,
+    DEFAULT_POOL_SCAN_INTERVAL,
     DEFAULT_SCAN_INTERVAL,
+    DEFAULT_STALE_TTL,
+    DEFAULT_SUMMARY_MODE,
     DEFAULT_VERIFY_SSL,
+    DEFAULT_WORKER_STATISTICS,
     DOMAIN,
     PLATFORMS,
+    STORAGE_KEY,
+    STORAGE_VERSION,
 )
-from .coordinator import PublicPoolCoordinator
+from .coordinator import (
+    PublicPoolCoordinator,
+    async_acquire_shared_coordinator,
+    async_release_shared_coordinator,
+)
+from .services import async_setup_services
 
 _LOGGER = logging.getLogger(__name__)
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the Public Pool services."""
+    async_setup_services(hass)
+    return True
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Public Pool from a config entry."""
-    bitcoin_address = entry.data[CONF_BITCOIN_ADDRESS]
+    bitcoin_addresses = entry.data.get(CONF_BITCOIN_ADDRESSES) or [
+        entry.data[CONF_BITCOIN_ADDRESS]
+    ]
     pool_url = entry.data[CONF_POOL_URL]
+    mirror_urls = entry.data.get(CONF_MIRROR_URLS, [])
+    worker_statistics = entry.data.get(CONF_WORKER_STATISTICS, DEFAULT_WORKER_STATISTICS)
     scan_interval = entry.data.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
+    pool_scan_interval = entry.data.get(CONF_POOL_SCAN_INTERVAL, DEFAULT_POOL_SCAN_INTERVAL)
     verify_ssl = entry.data.get(CONF_VERIFY_SSL, DEFAULT_VERIFY_SSL)
+    max_concurrency = entry.data.get(CONF_MAX_CONCURRENCY, DEFAULT_MAX_CONCURRENCY)
+    summary_mode = entry.data.get(CONF_SUMMARY_MODE, DEFAULT_SUMMARY_MODE)
+    hashrate_threshold = entry.data.get(CONF_HASHRATE_THRESHOLD, DEFAULT_HASHRATE_THRESHOLD)
+    stale_ttl = entry.data.get(CONF_STALE_TTL, DEFAULT_STALE_TTL)
     
-    _LOGGER.info(f"Setting up Public Pool for address {bitcoin_address}")
+    _LOGGER.info(f"Setting up Public Pool for address(es) {', '.join(bitcoin_addresses)}")
     
     # Get aiohttp session
     session = async_get_clientsession(hass, verify_ssl=verify_ssl)
     
+    # Pool and network data are shared by every entry on the same pool
+    shared = await async_acquire_shared_coordinator(
+        hass, pool_url, verify_ssl, pool_scan_interval, mirror_urls
+    )
+    
     # Create coordinator
     coordinator = PublicPoolCoordinator(
         hass=hass,
-        bitcoin_address=bitcoin_address,
+        entry_id=entry.entry_id,
+        bitcoin_addresses=bitcoin_addresses,
         pool_url=pool_url,
         scan_interval=scan_interval,
         session=session,
+        shared=shared,
+        max_concurrency=max_concurrency,
+        summary_mode=summary_mode,
+        hashrate_threshold=hashrate_threshold,
+        stale_ttl=stale_ttl,
+        mirror_urls=mirror_urls,
+        worker_statistics=worker_statistics,
     )
     
+    if await coordinator.async_restore():
+        # Sensors start from the last snapshot; fetch live data in the background
+        async def _async_first_refresh() -> None:
+            await shared.async_ensure_first_refresh()
+            await coordinator.async_refresh()
+        
+        entry.async_create_background_task(
+            hass, _async_first_refresh(), f"{DOMAIN} first refresh {entry.entry_id}"
+        )
+    else:
+        # Perform initial refresh
+        try:
+            await shared.async_ensure_first_refresh()
+            await coordinator.async_config_entry_first_refresh()
+        except Exception:
+            await async_release_shared_coordinator(hass, shared, pool_scan_interval)
+            raise
+    
     # Store coordinator
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][entry.entry_id] = coordinator
     
-    # Perform initial refresh
-    await coordinator.async_config_entry_first_refresh()
+    # Push shared pool/network updates to this entry's sensors
+    entry.async_on_unload(
+        shared.async_add_listener(coordinator.async_handle_shared_update)
+    )
     
     # Forward entry setup to platforms
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
@@ -62,6 +136,16 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id)
+        coordinator = hass.data[DOMAIN].pop(entry.entry_id)
+        await async_release_shared_coordinator(
+            hass,
+            coordinator.shared,
+            entry.data.get(CONF_POOL_SCAN_INTERVAL, DEFAULT_POOL_SCAN_INTERVAL),
+        )
     
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the saved snapshot when an entry is deleted."""
+    await Store(hass, STORAGE_VERSION, STORAGE_KEY.format(entry_id=entry.entry_id)).async_remove()
@@ -0,0 +1,676 @@
+"""API client for Public Pool."""
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+import hashlib
+import logging
+import time
+from typing import Any
+
+import aiohttp
+from aiohttp import hdrs
+
+try:
+    from orjson import loads as json_loads
+except ImportError:  # pragma: no cover - orjson ships with Home Assistant
+    from json import loads as json_loads
+
+from .capture import ResponseCapture
+from .const import (
+    API_CLIENT,
+    API_INFO,
+    API_NETWORK,
+    API_POOL,
+    API_SHARE_TOP,
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_RESET_TIMEOUT,
+    CONNECT_TIMEOUT,
+    MAX_BACKOFF_INTERVAL,
+    MAX_RETRIES,
+    RATE_LIMIT_DEFAULT_DELAY,
+    RATE_LIMIT_MAX_WAIT,
+    READ_TIMEOUT,
+    REQUEST_TIMEOUT,
+    RETRY_BACKOFF,
+    RETRY_BUDGET_MAX,
+    RETRY_BUDGET_RATIO,
+)
+from .mirrors import Mirror, MirrorSet
+from .ratelimit import HostRateLimiter, host_rate_limiter, parse_retry_after
+from .stats import RequestStats
+
+_LOGGER = logging.getLogger(__name__)
+
+# Statuses worth retrying; anything else means the pool answered
+TRANSIENT_STATUSES = {429, 500, 502, 503, 504}
+
+
+class PublicPoolRequestError(Exception):
+    """A request to Public Pool did not return usable data."""
+
+    def __init__(
+        self,
+        message: str,
+        transient: bool,
+        reason: str = "error",
+        retry_after: float | None = None,
+    ) -> None:
+        """Initialize the error.
+
+        reason is a short label for failure counters. retry_after is set
+        when the host throttled the request, in seconds until it may be
+        asked again.
+        """
+        super().__init__(message)
+        self.transient = transient
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+@dataclass(slots=True)
+class _CachedResponse:
+    """Validators, body digest and parsed result of the last 200 response."""
+
+    etag: str | None
+    last_modified: str | None
+    digest: bytes
+    result: Any
+
+
+@dataclass(slots=True)
+class RequestCounts:
+    """Requests sent and avoided on behalf of one caller."""
+
+    requests: int = 0
+    reused: int = 0
+    coalesced: int = 0
+
+
+_request_counts: ContextVar[RequestCounts | None] = ContextVar(
+    "public_pool_request_counts", default=None
+)
+
+
+@contextmanager
+def count_requests(counts: RequestCounts | None) -> Iterator[None]:
+    """Add the requests of the current task, and of the tasks it starts, to counts.
+
+    Tasks copy the context they are created in, so requests made for the
+    caller by tasks it started are counted too, and concurrent callers
+    only count their own. None stops counting, for work that outlives the
+    caller.
+    """
+    token = _request_counts.set(counts)
+    try:
+        yield
+    finally:
+        _request_counts.reset(token)
+
+
+def current_request_counts() -> RequestCounts | None:
+    """Return the counts the current task adds its requests to, if any."""
+    return _request_counts.get()
+
+
+class CircuitBreaker:
+    """Stop calling an endpoint after repeated transient failures.
+
+    After BREAKER_FAILURE_THRESHOLD consecutive failures the breaker opens and
+    requests fail immediately. Once BREAKER_RESET_TIMEOUT has passed a single
+    trial request is let through (half-open); its outcome closes or reopens
+    the breaker.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str) -> None:
+        """Initialize the breaker."""
+        self.name = name
+        self.state = self.CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+
+    def allow_request(self) -> bool:
+        """Return whether a request may be sent now."""
+        if self.state == self.CLOSED:
+            return True
+        if self.state == self.OPEN and (
+            time.monotonic() - self._opened_at >= BREAKER_RESET_TIMEOUT
+        ):
+            self.state = self.HALF_OPEN
+            return True
+        # Open, or half-open with the trial request already in flight
+        return False
+
+    def record_success(self) -> None:
+        """Record a request the pool answered."""
+        if self.state != self.CLOSED:
+            _LOGGER.info(f"{self.name} recovered, resuming requests")
+        self.state = self.CLOSED
+        self.failures = 0
+
+    def record_inconclusive(self) -> None:
+        """Record a request that says nothing about the endpoint's health.
+
+        A throttled or cancelled trial request does not close the breaker,
+        but must not leave it half-open with no trial in flight either; the
+        breaker reopens and tries again after BREAKER_RESET_TIMEOUT.
+        """
+        if self.state == self.HALF_OPEN:
+            self.state = self.OPEN
+            self._opened_at = time.monotonic()
+
+    def record_failure(self) -> None:
+        """Record a transient failure."""
+        self.failures += 1
+        if self.state == self.HALF_OPEN or (
+            self.state == self.CLOSED and self.failures >= BREAKER_FAILURE_THRESHOLD
+        ):
+            if self.state == self.CLOSED:
+                _LOGGER.warning(
+                    f"{self.name} failed {self.failures} times in a row, "
+                    f"pausing requests for {BREAKER_RESET_TIMEOUT}s"
+                )
+            self.state = self.OPEN
+            self._opened_at = time.monotonic()
+
+
+class RetryBudget:
+    """Limit retries to a fraction of the requests made.
+
+    Every request deposits RETRY_BUDGET_RATIO tokens and every retry spends
+    one, so an outage cannot multiply the load on the pool.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the budget."""
+        self.tokens = RETRY_BUDGET_MAX
+
+    def deposit(self) -> None:
+        """Credit the budget for a new request."""
+        self.tokens = min(self.tokens + RETRY_BUDGET_RATIO, RETRY_BUDGET_MAX)
+
+    def withdraw(self) -> bool:
+        """Spend a token for a retry if one is available."""
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+
+class PublicPoolAPI:
+    """API client for Public Pool.
+
+    All endpoints go through one request engine with a circuit breaker per
+    endpoint and a retry budget shared by all of them. Responses carrying an
+    ETag or Last-Modified header are revalidated with conditional requests;
+    a 304 returns the cached parsed result. Bodies are decoded with orjson
+    when available, and not at all when identical to the previous body.
+
+    With mirror URLs, each request goes to the mirror with the lowest
+    latency estimate and is hedged to the next one when it fails or is
+    slower than its p95.
+
+    Every request first takes a token from the process wide rate limiter of
+    its host, which also holds requests while the host asks to back off.
+
+    While capture is set, every response is also written to it raw.
+    """
+
+    def __init__(
+        self,
+        pool_url: str,
+        bitcoin_address: str | None,
+        session: aiohttp.ClientSession,
+        mirror_urls: list[str] | None = None,
+    ):
+        """Initialize API."""
+        self.pool_url = pool_url.rstrip("/")
+        self.bitcoin_address = bitcoin_address
+        self.session = session
+        self.mirrors = MirrorSet(
+            [self.pool_url, *(url.rstrip("/") for url in mirror_urls or ())]
+        )
+        self._limiters = {
+            mirror.url: host_rate_limiter(mirror.url) for mirror in self.mirrors.mirrors
+        }
+        self._timeout = aiohttp.ClientTimeout(
+            total=REQUEST_TIMEOUT, connect=CONNECT_TIMEOUT, sock_read=READ_TIMEOUT
+        )
+        self._cache: dict[str, _CachedResponse] = {}
+        # Monotonic time of the last usable response per path
+        self._fetched_at: dict[str, float] = {}
+        self._inflight: dict[str, asyncio.Task] = {}
+        self._breakers: dict[str, CircuitBreaker] = {}
+        # Endpoints whose last request the pool answered with a rejection
+        self._rejected: set[str] = set()
+        self._retry_budget = RetryBudget()
+        self.cache_hits: Counter[str] = Counter()
+        self.cache_misses: Counter[str] = Counter()
+        self.unchanged_bodies: Counter[str] = Counter()
+        # Requests avoided by reusing a recent response or an in-flight request
+        self.fresh_hits: Counter[str] = Counter()
+        self.coalesced: Counter[str] = Counter()
+        self.stats = RequestStats()
+        self.capture: ResponseCapture | None = None
+
+    @property
+    def cache_stats(self) -> dict[str, dict[str, int]]:
+        """Return response cache counters per endpoint.
+
+        Hits are 304 responses, unchanged counts 200 responses whose body
+        matched the cached one, misses are bodies that had to be decoded.
+        Fresh counts responses reused without a request because they were
+        younger than the asked max age, coalesced counts callers that joined
+        a request already in flight.
+        """
+        return {
+            "hits": dict(self.cache_hits),
+            "unchanged": dict(self.unchanged_bodies),
+            "misses": dict(self.cache_misses),
+            "fresh": dict(self.fresh_hits),
+            "coalesced": dict(self.coalesced),
+        }
+
+    @property
+    def breaker_states(self) -> dict[str, str]:
+        """Return the circuit breaker state per endpoint."""
+        return {endpoint: breaker.state for endpoint, breaker in self._breakers.items()}
+
+    @property
+    def rate_limiter(self) -> HostRateLimiter:
+        """Return the rate limiter of the configured pool URL's host."""
+        return self._limiters[self.pool_url]
+
+    @property
+    def rate_limiters(self) -> dict[str, dict[str, Any]]:
+        """Return the state of the rate limiter of every mirror's host."""
+        return {
+            limiter.host: limiter.as_dict() for limiter in self._limiters.values()
+        }
+
+    def was_rejected(self, endpoint: str) -> bool:
+        """Return whether the last request to endpoint got a definitive answer.
+
+        True when the pool answered but the response was unusable, e.g. a
+        404 or a body that does not parse, as opposed to a transient
+        failure that may succeed when retried.
+        """
+        return endpoint in self._rejected
+
+    def _breaker(self, endpoint: str) -> CircuitBreaker:
+        """Return the circuit breaker of an endpoint."""
+        if endpoint not in self._breakers:
+            self._breakers[endpoint] = CircuitBreaker(
+                f"Public Pool {endpoint} endpoint at {self.pool_url}"
+            )
+        return self._breakers[endpoint]
+
+    async def _async_request(
+        self,
+        endpoint: str,
+        path: str,
+        parser: Callable[[Any], Any] | None = None,
+        max_age: float | None = None,
+    ) -> Any | None:
+        """Fetch a JSON endpoint and return it, parsed with parser if given.
+
+        With max_age, a response younger than max_age seconds is returned
+        without a request. Callers asking for a path already in flight wait
+        for that request instead of sending their own.
+        """
+        counts = _request_counts.get()
+        if max_age is not None:
+            cached = self._cache.get(path)
+            fetched_at = self._fetched_at.get(path)
+            if (
+                cached is not None
+                and fetched_at is not None
+                and time.monotonic() - fetched_at < max_age
+            ):
+                self.fresh_hits[endpoint] += 1
+                if counts is not None:
+                    counts.reused += 1
+                return cached.result
+
+        task = self._inflight.get(path)
+        if task is not None:
+            self.coalesced[endpoint] += 1
+            if counts is not None:
+                counts.coalesced += 1
+        else:
+            task = self._inflight[path] = asyncio.create_task(
+                self._async_request_with_retries(endpoint, path, parser)
+            )
+            task.add_done_callback(lambda _: self._inflight.pop(path, None))
+        # One caller giving up must not cancel the request for the others
+        return await asyncio.shield(task)
+
+    async def _async_request_with_retries(
+        self,
+        endpoint: str,
+        path: str,
+        parser: Callable[[Any], Any] | None,
+    ) -> Any | None:
+        """Fetch a JSON endpoint through the breaker and the retry budget.
+
+        Returns None when the request fails or the breaker is open. Failures
+        are logged at debug level; the breaker logs when an endpoint goes
+        down and when it recovers.
+        """
+        breaker = self._breaker(endpoint)
+        self._rejected.discard(endpoint)
+        if not breaker.allow_request():
+            return None
+
+        self._retry_budget.deposit()
+        attempt = 0
+
+        url = f"{self.pool_url}{path}"
+        try:
+            while True:
+                try:
+                    result = await self._async_fetch(endpoint, path, parser)
+                except PublicPoolRequestError as err:
+                    self.stats.record_failure(endpoint, err.reason)
+                    if not err.transient:
+                        # The pool answered, so the endpoint itself is healthy
+                        _LOGGER.debug(f"Request to {url} rejected: {err}")
+                        breaker.record_success()
+                        self._rejected.add(endpoint)
+                        return None
+                    throttled = err.retry_after is not None
+                    if (
+                        attempt < MAX_RETRIES
+                        and (err.retry_after or 0) <= RATE_LIMIT_MAX_WAIT
+                        and self._retry_budget.withdraw()
+                    ):
+                        attempt += 1
+                        _LOGGER.debug(f"Retrying {url} after error: {err}")
+                        # A throttled retry waits in the rate limiter instead
+                        if not throttled:
+                            await asyncio.sleep(RETRY_BACKOFF * attempt)
+                        continue
+                    _LOGGER.debug(f"Request to {url} failed: {err}")
+                    if throttled:
+                        # Throttling means the pool is up, so it does not count
+                        breaker.record_inconclusive()
+                    else:
+                        breaker.record_failure()
+                    return None
+                except Exception as err:
+                    self.stats.record_failure(endpoint, "unexpected")
+                    _LOGGER.exception(f"Unexpected error fetching {url}: {err}")
+                    breaker.record_failure()
+                    return None
+
+                breaker.record_success()
+                self._fetched_at[path] = time.monotonic()
+                return result
+        except asyncio.CancelledError:
+            # A cancelled trial request must not leave the breaker half-open
+            breaker.record_inconclusive()
+            raise
+
+    async def _async_fetch(
+        self,
+        endpoint: str,
+        path: str,
+        parser: Callable[[Any], Any] | None,
+    ) -> Any:
+        """Fetch path from the mirrors and return the first parsed result.
+
+        The fastest mirror is asked first. When it fails, or has not answered
+        within its hedge delay, the next one is asked as well; the slower
+        request is cancelled once one of them succeeds. Answers other than
+        transient errors are final, since every mirror serves the same pool.
+        """
+        if len(self.mirrors.mirrors) == 1:
+            return await self._async_fetch_from(
+                self.mirrors.mirrors[0], endpoint, path, parser
+            )
+
+        mirrors = iter(self.mirrors.ranked())
+        mirror = next(mirrors)
+        owners: dict[asyncio.Task, Mirror] = {}
+        pending: set[asyncio.Task] = set()
+        error: PublicPoolRequestError | None = None
+        delay: float | None = None
+
+        try:
+            while True:
+                if mirror is not None:
+                    task = asyncio.create_task(
+                        self._async_fetch_from(mirror, endpoint, path, parser)
+                    )
+                    owners[task] = mirror
+                    pending.add(task)
+                    delay = mirror.hedge_delay
+                    mirror = next(mirrors, None)
+                if not pending:
+                    break
+
+                done, pending = await asyncio.wait(
+                    pending,
+                    timeout=delay if mirror is not None else None,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if not done:
+                    self.mirrors.hedges += 1
+                    continue
+
+                # Retrieve every exception so none is reported as unhandled
+                failures = {task: task.exception() for task in done}
+                for task, failure in failures.items():
+                    if failure is None:
+                        owners[task].wins += 1
+                        return task.result()
+                for failure in failures.values():
+                    if not isinstance(failure, PublicPoolRequestError) or not failure.transient:
+                        raise failure
+                    error = failure
+        finally:
+            for task in pending:
+                task.cancel()
+
+        raise error
+
+    async def _async_fetch_from(
+        self,
+        mirror: Mirror,
+        endpoint: str,
+        path: str,
+        parser: Callable[[Any], Any] | None,
+        unconditional: bool = False,
+    ) -> Any:
+        """Send one conditional GET to a mirror and return the parsed result.
+
+        The response cache is keyed by path, so validators and bodies from
+        one mirror are reused for the others. A 304 with nothing cached is
+        asked again once, unconditional and past any caches on the way.
+        """
+        limiter = self._limiters[mirror.url]
+        if not await limiter.acquire(path, RATE_LIMIT_MAX_WAIT):
+            raise PublicPoolRequestError(
+                f"Rate limited by {limiter.host}",
+                True,
+                "rate_limited",
+                limiter.blocked_for,
+            )
+
+        counts = _request_counts.get()
+        if counts is not None:
+            counts.requests += 1
+        url = f"{mirror.url}{path}"
+        cached = None if unconditional else self._cache.get(path)
+        headers = {hdrs.CACHE_CONTROL: "no-cache"} if unconditional else {}
+        if cached is not None:
+            if cached.etag:
+                headers[hdrs.IF_NONE_MATCH] = cached.etag
+            if cached.last_modified:
+                headers[hdrs.IF_MODIFIED_SINCE] = cached.last_modified
+
+        start = time.perf_counter()
+        try:
+            async with self.session.get(
+                url, headers=headers, timeout=self._timeout
+            ) as response:
+                if self.capture is not None and response.status != 200:
+                    self.capture.record(
+                        endpoint,
+                        path,
+                        response.status,
+                        response.headers,
+                        b"",
+                        time.perf_counter() - start,
+                    )
+                if response.status == 304 and cached is not None:
+                    elapsed = time.perf_counter() - start
+                    self.stats.record_response(endpoint, elapsed, 0)
+                    mirror.record_success(elapsed)
+                    self.cache_hits[endpoint] += 1
+                    return cached.result
+                if response.status == 304 and not unconditional:
+                    # Validators we did not send matched, e.g. ones added by a
+                    # proxy; there is nothing cached to answer with
+                    body = None
+                elif response.status != 200:
+                    retry_after = parse_retry_after(response.headers.get(hdrs.RETRY_AFTER))
+                    if response.status == 429 and retry_after is None:
+                        retry_after = RATE_LIMIT_DEFAULT_DELAY
+                    if retry_after is not None and response.status in TRANSIENT_STATUSES:
+                        retry_after = min(retry_after, MAX_BACKOFF_INTERVAL)
+                        limiter.defer(retry_after)
+                    else:
+                        retry_after = None
+                    raise PublicPoolRequestError(
+                        f"HTTP {response.status}",
+                        response.status in TRANSIENT_STATUSES,
+                        f"http_{response.status}",
+                        retry_after,
+                    )
+                else:
+                    body = await response.read()
+                    if self.capture is not None:
+                        self.capture.record(
+                            endpoint,
+                            path,
+                            response.status,
+                            response.headers,
+                            body,
+                            time.perf_counter() - start,
+                        )
+                    etag = response.headers.get(hdrs.ETAG)
+                    last_modified = response.headers.get(hdrs.LAST_MODIFIED)
+        except PublicPoolRequestError as err:
+            if err.transient:
+                mirror.record_failure(err.reason)
+            else:
+                mirror.record_success(time.perf_counter() - start)
+            raise
+        except asyncio.TimeoutError as err:
+            mirror.record_failure("timeout")
+            raise PublicPoolRequestError("Timeout", True, "timeout") from err
+        except aiohttp.ClientError as err:
+            mirror.record_failure("client_error")
+            raise PublicPoolRequestError(
+                f"Client error: {err}", True, "client_error"
+            ) from err
+        except asyncio.CancelledError:
+            # Lost a hedged race; it took at least this long
+            mirror.record_cancelled(time.perf_counter() - start)
+            raise
+        elapsed = time.perf_counter() - start
+        if body is None:
+            self.stats.record_response(endpoint, elapsed, 0)
+            mirror.record_success(elapsed)
+            self._cache.pop(path, None)
+            _LOGGER.debug(f"Refetching {url} after a 304 with nothing cached")
+            return await self._async_fetch_from(mirror, endpoint, path, parser, True)
+        self.stats.record_response(endpoint, elapsed, len(body))
+        mirror.record_success(elapsed)
+
+        # Hashing is far cheaper than decoding and parsing a large worker list
+        digest = hashlib.blake2b(body, digest_size=16).digest()
+        if cached is not None and cached.digest == digest:
+            self.unchanged_bodies[endpoint] += 1
+            cached.etag = etag
+            cached.last_modified = last_modified
+            return cached.result
+
+        start = time.perf_counter()
+        try:
+            data = json_loads(body)
+        except ValueError as err:
+            raise PublicPoolRequestError(
+                f"Invalid response: {err}", False, "invalid_response"
+            ) from err
+
+        try:
+            result = parser(data) if parser else data
+        except Exception as err:
+            # Bad data from a pool that answered; not an outage for the breaker
+            _LOGGER.warning(f"Failed to parse the {endpoint} response from {url}: {err!r}")
+            raise PublicPoolRequestError(
+                f"Unparsable response: {err!r}", False, "parse_error"
+            ) from err
+        self.stats.record_parse(endpoint, time.perf_counter() - start)
+        self.cache_misses[endpoint] += 1
+        self._cache[path] = _CachedResponse(etag, last_modified, digest, result)
+
+        return result
+
+    async def async_fetch_client_once(self, address: str) -> Any:
+        """Fetch raw client information, raising PublicPoolRequestError.
+
+        Bypasses retries and the circuit breaker so the config flow can
+        report what actually went wrong.
+        """
+        return await self._async_fetch("client", API_CLIENT.format(address=address), None)
+
+    async def fetch_pool_info(
+        self,
+        parser: Callable[[Any], Any] | None = None,
+        max_age: float | None = None,
+    ) -> Any | None:
+        """Fetch pool statistics."""
+        return await self._async_request("pool", API_POOL, parser, max_age)
+
+    async def fetch_info(
+        self, parser: Callable[[Any], Any] | None = None
+    ) -> Any | None:
+        """Fetch general site info."""
+        return await self._async_request("info", API_INFO, parser)
+
+    async def fetch_network_info(
+        self,
+        parser: Callable[[Any], Any] | None = None,
+        max_age: float | None = None,
+    ) -> Any | None:
+        """Fetch Bitcoin network information."""
+        return await self._async_request("network", API_NETWORK, parser, max_age)
+
+    async def fetch_top_difficulties(
+        self, parser: Callable[[Any], Any] | None = None
+    ) -> Any | None:
+        """Fetch the pool's best share difficulties."""
+        return await self._async_request("share_top", API_SHARE_TOP, parser)
+
+    async def fetch_client_info(
+        self,
+        address: str | None = None,
+        parser: Callable[[Any], Any] | None = None,
+        max_age: float | None = None,
+    ) -> Any | None:
+        """Fetch client (address) information."""
+        address = address or self.bitcoin_address
+        return await self._async_request(
+            "client", API_CLIENT.format(address=address), parser, max_age
+        )
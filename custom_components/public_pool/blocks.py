@@ -0,0 +1,55 @@
+"""Index of the blocks found by a Public Pool instance."""
+from __future__ import annotations
+
+from bisect import insort
+from collections.abc import Iterable
+from typing import Any
+
+
+class BlockStore:
+    """Blocks found by the pool, keyed by height.
+
+    The pool reports every block it ever found on each /api/pool response.
+    Only entries with a height not seen before are added, and sensors get a
+    bounded view of the newest blocks, so state size does not grow with the
+    pool's lifetime.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty store."""
+        self._blocks: dict[int, dict[str, Any]] = {}
+        self._heights: list[int] = []
+
+    def __len__(self) -> int:
+        """Return the number of blocks found."""
+        return len(self._heights)
+
+    def ingest(self, blocks: Iterable[dict[str, Any]]) -> int:
+        """Add blocks not seen before and return how many were new."""
+        new = 0
+        for block in blocks:
+            try:
+                height = int(block["height"])
+            except (KeyError, TypeError, ValueError):
+                continue
+            if height in self._blocks:
+                continue
+            self._blocks[height] = {
+                "height": height,
+                "miner_address": block.get("minerAddress"),
+                "worker": block.get("worker"),
+            }
+            insort(self._heights, height)
+            new += 1
+        return new
+
+    @property
+    def last_height(self) -> int | None:
+        """Return the height of the newest block, None if there is none."""
+        return self._heights[-1] if self._heights else None
+
+    def recent(self, limit: int) -> tuple[dict[str, Any], ...]:
+        """Return up to limit blocks, newest first."""
+        if limit <= 0:
+            return ()
+        return tuple(self._blocks[height] for height in reversed(self._heights[-limit:]))
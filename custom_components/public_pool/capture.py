@@ -0,0 +1,132 @@
+"""Capture of raw API responses, for replaying production payloads offline."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterator, Mapping
+import gzip
+import json
+import logging
+import os
+import time
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import HomeAssistant
+
+from .const import CAPTURE_FLUSH_INTERVAL, CAPTURE_FLUSH_RECORDS
+
+if TYPE_CHECKING:
+    from .api import PublicPoolAPI
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class ResponseCapture:
+    """Append-only, gzip compressed log of every response the APIs receive.
+
+    Each line is a JSON record with the wall clock time, endpoint, path,
+    status, headers, response time and raw body. Records are buffered and
+    written from the executor in batches, each batch as its own gzip member,
+    so a crash loses at most the unwritten batch and the file still reads
+    back with gzip.open.
+    """
+
+    def __init__(self, hass: HomeAssistant, path: str) -> None:
+        """Initialize a capture appending to path."""
+        self.hass = hass
+        self.path = path
+        self.records = 0
+        self.closed = False
+        self._pending: list[dict[str, Any]] = []
+        self._flushed_at = time.monotonic()
+        # Keeps batches in order when a flush is still writing
+        self._lock = asyncio.Lock()
+        self._apis: list[PublicPoolAPI] = []
+
+    def attach(self, api: PublicPoolAPI) -> None:
+        """Capture the responses of api until closed."""
+        api.capture = self
+        self._apis.append(api)
+
+    def record(
+        self,
+        endpoint: str,
+        path: str,
+        status: int,
+        headers: Mapping[str, str],
+        body: bytes,
+        elapsed: float,
+    ) -> None:
+        """Buffer one response, writing a batch when enough are buffered."""
+        if self.closed:
+            return
+        self._pending.append(
+            {
+                "t": time.time(),
+                "endpoint": endpoint,
+                "path": path,
+                "status": status,
+                "elapsed": elapsed,
+                "headers": dict(headers),
+                "body": body,
+            }
+        )
+        self.records += 1
+        if (
+            len(self._pending) >= CAPTURE_FLUSH_RECORDS
+            or time.monotonic() - self._flushed_at >= CAPTURE_FLUSH_INTERVAL
+        ):
+            self._flushed_at = time.monotonic()
+            self.hass.async_create_background_task(
+                self.async_flush(), "Public Pool capture flush"
+            )
+
+    def _write(self, records: list[dict[str, Any]]) -> None:
+        """Append records as one gzip member; runs in the executor."""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        lines = [
+            json.dumps(
+                {**record, "body": record["body"].decode("utf-8", "replace")},
+                separators=(",", ":"),
+            ).encode()
+            + b"\n"
+            for record in records
+        ]
+        with gzip.open(self.path, "ab") as file:
+            file.writelines(lines)
+
+    async def async_flush(self) -> None:
+        """Write the buffered records."""
+        async with self._lock:
+            records, self._pending = self._pending, []
+            if not records:
+                return
+            try:
+                await self.hass.async_add_executor_job(self._write, records)
+            except OSError as err:
+                _LOGGER.error(f"Failed to write {len(records)} captured responses: {err}")
+
+    async def async_close(self) -> None:
+        """Stop capturing and write what is buffered."""
+        self.closed = True
+        for api in self._apis:
+            if api.capture is self:
+                api.capture = None
+        self._apis.clear()
+        await self.async_flush()
+        _LOGGER.debug(f"Captured {self.records} responses to {self.path}")
+
+
+def read_captures(path: str) -> Iterator[dict[str, Any]]:
+    """Yield the records of a capture file in the order they were written.
+
+    Bodies are returned as bytes, as they were received. This does blocking
+    I/O. A batch cut short by a crash ends the iteration.
+    """
+    with gzip.open(path, "rt", encoding="utf-8") as file:
+        try:
+            for line in file:
+                record = json.loads(line)
+                record["body"] = record["body"].encode()
+                yield record
+        except (EOFError, gzip.BadGzipFile, json.JSONDecodeError):
+            return
@@ -0,0 +1,53 @@
+"""Track which Public Pool values changed enough to write state."""
+from __future__ import annotations
+
+from collections.abc import Hashable
+from typing import Any
+
+
+class ChangeTracker:
+    """Compare new values with the last ones handed to entities.
+
+    Values are compared with the last *published* value rather than the
+    previous snapshot, so a slow drift below the threshold still gets
+    published once it adds up. Hashrate values may be dicts, lists or
+    tuples; the threshold then applies to every float inside them.
+    """
+
+    def __init__(self, hashrate_threshold: float) -> None:
+        """Initialize with the relative hashrate threshold (0.01 = 1%)."""
+        self.hashrate_threshold = hashrate_threshold
+        self._published: dict[Hashable, Any] = {}
+
+    def check(self, key: Hashable, value: Any, hashrate: bool = False) -> bool:
+        """Return whether value differs from the published one, and publish it."""
+        if key not in self._published:
+            self._published[key] = value
+            return True
+
+        changed = self._differs(self._published[key], value, hashrate)
+        if changed:
+            self._published[key] = value
+        return changed
+
+    def _differs(self, old: Any, value: Any, hashrate: bool) -> bool:
+        """Return whether value differs significantly from old."""
+        if not hashrate:
+            return value != old
+        if isinstance(value, float) and isinstance(old, float):
+            return abs(value - old) > abs(old) * self.hashrate_threshold or (
+                old == 0.0 and value != 0.0
+            )
+        if isinstance(value, dict) and isinstance(old, dict):
+            return value.keys() != old.keys() or any(
+                self._differs(old[item_key], item, True) for item_key, item in value.items()
+            )
+        if isinstance(value, (list, tuple)) and type(value) is type(old):
+            return len(value) != len(old) or any(
+                self._differs(old_item, item, True) for old_item, item in zip(old, value)
+            )
+        return value != old
+
+    def forget(self, key: Hashable) -> None:
+        """Drop a key that no longer exists."""
+        self._published.pop(key, None)
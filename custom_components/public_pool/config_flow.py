@@ -1,10 +1,11 @@
 """Config flow for Public Pool integration."""
 from __future__ import annotations
 
+import asyncio
 import logging
+import re
 from typing import Any
 
-import aiohttp
 import voluptuous as vol
 
 from homeassistant import config_entries
@@ -12,65 +13,140 @@ from homeassistant.core import HomeAssistant
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
+from .api import PublicPoolAPI, PublicPoolRequestError
 from .const import (
     CONF_BITCOIN_ADDRESS,
+    CONF_BITCOIN_ADDRESSES,
+    CONF_HASHRATE_THRESHOLD,
+    CONF_MAX_CONCURRENCY,
+    CONF_MIRROR_URLS,
+    CONF_POOL_SCAN_INTERVAL,
     CONF_POOL_URL,
     CONF_SCAN_INTERVAL,
+    CONF_STALE_TTL,
+    CONF_SUMMARY_MODE,
     CONF_VERIFY_SSL,
+    CONF_WORKER_ALLOWLIST,
+    CONF_WORKER_ENTITIES,
+    CONF_WORKER_GRACE_PERIOD,
+    CONF_WORKER_STATISTICS,
+    DEFAULT_HASHRATE_THRESHOLD,
+    DEFAULT_MAX_CONCURRENCY,
+    DEFAULT_POOL_SCAN_INTERVAL,
     DEFAULT_SCAN_INTERVAL,
+    DEFAULT_STALE_TTL,
+    DEFAULT_SUMMARY_MODE,
     DEFAULT_VERIFY_SSL,
+    DEFAULT_WORKER_ENTITIES,
+    DEFAULT_WORKER_GRACE_PERIOD,
+    DEFAULT_WORKER_STATISTICS,
     DOMAIN,
 )
+from .coordinator import async_store_warm_client
 
 _LOGGER = logging.getLogger(__name__)
 
 STEP_USER_DATA_SCHEMA = vol.Schema(
     {
         vol.Required(CONF_POOL_URL): str,
+        vol.Optional(CONF_MIRROR_URLS, default=""): str,
         vol.Required(CONF_BITCOIN_ADDRESS): str,
         vol.Optional(CONF_SCAN_INTERVAL, default=DEFAULT_SCAN_INTERVAL): int,
+        vol.Optional(CONF_POOL_SCAN_INTERVAL, default=DEFAULT_POOL_SCAN_INTERVAL): int,
         vol.Optional(CONF_VERIFY_SSL, default=DEFAULT_VERIFY_SSL): bool,
+        vol.Optional(CONF_MAX_CONCURRENCY, default=DEFAULT_MAX_CONCURRENCY): vol.All(
+            int, vol.Range(min=1)
+        ),
+        vol.Optional(
+            CONF_WORKER_GRACE_PERIOD, default=DEFAULT_WORKER_GRACE_PERIOD
+        ): vol.All(int, vol.Range(min=0)),
+        vol.Optional(CONF_SUMMARY_MODE, default=DEFAULT_SUMMARY_MODE): bool,
+        vol.Optional(CONF_WORKER_ALLOWLIST, default=""): str,
+        vol.Optional(CONF_WORKER_ENTITIES, default=DEFAULT_WORKER_ENTITIES): bool,
+        vol.Optional(
+            CONF_WORKER_STATISTICS, default=DEFAULT_WORKER_STATISTICS
+        ): bool,
+        vol.Optional(
+            CONF_HASHRATE_THRESHOLD, default=DEFAULT_HASHRATE_THRESHOLD
+        ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+        vol.Optional(CONF_STALE_TTL, default=DEFAULT_STALE_TTL): vol.All(
+            int, vol.Range(min=0)
+        ),
     }
 )
 
 
+def parse_addresses(value: str) -> list[str]:
+    """Split a comma or whitespace separated list of addresses, keeping order."""
+    addresses = [address for address in re.split(r"[\s,;]+", value) if address]
+    return list(dict.fromkeys(addresses))
+
+
+def parse_urls(value: str) -> list[str]:
+    """Split a comma or whitespace separated list of URLs, keeping order."""
+    urls = [url.rstrip("/") for url in re.split(r"[\s,;]+", value) if url]
+    return list(dict.fromkeys(urls))
+
+
+def parse_worker_names(value: str) -> list[str]:
+    """Split a comma separated list of worker names; names may contain spaces."""
+    names = [name.strip() for name in value.split(",")]
+    return list(dict.fromkeys(name for name in names if name))
+
+
 async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str, Any]:
     """Validate the user input allows us to connect.
 
     Data has the keys from STEP_USER_DATA_SCHEMA with values provided by the user.
     """
-    bitcoin_address = data[CONF_BITCOIN_ADDRESS]
+    bitcoin_addresses = data[CONF_BITCOIN_ADDRESSES]
+    if not bitcoin_addresses:
+        raise ValueError("No Bitcoin address given")
     pool_url = data[CONF_POOL_URL].rstrip("/")
     verify_ssl = data.get(CONF_VERIFY_SSL, DEFAULT_VERIFY_SSL)
+    semaphore = asyncio.Semaphore(data.get(CONF_MAX_CONCURRENCY, DEFAULT_MAX_CONCURRENCY))
     
-    # Test API connection
+    # Test API connection through the same client the coordinator uses
     session = async_get_clientsession(hass, verify_ssl=verify_ssl)
-    url = f"{pool_url}/api/client/{bitcoin_address}"
+    api = PublicPoolAPI(pool_url, None, session, data.get(CONF_MIRROR_URLS))
+    
+    async def _validate(bitcoin_address: str) -> None:
+        async with semaphore:
+            payload = await _validate_address(api, bitcoin_address)
+        # The first refresh of the new entry reuses it instead of refetching
+        async_store_warm_client(hass, pool_url, bitcoin_address, payload)
+    
+    await asyncio.gather(*(_validate(address) for address in bitcoin_addresses))
     
+    # Return info that you want to store in the config entry.
+    # Shorten address for display
+    bitcoin_address = bitcoin_addresses[0]
+    short_address = f"{bitcoin_address[:8]}...{bitcoin_address[-8:]}"
+    if len(bitcoin_addresses) > 1:
+        short_address = f"{short_address} +{len(bitcoin_addresses) - 1}"
+    return {"title": f"Public Pool ({short_address})"}
+
+
+async def _validate_address(api: PublicPoolAPI, bitcoin_address: str) -> dict[str, Any]:
+    """Check that the pool knows about a single address and return its data."""
     try:
-        async with session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as response:
-            if response.status == 404:
-                raise ValueError("Bitcoin address not found or invalid")
-            if response.status != 200:
-                raise ValueError(f"API returned HTTP {response.status}")
-            
-            api_data = await response.json()
-            
-            # Check if we got valid data
-            if "workersCount" not in api_data and "workers" not in api_data:
-                raise ValueError("Invalid API response")
-            
-    except aiohttp.ClientError as err:
+        api_data = await api.async_fetch_client_once(bitcoin_address)
+    except PublicPoolRequestError as err:
+        if err.reason == "http_404":
+            raise ValueError("Bitcoin address not found or invalid") from err
         _LOGGER.error(f"Error connecting to Public Pool API: {err}")
-        raise ValueError("Cannot connect to Public Pool API")
+        raise ValueError(f"Cannot connect to Public Pool API: {err}") from err
     except Exception as err:
         _LOGGER.error(f"Unexpected error: {err}")
         raise ValueError(f"Unexpected error: {err}")
     
-    # Return info that you want to store in the config entry.
-    # Shorten address for display
-    short_address = f"{bitcoin_address[:8]}...{bitcoin_address[-8:]}"
-    return {"title": f"Public Pool ({short_address})"}
+    # Check if we got valid data
+    if not isinstance(api_data, dict) or (
+        "workersCount" not in api_data and "workers" not in api_data
+    ):
+        raise ValueError("Invalid API response")
+    
+    return api_data
 
 
 class PublicPoolConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
@@ -85,6 +161,16 @@ class PublicPoolConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         errors: dict[str, str] = {}
         
         if user_input is not None:
+            addresses = parse_addresses(user_input[CONF_BITCOIN_ADDRESS])
+            user_input = {
+                **user_input,
+                CONF_BITCOIN_ADDRESS: addresses[0] if addresses else "",
+                CONF_BITCOIN_ADDRESSES: addresses,
+                CONF_MIRROR_URLS: parse_urls(user_input.get(CONF_MIRROR_URLS, "")),
+                CONF_WORKER_ALLOWLIST: parse_worker_names(
+                    user_input.get(CONF_WORKER_ALLOWLIST, "")
+                ),
+            }
             try:
                 info = await validate_input(self.hass, user_input)
             except ValueError as err:
@@ -1,4 +1,6 @@
 """Constants for the Public Pool integration."""
+from datetime import timedelta
+
 from homeassistant.const import Platform
 
 DOMAIN = "public_pool"
@@ -8,13 +10,96 @@ PLATFORMS = [Platform.SENSOR]
 
 # Configuration
 CONF_BITCOIN_ADDRESS = "bitcoin_address"
+CONF_BITCOIN_ADDRESSES = "bitcoin_addresses"
+CONF_MAX_CONCURRENCY = "max_concurrency"
+CONF_WORKER_GRACE_PERIOD = "worker_grace_period"
+CONF_SUMMARY_MODE = "summary_mode"
+CONF_WORKER_ALLOWLIST = "worker_allowlist"
+CONF_WORKER_ENTITIES = "worker_entities"
+CONF_WORKER_STATISTICS = "worker_statistics"
+CONF_HASHRATE_THRESHOLD = "hashrate_threshold"
+CONF_STALE_TTL = "stale_ttl"
 CONF_POOL_URL = "pool_url"
+CONF_MIRROR_URLS = "mirror_urls"
 CONF_SCAN_INTERVAL = "scan_interval"
+CONF_POOL_SCAN_INTERVAL = "pool_scan_interval"
 CONF_VERIFY_SSL = "verify_ssl"
 
+# hass.data keys
+DATA_SHARED_COORDINATORS = "shared_coordinators"
+# Client payloads fetched by the config flow, reused by the first refresh
+DATA_WARM_CLIENTS = "warm_clients"
+# The running response capture of the capture service
+DATA_CAPTURE = "capture"
+WARM_CLIENT_MAX_AGE = timedelta(minutes=5)
+
+# Services
+SERVICE_REFRESH = "refresh"
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_ADDRESS = "address"
+ATTR_MIN_AGE = "min_age"
+DEFAULT_REFRESH_MIN_AGE = 30  # seconds
+SERVICE_CAPTURE = "capture"
+ATTR_DURATION = "duration"
+DEFAULT_CAPTURE_DURATION = 60  # minutes
+
+# Storage for the last good snapshot of each entry
+STORAGE_VERSION = 2
+STORAGE_KEY = DOMAIN + ".{entry_id}"
+SNAPSHOT_SAVE_DELAY = 300  # seconds
+
 # Defaults
 DEFAULT_SCAN_INTERVAL = 60  # seconds
+DEFAULT_POOL_SCAN_INTERVAL = 300  # seconds
 DEFAULT_VERIFY_SSL = True
+DEFAULT_MAX_CONCURRENCY = 4
+DEFAULT_WORKER_GRACE_PERIOD = 24  # hours
+DEFAULT_SUMMARY_MODE = False
+DEFAULT_WORKER_ENTITIES = True
+DEFAULT_WORKER_STATISTICS = False
+DEFAULT_HASHRATE_THRESHOLD = 1.0  # percent
+DEFAULT_STALE_TTL = 30  # minutes
+
+# Network data is refetched on a new block, or when older than this
+NETWORK_MAX_AGE = timedelta(hours=1)
+
+# Rarely changing endpoints are refetched by the shared poller after these
+INFO_TTL = timedelta(hours=6)
+SHARE_TOP_TTL = timedelta(minutes=30)
+TOP_DIFFICULTIES_LIMIT = 10
+
+# Adaptive polling: unchanged snapshots stretch the interval by the growth
+# factor up to the idle factor times the configured interval, failures back
+# off exponentially with +/- jitter up to MAX_BACKOFF_INTERVAL seconds
+ADAPTIVE_GROWTH_FACTOR = 1.5
+ADAPTIVE_IDLE_FACTOR = 4
+BACKOFF_JITTER = 0.2
+MAX_BACKOFF_INTERVAL = 900
+
+# Farm summary mode
+STALE_WORKER_AGE = timedelta(minutes=10)
+SUMMARY_TOP_N = 5
+SUMMARY_HISTOGRAM_BUCKETS = 10
+
+# Windows of the block chance metrics, in seconds
+BLOCK_CHANCE_WINDOWS = {
+    "24h": 86400,
+    "7d": 7 * 86400,
+    "30d": 30 * 86400,
+}
+
+# Newest blocks listed in the blocks_found attribute
+RECENT_BLOCKS_LIMIT = 10
+
+# Rolling hashrate means: window name -> (seconds, ring buffer buckets)
+ROLLING_WINDOWS = {
+    "10m": (600, 10),
+    "1h": (3600, 12),
+    "24h": (86400, 24),
+}
+
+# Fraction of the scan interval over which client requests are spread
+CLIENT_POLL_SPREAD = 0.25
 
 # API endpoints (relative to pool URL)
 API_POOL = "/api/pool"
@@ -23,6 +108,44 @@ API_NETWORK = "/api/network"
 API_CLIENT = "/api/client/{address}"
 API_SHARE_TOP = "/api/share/top-difficulties"
 
+# Request engine
+CONNECT_TIMEOUT = 5  # seconds
+READ_TIMEOUT = 10  # seconds
+# Bound on a whole request, however slowly a response trickles in
+REQUEST_TIMEOUT = 30  # seconds
+MAX_RETRIES = 2
+RETRY_BACKOFF = 0.5  # seconds, multiplied by the attempt number
+# Each request earns this many retry tokens, capped at RETRY_BUDGET_MAX
+RETRY_BUDGET_RATIO = 0.2
+RETRY_BUDGET_MAX = 10
+BREAKER_FAILURE_THRESHOLD = 3
+BREAKER_RESET_TIMEOUT = 60  # seconds
+
+# Requests per host, across all entries: a token bucket refilled at
+# RATE_LIMIT_PER_SECOND holding up to RATE_LIMIT_BURST tokens. Requests are
+# not queued behind a Retry-After longer than RATE_LIMIT_MAX_WAIT; a 429
+# without Retry-After holds the host for RATE_LIMIT_DEFAULT_DELAY
+RATE_LIMIT_PER_SECOND = 10
+RATE_LIMIT_BURST = 20
+RATE_LIMIT_MAX_WAIT = 30  # seconds
+RATE_LIMIT_DEFAULT_DELAY = 5  # seconds
+
+# Mirrors: latency estimates are an EWMA with this weight per response. A
+# request is hedged to the next mirror after the current one's p95 latency,
+# or after HEDGE_DEFAULT_DELAY until it has HEDGE_MIN_SAMPLES responses
+MIRROR_EWMA_ALPHA = 0.3
+HEDGE_MIN_SAMPLES = 20
+HEDGE_DEFAULT_DELAY = 2.0  # seconds
+HEDGE_MIN_DELAY = 0.05  # seconds
+
+# Captured responses are written once this many are buffered, or with the
+# first response after CAPTURE_FLUSH_INTERVAL
+CAPTURE_FLUSH_RECORDS = 50
+CAPTURE_FLUSH_INTERVAL = 60  # seconds
+
+# Upper bounds of the latency and parse time histogram buckets
+HISTOGRAM_BOUNDS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
 # Units
 TERA_HASH_PER_SECOND = "TH/s"
 EXA_HASH_PER_SECOND = "EH/s"
@@ -31,7 +154,8 @@ GIGA_HASH_PER_SECOND = "GH/s"
 # Pool-level sensor keys
 SENSOR_POOL_HASHRATE = "pool_hashrate"
 SENSOR_POOL_MINERS = "pool_miners"
-SENSOR_POOL_BLOCKS_FOUND = "pool_blocks_found"
+SENSOR_POOL_BLOCKS_FOUND = "pool_blocks_found_count"
+SENSOR_POOL_LAST_BLOCK_FOUND = "pool_last_block_found"
 SENSOR_POOL_BLOCK_HEIGHT = "pool_block_height"
 
 # Network-level sensor keys
@@ -1,23 +1,57 @@
 """Public Pool DataUpdateCoordinator."""
 import asyncio
+from collections import Counter
+from collections.abc import Awaitable, Hashable, Iterable
+import copy
 import logging
+import math
+import time
 from datetime import timedelta
+from operator import itemgetter
 from typing import Any
+from urllib.parse import urlsplit, urlunsplit
 
 import aiohttp
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import (
     DataUpdateCoordinator,
     UpdateFailed,
 )
 
+from .api import PublicPoolAPI, count_requests, current_request_counts
+from .blocks import BlockStore
+from .changes import ChangeTracker
+from .metrics import EXA, GIGA, TERA, luck, mining_metrics
 from .const import (
-    API_CLIENT,
-    API_INFO,
-    API_NETWORK,
-    API_POOL,
+    CLIENT_POLL_SPREAD,
+    DATA_SHARED_COORDINATORS,
+    DATA_WARM_CLIENTS,
+    DEFAULT_HASHRATE_THRESHOLD,
+    DEFAULT_MAX_CONCURRENCY,
+    DEFAULT_STALE_TTL,
+    DOMAIN,
+    INFO_TTL,
+    NETWORK_MAX_AGE,
+    RECENT_BLOCKS_LIMIT,
+    SHARE_TOP_TTL,
+    SNAPSHOT_SAVE_DELAY,
+    STALE_WORKER_AGE,
+    STORAGE_KEY,
+    STORAGE_VERSION,
+    SUMMARY_HISTOGRAM_BUCKETS,
+    SUMMARY_TOP_N,
+    TOP_DIFFICULTIES_LIMIT,
+    WARM_CLIENT_MAX_AGE,
 )
+from .models import WorkerTable, iso_to_epoch
+from .rolling import RollingHashrates
+from .scheduler import AdaptiveInterval
+from .stats import Histogram
+from .worker_statistics import WorkerStatistics, async_write_worker_statistics
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -26,129 +60,233 @@ DEFAULT_DATA = {
     # Pool data
     "pool_hashrate": 0.0,
     "pool_miners": 0,
-    "pool_blocks_found": [],
+    "pool_blocks_found_count": 0,
+    "pool_recent_blocks": [],
+    "pool_last_block_found": None,
     "pool_block_height": 0,
     "pool_fee": 0,
     # Network data
     "network_difficulty": 0.0,
     "network_hashrate": 0.0,
     "network_block_height": 0,
-    # Address data
+    # Site info and top share difficulties, refetched after their TTL
+    "pool_started_at": None,
+    "pool_version": None,
+    "pool_top_difficulty": None,
+    "pool_top_difficulties": [],
+    # Derived pool metrics
+    "pool_expected_time_to_block": None,
+    "pool_network_share": None,
+    "pool_block_chance_24h": None,
+    "pool_block_chance_7d": None,
+    "pool_block_chance_30d": None,
+    # Address data, keyed by bitcoin address
+    "addresses": {},
+    # Sections ("pool", "network" or an address) served from the last good
+    # data, and sections whose data is too old to be shown
+    "stale": [],
+    "expired": ["pool", "network"],
+}
+
+DEFAULT_ADDRESS_DATA = {
     "address_best_difficulty": 0.0,
     "address_workers_count": 0,
     "address_total_hashrate": 0.0,
-    "workers": {},
+    "workers": WorkerTable(),
 }
 
+# Sections polled by the shared coordinator
+SHARED_SECTIONS = ("pool", "network")
 
-class PublicPoolAPI:
-    """API client for Public Pool."""
+# Keys compared by the change tracker; hashrates use the significance threshold
+SHARED_KEYS = (
+    "pool_hashrate",
+    "pool_miners",
+    "pool_blocks_found_count",
+    "pool_last_block_found",
+    "pool_block_height",
+    "network_difficulty",
+    "network_hashrate",
+    "network_block_height",
+    "pool_started_at",
+    "pool_version",
+    "pool_top_difficulty",
+    "pool_top_difficulties",
+    "pool_expected_time_to_block",
+    "pool_network_share",
+    "pool_block_chance_24h",
+)
+ADDRESS_KEYS = (
+    "address_best_difficulty",
+    "address_workers_count",
+    "address_total_hashrate",
+)
+# Address values derived from network data, so they also move on shared updates
+ADDRESS_METRIC_KEYS = (
+    "address_expected_time_to_block",
+    "address_network_share",
+    "address_block_chance_24h",
+    "address_luck",
+)
+WORKER_FIELDS = ("hashrate", "best_difficulty", "last_seen")
+HASHRATE_KEYS = {
+    "pool_hashrate",
+    "network_hashrate",
+    "address_total_hashrate",
+    "hashrate",
+    "hashrate_median",
+    "fastest_workers",
+    "slowest_workers",
+    # Metrics move with the hashrate they are derived from
+    "pool_expected_time_to_block",
+    "pool_network_share",
+    "pool_block_chance_24h",
+    "address_expected_time_to_block",
+    "address_network_share",
+    "address_block_chance_24h",
+}
 
-    def __init__(self, pool_url: str, bitcoin_address: str, session: aiohttp.ClientSession):
-        """Initialize API."""
-        self.pool_url = pool_url.rstrip("/")
-        self.bitcoin_address = bitcoin_address
-        self.session = session
 
-    async def fetch_pool_info(self) -> dict[str, Any] | None:
-        """Fetch pool statistics."""
-        url = f"{self.pool_url}{API_POOL}"
-        try:
-            async with self.session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as response:
-                if response.status != 200:
-                    _LOGGER.error(f"HTTP {response.status} from {url}")
-                    return None
-                return await response.json()
-        except asyncio.TimeoutError:
-            _LOGGER.error(f"Timeout fetching {url}")
-            return None
-        except aiohttp.ClientError as err:
-            _LOGGER.error(f"Client error fetching {url}: {err}")
-            return None
-        except Exception as err:
-            _LOGGER.exception(f"Unexpected error fetching {url}: {err}")
-            return None
+def default_data() -> dict[str, Any]:
+    """Return a fresh copy of DEFAULT_DATA sharing no mutable values."""
+    return copy.deepcopy(DEFAULT_DATA)
 
-    async def fetch_info(self) -> dict[str, Any] | None:
-        """Fetch general site info."""
-        url = f"{self.pool_url}{API_INFO}"
-        try:
-            async with self.session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as response:
-                if response.status != 200:
-                    _LOGGER.error(f"HTTP {response.status} from {url}")
-                    return None
-                return await response.json()
-        except asyncio.TimeoutError:
-            _LOGGER.error(f"Timeout fetching {url}")
-            return None
-        except aiohttp.ClientError as err:
-            _LOGGER.error(f"Client error fetching {url}: {err}")
-            return None
-        except Exception as err:
-            _LOGGER.exception(f"Unexpected error fetching {url}: {err}")
-            return None
 
-    async def fetch_network_info(self) -> dict[str, Any] | None:
-        """Fetch Bitcoin network information."""
-        url = f"{self.pool_url}{API_NETWORK}"
-        try:
-            async with self.session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as response:
-                if response.status != 200:
-                    _LOGGER.error(f"HTTP {response.status} from {url}")
-                    return None
-                return await response.json()
-        except asyncio.TimeoutError:
-            _LOGGER.error(f"Timeout fetching {url}")
-            return None
-        except aiohttp.ClientError as err:
-            _LOGGER.error(f"Client error fetching {url}: {err}")
-            return None
-        except Exception as err:
-            _LOGGER.exception(f"Unexpected error fetching {url}: {err}")
-            return None
+def default_address_data() -> dict[str, Any]:
+    """Return a fresh copy of DEFAULT_ADDRESS_DATA with its own worker table."""
+    return {**DEFAULT_ADDRESS_DATA, "workers": WorkerTable()}
 
-    async def fetch_client_info(self) -> dict[str, Any] | None:
-        """Fetch client (address) information."""
-        url = f"{self.pool_url}{API_CLIENT.format(address=self.bitcoin_address)}"
-        try:
-            async with self.session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as response:
-                if response.status != 200:
-                    _LOGGER.error(f"HTTP {response.status} from {url}")
-                    return None
-                return await response.json()
-        except asyncio.TimeoutError:
-            _LOGGER.error(f"Timeout fetching {url}")
-            return None
-        except aiohttp.ClientError as err:
-            _LOGGER.error(f"Client error fetching {url}: {err}")
-            return None
-        except Exception as err:
-            _LOGGER.exception(f"Unexpected error fetching {url}: {err}")
-            return None
 
+def snapshot_to_json(data: dict[str, Any]) -> dict[str, Any]:
+    """Return coordinator data in a JSON serializable form."""
+    return {
+        **data,
+        "addresses": {
+            address: {**address_data, "workers": address_data["workers"].as_dict()}
+            for address, address_data in data["addresses"].items()
+        },
+    }
+
+
+def snapshot_from_json(data: dict[str, Any]) -> dict[str, Any]:
+    """Rebuild coordinator data saved with snapshot_to_json.
+
+    Keys missing from the snapshot get their default values. Raises
+    KeyError, TypeError or ValueError on a snapshot that does not fit.
+    """
+    return {
+        **default_data(),
+        **data,
+        "addresses": {
+            address: {
+                **default_address_data(),
+                **address_data,
+                "workers": WorkerTable.from_dict(address_data["workers"]),
+            }
+            for address, address_data in data["addresses"].items()
+        },
+    }
 
-class PublicPoolCoordinator(DataUpdateCoordinator):
-    """Class to manage fetching Public Pool data."""
+
+class SnapshotStore(Store[dict[str, Any]]):
+    """Store for the last snapshot of an entry.
+
+    Snapshots only warm up the start, so one saved in an older layout is
+    dropped instead of migrated.
+    """
+
+    async def _async_migrate_func(
+        self, old_major_version: int, old_minor_version: int, old_data: dict[str, Any]
+    ) -> dict[str, Any]:
+        """Discard a snapshot saved with another storage version."""
+        _LOGGER.debug(
+            f"Dropping Public Pool snapshot saved with storage version {old_major_version}"
+        )
+        return {}
+
+
+def normalize_pool_url(pool_url: str) -> str:
+    """Return a canonical form of a pool URL so equivalent URLs compare equal."""
+    parts = urlsplit(pool_url.strip())
+    return urlunsplit(
+        (
+            parts.scheme.lower(),
+            parts.netloc.lower(),
+            parts.path.rstrip("/"),
+            parts.query,
+            "",
+        )
+    )
+
+
+@callback
+def async_store_warm_client(
+    hass: HomeAssistant, pool_url: str, address: str, payload: dict[str, Any]
+) -> None:
+    """Keep a client payload fetched during the config flow for the first refresh."""
+    warm = hass.data.setdefault(DOMAIN, {}).setdefault(DATA_WARM_CLIENTS, {})
+    now = time.monotonic()
+    max_age = WARM_CLIENT_MAX_AGE.total_seconds()
+    # Drop payloads of flows that were aborted or never finished
+    for key in [key for key, (stored_at, _) in warm.items() if now - stored_at > max_age]:
+        del warm[key]
+    warm[(normalize_pool_url(pool_url), address)] = (now, payload)
+
+
+@callback
+def async_pop_warm_client(
+    hass: HomeAssistant, pool_url: str, address: str
+) -> dict[str, Any] | None:
+    """Return and forget a recent config flow payload for an address."""
+    warm = hass.data.get(DOMAIN, {}).get(DATA_WARM_CLIENTS)
+    if not warm:
+        return None
+    stored = warm.pop((normalize_pool_url(pool_url), address), None)
+    if stored is None or time.monotonic() - stored[0] > WARM_CLIENT_MAX_AGE.total_seconds():
+        return None
+    return stored[1]
+
+
+class PublicPoolSharedCoordinator(DataUpdateCoordinator):
+    """Class to manage fetching pool and network data shared by all entries.
+
+    The pool endpoint is polled on the (slow) pool scan interval. Network
+    difficulty and hashrate only change with a new block, so the network
+    endpoint is only refetched once the pool reports a higher block height.
+    Site info and top share difficulties rarely change and are only
+    refetched once their TTL has expired.
+    """
 
     def __init__(
         self,
         hass: HomeAssistant,
-        bitcoin_address: str,
         pool_url: str,
         scan_interval: int,
         session: aiohttp.ClientSession,
+        mirror_urls: list[str] | None = None,
     ) -> None:
-        """Initialize coordinator."""
-        self.bitcoin_address = bitcoin_address
+        """Initialize shared coordinator."""
         self.pool_url = pool_url
-        self.api = PublicPoolAPI(pool_url, bitcoin_address, session)
-        self._failure_count = 0
-        
+        self.api = PublicPoolAPI(pool_url, None, session, mirror_urls)
+        self.refcount = 0
+        # Pool scan intervals of the entries using this coordinator
+        self.scan_intervals: Counter[int] = Counter()
+        self.first_refresh_lock = asyncio.Lock()
+        self._network_fetched_at: float | None = None
+        self._network_trigger_height = 0
+        self._fetched_at: dict[str, float] = {}
+        # Time each section first failed to refresh; 0 until first fetched
+        self.stale_since: dict[str, float] = dict.fromkeys(SHARED_SECTIONS, 0.0)
+        self.scheduler = AdaptiveInterval(scan_interval)
+        self.blocks = BlockStore()
+        # Min age and task of the refresh requested through the refresh service
+        self._requested_refresh: tuple[float, asyncio.Task] | None = None
+
         super().__init__(
             hass=hass,
             logger=_LOGGER,
-            name=f"Public Pool {bitcoin_address[:8]}",
-            update_interval=timedelta(seconds=scan_interval),
+            name=f"Public Pool {pool_url}",
+            update_interval=self.scheduler.timedelta,
         )
 
     def _parse_pool_data(self, pool_data: dict[str, Any]) -> dict[str, Any]:
@@ -161,7 +299,11 @@ class PublicPoolCoordinator(DataUpdateCoordinator):
         # Convert hashrate from H/s to TH/s
         result["pool_hashrate"] = float(pool_data.get("totalHashRate", 0)) / 1_000_000_000_000
         result["pool_miners"] = int(pool_data.get("totalMiners", 0))
-        result["pool_blocks_found"] = pool_data.get("blocksFound", [])
+        # Only called for new bodies; the store skips blocks it already has
+        self.blocks.ingest(pool_data.get("blocksFound") or [])
+        result["pool_blocks_found_count"] = len(self.blocks)
+        result["pool_recent_blocks"] = self.blocks.recent(RECENT_BLOCKS_LIMIT)
+        result["pool_last_block_found"] = self.blocks.last_height
         result["pool_block_height"] = int(pool_data.get("blockHeight", 0))
         result["pool_fee"] = float(pool_data.get("fee", 0))
         
@@ -181,9 +323,603 @@ class PublicPoolCoordinator(DataUpdateCoordinator):
         
         return result
 
+    def _parse_info_data(self, info_data: dict[str, Any]) -> dict[str, Any]:
+        """Parse general site info."""
+        result = {}
+        
+        if not isinstance(info_data, dict):
+            return result
+        
+        # uptime is the time the pool process started
+        result["pool_started_at"] = iso_to_epoch(info_data.get("uptime")) or None
+        result["pool_version"] = info_data.get("version")
+        
+        return result
+
+    def _parse_top_difficulties(self, top_data: list[dict[str, Any]]) -> dict[str, Any]:
+        """Parse the best share difficulties, highest first."""
+        difficulties = []
+        
+        for entry in top_data if isinstance(top_data, list) else []:
+            try:
+                difficulty = float(entry.get("bestDifficulty", entry.get("difficulty", 0)))
+            except (AttributeError, TypeError, ValueError):
+                continue
+            difficulties.append(
+                {
+                    "difficulty": difficulty,
+                    "user_agent": entry.get("bestDifficultyUserAgent"),
+                    "updated_at": entry.get("updatedAt"),
+                }
+            )
+        
+        difficulties.sort(key=itemgetter("difficulty"), reverse=True)
+        difficulties = difficulties[:TOP_DIFFICULTIES_LIMIT]
+        
+        return {
+            "pool_top_difficulty": difficulties[0]["difficulty"] if difficulties else None,
+            "pool_top_difficulties": difficulties,
+        }
+
+    def _ttl_expired(self, endpoint: str, ttl: timedelta) -> bool:
+        """Return whether a TTL cached endpoint should be fetched this cycle."""
+        fetched_at = self._fetched_at.get(endpoint)
+        return fetched_at is None or time.monotonic() - fetched_at > ttl.total_seconds()
+
+    async def _async_fetch_slow_endpoints(self) -> dict[str, Any]:
+        """Fetch site info and top difficulties whose TTL expired."""
+        result: dict[str, Any] = {}
+        
+        for endpoint, ttl, fetch, parser in (
+            ("info", INFO_TTL, self.api.fetch_info, self._parse_info_data),
+            (
+                "share_top",
+                SHARE_TOP_TTL,
+                self.api.fetch_top_difficulties,
+                self._parse_top_difficulties,
+            ),
+        ):
+            if not self._ttl_expired(endpoint, ttl):
+                continue
+            data = await fetch(parser)
+            # A pool without the endpoint is asked again once the TTL expires
+            if data or self.api.was_rejected(endpoint):
+                self._fetched_at[endpoint] = time.monotonic()
+            if data:
+                result.update(data)
+        
+        return result
+
+    def _network_refresh_due(self, pool_data: dict[str, Any] | None) -> bool:
+        """Return whether the network endpoint should be fetched this cycle."""
+        if self._network_fetched_at is None:
+            return True
+        if time.monotonic() - self._network_fetched_at > NETWORK_MAX_AGE.total_seconds():
+            return True
+        if not pool_data:
+            return False
+        return pool_data.get("pool_block_height", 0) > self._network_trigger_height
+
+    async def _async_update_data(self):
+        """Fetch pool and network data from Public Pool API."""
+        return await self._async_fetch_data(None)
+
+    async def _async_fetch_data(self, max_age: float | None) -> dict[str, Any]:
+        """Fetch pool and network data, reusing responses younger than max_age."""
+        _LOGGER.debug(f"Fetching shared pool data from {self.pool_url}")
+
+        # The API parses fresh responses and reuses the parsed result on a 304
+        pool_data = await self.api.fetch_pool_info(self._parse_pool_data, max_age)
+        
+        network_data = None
+        network_due = self._network_refresh_due(pool_data)
+        if network_due:
+            network_data = await self.api.fetch_network_info(
+                self._parse_network_data, max_age
+            )
+            if network_data:
+                self._network_fetched_at = time.monotonic()
+                self._network_trigger_height = max(
+                    network_data.get("network_block_height", 0),
+                    (pool_data or {}).get("pool_block_height", 0),
+                )
+
+        # Network data not due for a refetch is current as long as the pool
+        # answered, since the pool would have reported a new block
+        fresh = set()
+        if pool_data:
+            fresh.add("pool")
+        if network_data or (pool_data and not network_due):
+            fresh.add("network")
+        now = time.time()
+        for section in SHARED_SECTIONS:
+            if section in fresh:
+                self.stale_since.pop(section, None)
+            else:
+                self.stale_since.setdefault(section, now)
+
+        if not pool_data and not network_data:
+            self.update_interval = self.scheduler.record_failure()
+            raise UpdateFailed(f"Public Pool API at {self.pool_url} returned no pool data")
+
+        # Network data is carried over until the next block triggers a refetch
+        data = dict(self.data or {})
+        if pool_data:
+            data.update(pool_data)
+        if network_data:
+            data.update(network_data)
+        data.update(await self._async_fetch_slow_endpoints())
+
+        self.update_interval = self.scheduler.record_success(data != self.data)
+        return data
+
+    async def async_refresh_requested(self, min_age: float) -> None:
+        """Refresh now, reusing pool and network responses younger than min_age.
+
+        Callers arriving while a requested refresh at least as fresh is in
+        flight wait for that one instead of starting their own.
+        """
+        requested = self._requested_refresh
+        if requested is None or requested[1].done() or requested[0] > min_age:
+            requested = self._requested_refresh = (
+                min_age,
+                self.hass.async_create_task(
+                    async_publish_requested_refresh(self, self._async_fetch_data(min_age)),
+                    f"{DOMAIN} requested refresh {self.pool_url}",
+                ),
+            )
+        else:
+            # Counted like callers joining a request in flight
+            counts = current_request_counts()
+            if counts is not None:
+                counts.coalesced += 1
+        # One caller giving up must not cancel the refresh for the others
+        await asyncio.shield(requested[1])
+
+    async def async_ensure_first_refresh(self) -> None:
+        """Refresh once if no entry has fetched pool data yet."""
+        async with self.first_refresh_lock:
+            if self.data is None:
+                await self.async_refresh()
+
+    def update_base_interval(self) -> None:
+        """Poll as often as the most demanding remaining entry asks for."""
+        base_interval = min(self.scan_intervals)
+        if base_interval != self.scheduler.base_interval:
+            self.update_interval = self.scheduler.set_base_interval(base_interval)
+
+
+async def async_publish_requested_refresh(
+    coordinator: DataUpdateCoordinator, update: Awaitable[dict[str, Any]]
+) -> None:
+    """Run a refresh requested outside the schedule and publish its result.
+
+    Works like async_refresh, except that the update gets the request as
+    arguments. A scheduled refresh running at the same time therefore
+    fetches as usual.
+    """
+    try:
+        data = await update
+    except UpdateFailed as err:
+        coordinator.last_exception = err
+        if coordinator.last_update_success:
+            _LOGGER.error(f"Error fetching {coordinator.name} data: {err}")
+            coordinator.last_update_success = False
+        coordinator.async_update_listeners()
+        return
+    # The refresh this schedules inherits the context but is not the caller's
+    with count_requests(None):
+        coordinator.async_set_updated_data(data)
+
+
+async def async_acquire_shared_coordinator(
+    hass: HomeAssistant,
+    pool_url: str,
+    verify_ssl: bool,
+    scan_interval: int,
+    mirror_urls: list[str] | None = None,
+) -> PublicPoolSharedCoordinator:
+    """Return the shared coordinator for a pool, creating it if needed.
+
+    Every call must be balanced by async_release_shared_coordinator. The
+    caller is responsible for async_ensure_first_refresh.
+    """
+    shared = hass.data.setdefault(DOMAIN, {}).setdefault(DATA_SHARED_COORDINATORS, {})
+    mirrors = tuple(normalize_pool_url(url) for url in mirror_urls or ())
+    key = (normalize_pool_url(pool_url), verify_ssl, mirrors)
+    
+    coordinator = shared.get(key)
+    if coordinator is None:
+        session = async_get_clientsession(hass, verify_ssl=verify_ssl)
+        coordinator = PublicPoolSharedCoordinator(
+            hass, key[0], scan_interval, session, list(mirrors)
+        )
+        coordinator.shared_key = key
+        shared[key] = coordinator
+    
+    coordinator.refcount += 1
+    coordinator.scan_intervals[scan_interval] += 1
+    coordinator.update_base_interval()
+    return coordinator
+
+
+async def async_release_shared_coordinator(
+    hass: HomeAssistant, coordinator: PublicPoolSharedCoordinator, scan_interval: int
+) -> None:
+    """Drop a reference to a shared coordinator, shutting it down if unused.
+
+    scan_interval is the pool scan interval the reference was acquired with.
+    """
+    coordinator.refcount -= 1
+    coordinator.scan_intervals -= Counter({scan_interval: 1})
+    if coordinator.refcount > 0:
+        coordinator.update_base_interval()
+        return
+    
+    hass.data[DOMAIN][DATA_SHARED_COORDINATORS].pop(coordinator.shared_key, None)
+    await coordinator.async_shutdown()
+
+
+class PublicPoolCoordinator(DataUpdateCoordinator):
+    """Class to manage fetching Public Pool data for a list of addresses."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry_id: str,
+        bitcoin_addresses: list[str],
+        pool_url: str,
+        scan_interval: int,
+        session: aiohttp.ClientSession,
+        shared: PublicPoolSharedCoordinator,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        summary_mode: bool = False,
+        hashrate_threshold: float = DEFAULT_HASHRATE_THRESHOLD,
+        stale_ttl: int = DEFAULT_STALE_TTL,
+        mirror_urls: list[str] | None = None,
+        worker_statistics: bool = False,
+    ) -> None:
+        """Initialize coordinator.
+
+        hashrate_threshold is the relative hashrate change, in percent, below
+        which a sensor is not rewritten. stale_ttl is how long, in minutes,
+        the last good data is served after refreshes start failing.
+        mirror_urls serve the same pool as pool_url and are used when they
+        answer faster. With worker_statistics, hourly worker hashrate
+        statistics are written to the recorder.
+        """
+        self.bitcoin_addresses = list(bitcoin_addresses)
+        # The first address identifies the entry and its main device
+        self.bitcoin_address = self.bitcoin_addresses[0]
+        self.pool_url = pool_url
+        self.api = PublicPoolAPI(pool_url, self.bitcoin_address, session, mirror_urls)
+        self.shared = shared
+        self._semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        self.summary_mode = summary_mode
+        self.stale_ttl = stale_ttl * 60
+        # Time each address first failed to refresh; 0 until first fetched
+        self._stale_since: dict[str, float] = dict.fromkeys(self.bitcoin_addresses, 0.0)
+        self.scheduler = AdaptiveInterval(scan_interval)
+        self._store = SnapshotStore(
+            hass, STORAGE_VERSION, STORAGE_KEY.format(entry_id=entry_id)
+        )
+        self._save_scheduled_at: float | None = None
+        self._changes = ChangeTracker(hashrate_threshold / 100)
+        self._diffed_workers: dict[str, WorkerTable] = {}
+        self.rolling = RollingHashrates()
+        self.worker_statistics = WorkerStatistics() if worker_statistics else None
+        # Durations of whole refreshes and of the entity writes they trigger
+        self.refresh_times = Histogram()
+        self.listener_times = Histogram()
+        # Keys whose values changed in the last update; None means all of them
+        self.changed_keys: set[Hashable] | None = None
+        # Addresses, min age and task of the refresh requested through the
+        # refresh service
+        self._requested_refresh: tuple[set[str] | None, float, asyncio.Task] | None = None
+        
+        super().__init__(
+            hass=hass,
+            logger=_LOGGER,
+            name=f"Public Pool {self.bitcoin_address[:8]}",
+            update_interval=self.scheduler.timedelta,
+        )
+
+    async def async_restore(self) -> bool:
+        """Load the last saved snapshot as the current data.
+
+        Returns True if a snapshot was restored, so sensors can come up with
+        the last known values while the first live refresh runs. A snapshot
+        that cannot be read is ignored and the entry starts cold.
+        """
+        try:
+            stored = await self._store.async_load()
+            if not stored or not stored.get("data"):
+                return False
+            data = snapshot_from_json(stored["data"])
+            rolling = (
+                RollingHashrates.from_dict(stored["rolling"])
+                if stored.get("rolling")
+                else self.rolling
+            )
+            worker_statistics = (
+                WorkerStatistics.from_dict(stored["worker_statistics"])
+                if self.worker_statistics is not None and stored.get("worker_statistics")
+                else self.worker_statistics
+            )
+        except (HomeAssistantError, AttributeError, KeyError, TypeError, ValueError) as err:
+            _LOGGER.warning(
+                f"Ignoring unreadable Public Pool snapshot for {self.bitcoin_address}: {err!r}"
+            )
+            return False
+        
+        self.data = data
+        self.rolling = rolling
+        self.worker_statistics = worker_statistics
+        # Restored sections count as stale from now if the first refresh fails
+        now = time.time()
+        for address in self.data["addresses"]:
+            if address in self._stale_since:
+                self._stale_since[address] = now
+        for section in SHARED_SECTIONS:
+            # 0 means the shared poller has not fetched the section yet
+            if self.shared.stale_since.get(section) == 0.0:
+                self.shared.stale_since[section] = now
+        _LOGGER.debug(f"Restored last Public Pool snapshot for {self.bitcoin_address}")
+        return True
+
+    @callback
+    def _async_schedule_save(self) -> None:
+        """Save the current data, at most once per SNAPSHOT_SAVE_DELAY.
+
+        Store.async_delay_save restarts its timer on every call, so without
+        this guard a save delay longer than the scan interval would only ever
+        write on shutdown.
+        """
+        now = time.monotonic()
+        if (
+            self._save_scheduled_at is not None
+            and now - self._save_scheduled_at < SNAPSHOT_SAVE_DELAY
+        ):
+            return
+        
+        self._save_scheduled_at = now
+        self._store.async_delay_save(
+            lambda: {
+                "data": snapshot_to_json(self.data),
+                "rolling": self.rolling.as_dict(),
+                "worker_statistics": (
+                    self.worker_statistics.as_dict()
+                    if self.worker_statistics is not None
+                    else None
+                ),
+            },
+            SNAPSHOT_SAVE_DELAY,
+        )
+
+    def _is_expired(self, stale_since: float | None, now: float) -> bool:
+        """Return whether data stale since stale_since is past the stale TTL.
+
+        With a stale TTL of 0, data expires on the first failure.
+        """
+        return stale_since is not None and now - stale_since >= self.stale_ttl
+
+    def _shared_sections(self, now: float) -> tuple[list[str], list[str]]:
+        """Return the stale and the expired shared sections."""
+        stale = []
+        expired = []
+        for section in SHARED_SECTIONS:
+            stale_since = self.shared.stale_since.get(section)
+            if self._is_expired(stale_since, now):
+                expired.append(section)
+            elif stale_since is not None:
+                stale.append(section)
+        return stale, expired
+
+    @callback
+    def async_handle_shared_update(self) -> None:
+        """Merge fresh pool and network data without refetching the address."""
+        if self.data is None:
+            return
+        
+        # The shared coordinator keeps its last good data after a failure
+        data = {**self.data, **(self.shared.data or {})}
+        stale, expired = self._shared_sections(time.time())
+        data["stale"] = stale + [
+            section for section in self.data.get("stale", []) if section not in SHARED_SECTIONS
+        ]
+        data["expired"] = expired + [
+            section for section in self.data.get("expired", []) if section not in SHARED_SECTIONS
+        ]
+        data["addresses"] = dict(data["addresses"])
+        self._add_metrics(data)
+        self.data = data
+        self.changed_keys = self._compute_shared_changes(self.data)
+        self.async_update_listeners()
+
+    def _compute_shared_changes(self, data: dict[str, Any]) -> set[Hashable]:
+        """Return the pool, network and address metric keys whose values changed."""
+        tracker = self._changes
+        changes: set[Hashable] = {
+            key
+            for key in SHARED_KEYS
+            if tracker.check(key, data.get(key), key in HASHRATE_KEYS)
+        }
+        self._diff_stale(SHARED_SECTIONS, data, changes)
+        
+        for address, address_data in data["addresses"].items():
+            for key in ADDRESS_METRIC_KEYS:
+                if tracker.check((address, key), address_data.get(key), key in HASHRATE_KEYS):
+                    changes.add((address, key))
+        return changes
+
+    def _diff_stale(
+        self, sections: Iterable[str], data: dict[str, Any], changes: set[Hashable]
+    ) -> None:
+        """Add ("stale", section) to changes for sections that became or stopped being stale."""
+        stale = data.get("stale", ())
+        for section in sections:
+            if self._changes.check(("stale", section), section in stale):
+                changes.add(("stale", section))
+
+    def _compute_changes(self, data: dict[str, Any]) -> set[Hashable]:
+        """Return the keys of every value that changed significantly.
+
+        Keys are pool/network key names, (address, key) for address and
+        summary values, (address, worker, field) for worker values and
+        ("stale", section) for the stale marks.
+        """
+        tracker = self._changes
+        changes = self._compute_shared_changes(data)
+        self._diff_stale(self.bitcoin_addresses, data, changes)
+        
+        if tracker.check("effective_scan_interval", self.update_interval.total_seconds()):
+            changes.add("effective_scan_interval")
+        # Request statistics move on every refresh
+        changes.add("diagnostics")
+        
+        for address, address_data in data["addresses"].items():
+            for key in ADDRESS_KEYS:
+                if tracker.check((address, key), address_data.get(key), key in HASHRATE_KEYS):
+                    changes.add((address, key))
+            
+            for key, summary in address_data.get("summary", {}).items():
+                if tracker.check(
+                    (address, key),
+                    self._summary_signature(summary, address_data["workers"]),
+                    key in HASHRATE_KEYS,
+                ):
+                    changes.add((address, key))
+            
+            self._diff_rolling(address, (address, "address_total_hashrate"), changes)
+            self._diff_workers(address, address_data["workers"], changes)
+            for name in address_data["workers"]:
+                self._diff_rolling((address, name), (address, name, "hashrate"), changes)
+        
+        return changes
+
+    @staticmethod
+    def _summary_signature(summary: dict[str, Any], workers: WorkerTable) -> tuple:
+        """Return what a summary sensor shows, in a form the tracker compares.
+
+        Attributes are included, so percentiles and worker lists are written
+        when they move, not only when the value does. Histogram labels change
+        with every move of the slowest or fastest worker, so the histogram is
+        compared by its counts and hashrate range instead.
+        """
+        attributes = summary["attributes"]
+        histogram = attributes.get("histogram")
+        if histogram is not None:
+            attributes = {
+                **attributes,
+                "histogram": (
+                    tuple(histogram.values()),
+                    min(workers.hashrate, default=0.0),
+                    max(workers.hashrate, default=0.0),
+                ),
+            }
+        return summary["value"], attributes
+
+    def _diff_rolling(
+        self, key: str | tuple[str, str], change_key: Hashable, changes: set[Hashable]
+    ) -> None:
+        """Add change_key to changes if a rolling mean of key moved."""
+        series = self.rolling.get(key)
+        if series is None:
+            return
+        for name, window in series.windows.items():
+            if self._changes.check((key, "rolling", name), window.mean, True):
+                changes.add(change_key)
+
+    def _diff_workers(
+        self, address: str, workers: WorkerTable, changes: set[Hashable]
+    ) -> None:
+        """Add changed worker fields of an address to changes."""
+        previous = self._diffed_workers.get(address)
+        if previous is workers:
+            # Same parsed table as last time (304 or unchanged body)
+            return
+        self._diffed_workers[address] = workers
+        tracker = self._changes
+        
+        for name, hashrate, best_difficulty, last_seen, session_id, start_time in zip(
+            workers.names,
+            workers.hashrate,
+            workers.best_difficulty,
+            workers.last_seen,
+            workers.session_ids,
+            workers.start_times,
+        ):
+            # Session attributes are shown on all three worker sensors
+            session_changed = tracker.check((address, name, "session"), (session_id, start_time))
+            values = (hashrate, best_difficulty, last_seen)
+            for field, value in zip(WORKER_FIELDS, values):
+                if tracker.check((address, name, field), value, field in HASHRATE_KEYS) or session_changed:
+                    changes.add((address, name, field))
+        
+        if previous is None:
+            return
+        
+        # Departed workers must write once to become unavailable
+        for name in previous:
+            if name in workers:
+                continue
+            tracker.forget((address, name, "session"))
+            for field in WORKER_FIELDS:
+                tracker.forget((address, name, field))
+                changes.add((address, name, field))
+
+    async def _async_fetch_clients(
+        self, request: tuple[set[str] | None, float] | None
+    ) -> dict[str, dict[str, Any] | None]:
+        """Fetch and parse client data for every address with bounded concurrency.
+
+        Request start times are staggered over a fraction of the base scan
+        interval so a large address list does not hit the pool in one burst.
+        A refresh requested as (addresses, min age) is not staggered, and
+        reuses recent responses.
+        """
+        addresses = self.bitcoin_addresses
+        spacing = 0.0
+        if len(addresses) > 1 and request is None:
+            spacing = (
+                self.scheduler.base_interval * CLIENT_POLL_SPREAD / len(addresses)
+            )
+        
+        async def _fetch(index: int, address: str) -> dict[str, Any] | None:
+            # The config flow just fetched this address; skip the request
+            warm = async_pop_warm_client(self.hass, self.pool_url, address)
+            if warm is not None:
+                try:
+                    return self._parse_client_data(warm)
+                except Exception as err:
+                    # As for a fetched body that does not parse; ask the pool
+                    _LOGGER.warning(
+                        f"Failed to parse the config flow data for {address}: {err!r}"
+                    )
+            if spacing:
+                await asyncio.sleep(index * spacing)
+            max_age = None
+            if request is not None:
+                requested, min_age = request
+                # Addresses left out of the request keep any data they have
+                max_age = min_age if requested is None or address in requested else math.inf
+            async with self._semaphore:
+                try:
+                    return await self.api.fetch_client_info(
+                        address, self._parse_client_data, max_age
+                    )
+                except Exception as err:
+                    _LOGGER.error(f"Error fetching client data for {address}: {err}")
+                    return None
+        
+        results = await asyncio.gather(
+            *(_fetch(index, address) for index, address in enumerate(addresses))
+        )
+        return dict(zip(addresses, results))
+
     def _parse_client_data(self, client_data: dict[str, Any]) -> dict[str, Any]:
         """Parse client/address information."""
-        result = {}
+        result = default_address_data()
         
         if not client_data:
             return result
@@ -192,7 +928,7 @@ class PublicPoolCoordinator(DataUpdateCoordinator):
         result["address_workers_count"] = int(client_data.get("workersCount", 0))
         
         # Parse workers
-        workers = {}
+        workers = WorkerTable()
         total_hashrate = 0.0
         
         for worker in client_data.get("workers", []):
@@ -202,90 +938,246 @@ class PublicPoolCoordinator(DataUpdateCoordinator):
             hashrate_ghs = hashrate_hs / 1_000_000_000
             total_hashrate += hashrate_ghs
             
-            workers[name] = {
-                "session_id": worker.get("sessionId"),
-                "name": name,
-                "best_difficulty": float(worker.get("bestDifficulty", 0)),
-                "hashrate": hashrate_ghs,
-                "start_time": worker.get("startTime"),
-                "last_seen": worker.get("lastSeen"),
-            }
+            workers.add(
+                name,
+                worker.get("sessionId"),
+                hashrate_ghs,
+                float(worker.get("bestDifficulty", 0)),
+                worker.get("startTime"),
+                worker.get("lastSeen"),
+            )
         
         result["workers"] = workers
         result["address_total_hashrate"] = total_hashrate
         
         return result
 
+    def _update_rolling(
+        self,
+        clients: dict[str, dict[str, Any] | None],
+    ) -> None:
+        """Add this refresh's hashrates to the rolling means.
+
+        Addresses whose request failed are skipped rather than counted as
+        zero hashrate.
+        """
+        now = time.time()
+        rolling = self.rolling
+        for address, client_data in clients.items():
+            if not client_data:
+                continue
+            rolling.add(address, now, client_data["address_total_hashrate"])
+            workers = client_data["workers"]
+            for name, hashrate in zip(workers.names, workers.hashrate):
+                rolling.add((address, name), now, hashrate)
+        rolling.prune(now)
+
+    def _update_worker_statistics(
+        self,
+        clients: dict[str, dict[str, Any] | None],
+    ) -> None:
+        """Add this refresh's worker hashrates to the hourly statistics.
+
+        The first refresh of a new hour writes the finished hour, as one
+        batch, to the recorder. Failed addresses are skipped.
+        """
+        statistics = self.worker_statistics
+        completed = statistics.roll(time.time())
+        if completed is not None:
+            async_write_worker_statistics(self.hass, *completed)
+        for address, client_data in clients.items():
+            if client_data:
+                workers = client_data["workers"]
+                statistics.add(address, workers.names, workers.hashrate)
+
+    def _add_metrics(self, data: dict[str, Any]) -> None:
+        """Attach block odds for the pool and each address.
+
+        Computed once per refresh and per shared update, so sensors only read
+        them. Address entries are replaced rather than modified, like the
+        summaries.
+        """
+        network_difficulty = data.get("network_difficulty", 0.0)
+        network_hashrate = data.get("network_hashrate", 0.0) * EXA
+        
+        data.update(
+            mining_metrics(
+                "pool",
+                data.get("pool_hashrate", 0.0) * TERA,
+                network_difficulty,
+                network_hashrate,
+            )
+        )
+        
+        addresses = data["addresses"]
+        for address, address_data in addresses.items():
+            addresses[address] = {
+                **address_data,
+                **mining_metrics(
+                    "address",
+                    address_data.get("address_total_hashrate", 0.0) * GIGA,
+                    network_difficulty,
+                    network_hashrate,
+                ),
+                "address_luck": luck(
+                    address_data.get("address_best_difficulty", 0.0),
+                    network_difficulty,
+                ),
+            }
+
+    def _add_summaries(self, addresses: dict[str, dict[str, Any]]) -> None:
+        """Attach farm summary aggregates to each address.
+
+        Parsed address data may be shared with the response cache, so each
+        entry is replaced rather than modified.
+        """
+        now = time.time()
+        for address, address_data in addresses.items():
+            addresses[address] = {
+                **address_data,
+                "summary": address_data["workers"].summary(
+                    now,
+                    STALE_WORKER_AGE.total_seconds(),
+                    SUMMARY_TOP_N,
+                    SUMMARY_HISTOGRAM_BUCKETS,
+                ),
+            }
+
     async def _async_update_data(self):
         """Fetch data from Public Pool API."""
+        return await self._async_fetch_data(None)
+
+    async def _async_fetch_data(
+        self, request: tuple[set[str] | None, float] | None
+    ) -> dict[str, Any]:
+        """Fetch and merge data, for a requested refresh if request is given."""
+        self.changed_keys = None
+        started = time.perf_counter()
         try:
-            _LOGGER.debug(f"Fetching data for Public Pool address {self.bitcoin_address}")
-            
-            # Fetch all data in parallel
-            pool_data, network_data, client_data = await asyncio.gather(
-                self.api.fetch_pool_info(),
-                self.api.fetch_network_info(),
-                self.api.fetch_client_info(),
-                return_exceptions=True
+            _LOGGER.debug(
+                f"Fetching data for {len(self.bitcoin_addresses)} Public Pool address(es)"
             )
             
-            # Check for exceptions
-            if isinstance(pool_data, Exception):
-                _LOGGER.error(f"Error fetching pool data: {pool_data}")
-                pool_data = None
-            if isinstance(network_data, Exception):
-                _LOGGER.error(f"Error fetching network data: {network_data}")
-                network_data = None
-            if isinstance(client_data, Exception):
-                _LOGGER.error(f"Error fetching client data: {client_data}")
-                client_data = None
+            # Pool and network data are polled once per pool by the shared coordinator
+            clients = await self._async_fetch_clients(request)
+            now = time.time()
+            previous = self.data.get("addresses", {}) if self.data else {}
             
-            # If all failed, increment failure count
-            if not any([pool_data, network_data, client_data]):
-                self._failure_count += 1
-                
-                if self._failure_count == 1:
-                    _LOGGER.warning(f"Public Pool API returned no data")
-                    return DEFAULT_DATA.copy()
-                
-                raise UpdateFailed(f"Public Pool API failed")
-            
-            # Parse data
-            data = DEFAULT_DATA.copy()
+            data = default_data()
+            if self.shared.data is not None:
+                data.update(self.shared.data)
+            elif self.data:
+                # The shared poller has nothing yet; keep the restored pool data
+                data.update(
+                    (key, value)
+                    for key, value in self.data.items()
+                    if key not in ("addresses", "stale", "expired")
+                )
             data["bitcoin_address"] = self.bitcoin_address
+            data["stale"], data["expired"] = self._shared_sections(now)
             
-            if pool_data:
-                data.update(self._parse_pool_data(pool_data))
+            # Failed addresses keep their last good data until the stale TTL
+            addresses = data["addresses"]
+            for address, client_data in clients.items():
+                if client_data:
+                    self._stale_since.pop(address, None)
+                    addresses[address] = client_data
+                    continue
+                stale_since = self._stale_since.setdefault(address, now)
+                if address in previous and not self._is_expired(stale_since, now):
+                    addresses[address] = previous[address]
+                    data["stale"].append(address)
+                else:
+                    data["expired"].append(address)
             
-            if network_data:
-                data.update(self._parse_network_data(network_data))
+            if not addresses and all(section in data["expired"] for section in SHARED_SECTIONS):
+                self.update_interval = self.scheduler.record_failure()
+                raise UpdateFailed("Public Pool API failed and no recent data is left")
             
-            if client_data:
-                data.update(self._parse_client_data(client_data))
+            if self.summary_mode:
+                self._add_summaries(addresses)
+            self._add_metrics(data)
+            self._update_rolling(clients)
+            if self.worker_statistics is not None:
+                self._update_worker_statistics(clients)
             
-            # Reset failure count on success
-            self._failure_count = 0
+            if any(clients.values()):
+                # Poll less often while the addresses report nothing new
+                self.update_interval = self.scheduler.record_success(
+                    addresses != previous
+                )
+            else:
+                self.update_interval = self.scheduler.record_failure()
+            self._async_schedule_save()
+            self.changed_keys = self._compute_changes(data)
             
             _LOGGER.debug(
                 f"Got data from Public Pool for {self.bitcoin_address}: "
                 f"pool_hashrate={data.get('pool_hashrate', 0):.2f} TH/s, "
-                f"address_hashrate={data.get('address_total_hashrate', 0):.2f} GH/s, "
-                f"workers={len(data.get('workers', {}))}"
+                f"addresses={sum(1 for client in clients.values() if client)}"
+                f"/{len(clients)}, "
+                f"workers={sum(len(a['workers']) for a in addresses.values())}, "
+                f"stale={data['stale']}, expired={data['expired']}, "
+                f"not_modified={dict(self.api.cache_hits)}"
             )
             
+            self.refresh_times.record((time.perf_counter() - started) * 1000)
             return data
             
+        except UpdateFailed:
+            raise
         except Exception as err:
-            self._failure_count += 1
-            
-            if self._failure_count == 1:
-                _LOGGER.warning(f"Error fetching data from Public Pool: {err}")
-                return DEFAULT_DATA.copy()
-            
+            self.update_interval = self.scheduler.record_failure()
             _LOGGER.exception(f"Failed to fetch data from Public Pool")
             raise UpdateFailed(f"Error communicating with Public Pool API: {err}")
 
+    async def async_refresh_requested(
+        self, addresses: set[str] | None, min_age: float
+    ) -> None:
+        """Refresh now on behalf of the refresh service.
+
+        Responses younger than min_age seconds are reused instead of
+        refetched. If addresses is given, the other addresses only fetch
+        when they have no response yet. Callers arriving while a requested
+        refresh covering their addresses at least as freshly is in flight
+        wait for that one instead of starting their own.
+        """
+        requested = self._requested_refresh
+        if (
+            requested is None
+            or requested[2].done()
+            or requested[1] > min_age
+            or (
+                requested[0] is not None
+                and (addresses is None or not addresses <= requested[0])
+            )
+        ):
+            requested = self._requested_refresh = (
+                addresses,
+                min_age,
+                self.hass.async_create_task(
+                    async_publish_requested_refresh(
+                        self, self._async_fetch_data((addresses, min_age))
+                    ),
+                    f"{DOMAIN} requested refresh {self.bitcoin_address}",
+                ),
+            )
+        else:
+            # Counted like callers joining a request in flight
+            counts = current_request_counts()
+            if counts is not None:
+                counts.coalesced += 1
+        # One caller giving up must not cancel the refresh for the others
+        await asyncio.shield(requested[2])
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update all listeners, timing the state writes they make."""
+        started = time.perf_counter()
+        super().async_update_listeners()
+        self.listener_times.record((time.perf_counter() - started) * 1000)
+
     @property
     def available(self) -> bool:
         """Return if Public Pool API is available."""
-        return self._failure_count < 2
+        return self.last_update_success
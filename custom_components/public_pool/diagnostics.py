@@ -0,0 +1,55 @@
+"""Diagnostics support for Public Pool."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .api import PublicPoolAPI
+from .const import CONF_BITCOIN_ADDRESS, CONF_BITCOIN_ADDRESSES, DOMAIN
+from .coordinator import PublicPoolCoordinator
+
+TO_REDACT = {CONF_BITCOIN_ADDRESS, CONF_BITCOIN_ADDRESSES}
+
+
+def _api_diagnostics(api: PublicPoolAPI) -> dict[str, Any]:
+    """Return request statistics, cache counters, breaker, mirror and rate limiter states."""
+    return {
+        "requests": api.stats.as_dict(),
+        "cache": api.cache_stats,
+        "breakers": api.breaker_states,
+        "mirrors": api.mirrors.as_dict(),
+        "rate_limiters": api.rate_limiters,
+    }
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator: PublicPoolCoordinator = hass.data[DOMAIN][entry.entry_id]
+    shared = coordinator.shared
+    addresses = (coordinator.data or {}).get("addresses", {})
+
+    return {
+        "entry": async_redact_data(dict(entry.data), TO_REDACT),
+        "coordinator": {
+            "last_update_success": coordinator.last_update_success,
+            "update_interval": coordinator.update_interval.total_seconds(),
+            "consecutive_failures": coordinator.scheduler.failures,
+            "addresses": len(coordinator.bitcoin_addresses),
+            "workers": sum(len(data["workers"]) for data in addresses.values()),
+            "refresh": coordinator.refresh_times.as_dict(),
+            "entity_updates": coordinator.listener_times.as_dict(),
+            **_api_diagnostics(coordinator.api),
+        },
+        "shared": {
+            "pool_url": shared.pool_url,
+            "entries": shared.refcount,
+            "last_update_success": shared.last_update_success,
+            "update_interval": shared.update_interval.total_seconds(),
+            **_api_diagnostics(shared.api),
+        },
+    }
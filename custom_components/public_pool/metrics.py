@@ -0,0 +1,65 @@
+"""Block odds derived from hashrate and network difficulty."""
+from __future__ import annotations
+
+import math
+
+from .const import BLOCK_CHANCE_WINDOWS
+
+# Multipliers from the units the coordinator stores hashrates in to H/s
+GIGA = 1e9
+TERA = 1e12
+EXA = 1e18
+
+# Expected hashes per block at difficulty 1
+HASHES_PER_DIFFICULTY = 2**32
+
+
+def expected_time_to_block(hashrate: float, network_difficulty: float) -> float | None:
+    """Return the expected seconds to find a block at hashrate (H/s)."""
+    if hashrate <= 0 or network_difficulty <= 0:
+        return None
+    return network_difficulty * HASHES_PER_DIFFICULTY / hashrate
+
+
+def block_chance(seconds: float, expected: float | None) -> float | None:
+    """Return the chance, in percent, of at least one block within seconds.
+
+    Blocks arrive as a Poisson process, so P = 1 - exp(-t / ETB); expm1
+    keeps precision for the tiny odds of small miners.
+    """
+    if expected is None:
+        return None
+    return -math.expm1(-seconds / expected) * 100
+
+
+def mining_metrics(
+    prefix: str,
+    hashrate: float,
+    network_difficulty: float,
+    network_hashrate: float,
+) -> dict[str, float | None]:
+    """Return the block odds of a miner as coordinator data keys.
+
+    Hashrates are in H/s. Keys are prefixed with prefix, e.g.
+    pool_expected_time_to_block or address_block_chance_24h.
+    """
+    expected = expected_time_to_block(hashrate, network_difficulty)
+    metrics: dict[str, float | None] = {
+        f"{prefix}_expected_time_to_block": expected,
+        f"{prefix}_network_share": (
+            hashrate / network_hashrate * 100 if network_hashrate > 0 else None
+        ),
+    }
+    for name, seconds in BLOCK_CHANCE_WINDOWS.items():
+        metrics[f"{prefix}_block_chance_{name}"] = block_chance(seconds, expected)
+    return metrics
+
+
+def luck(best_difficulty: float, network_difficulty: float) -> float | None:
+    """Return the best share difficulty as a percentage of network difficulty.
+
+    100% or more means the share would have been a block.
+    """
+    if network_difficulty <= 0:
+        return None
+    return best_difficulty / network_difficulty * 100
@@ -0,0 +1,122 @@
+"""Latency ranking of a pool URL and its mirrors."""
+from __future__ import annotations
+
+from typing import Any
+
+from .const import (
+    HEDGE_DEFAULT_DELAY,
+    HEDGE_MIN_DELAY,
+    HEDGE_MIN_SAMPLES,
+    MIRROR_EWMA_ALPHA,
+    READ_TIMEOUT,
+)
+from .stats import Histogram
+
+
+class Mirror:
+    """Latency estimate and health of one base URL.
+
+    The estimate is an exponentially weighted moving average of response
+    times. A transient failure counts as a response that took READ_TIMEOUT,
+    so a failing mirror sinks in the ranking and climbs back once it answers
+    quickly again.
+    """
+
+    __slots__ = (
+        "url",
+        "ewma",
+        "latency",
+        "failures",
+        "consecutive_failures",
+        "last_error",
+        "wins",
+    )
+
+    def __init__(self, url: str) -> None:
+        """Initialize without measurements."""
+        self.url = url
+        self.ewma: float | None = None
+        self.latency = Histogram()
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.last_error: str | None = None
+        # Requests this mirror answered first
+        self.wins = 0
+
+    def _sample(self, seconds: float) -> None:
+        """Fold one response time into the moving average."""
+        if self.ewma is None:
+            self.ewma = seconds
+        else:
+            self.ewma += MIRROR_EWMA_ALPHA * (seconds - self.ewma)
+
+    def record_success(self, seconds: float) -> None:
+        """Record a response the mirror sent after seconds."""
+        self._sample(seconds)
+        self.latency.record(seconds * 1000)
+        self.consecutive_failures = 0
+
+    def record_cancelled(self, seconds: float) -> None:
+        """Record a request cancelled after seconds because another mirror won.
+
+        Only the moving average sees it; the true latency is unknown but at
+        least seconds, so a mirror that keeps losing moves down the ranking.
+        """
+        self._sample(seconds)
+
+    def record_failure(self, reason: str) -> None:
+        """Record a transient failure."""
+        self._sample(READ_TIMEOUT)
+        self.failures += 1
+        self.consecutive_failures += 1
+        self.last_error = reason
+
+    @property
+    def hedge_delay(self) -> float:
+        """Return the seconds to wait for this mirror before asking the next.
+
+        That is the mirror's p95 latency once it has enough samples.
+        """
+        if self.latency.count < HEDGE_MIN_SAMPLES:
+            return HEDGE_DEFAULT_DELAY
+        return max(self.latency.quantile(95) / 1000, HEDGE_MIN_DELAY)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a JSON serializable health summary."""
+        return {
+            "url": self.url,
+            "ewma_ms": None if self.ewma is None else round(self.ewma * 1000, 2),
+            "hedge_delay_ms": round(self.hedge_delay * 1000, 2),
+            "failures": self.failures,
+            "consecutive_failures": self.consecutive_failures,
+            "last_error": self.last_error,
+            "wins": self.wins,
+            "latency": self.latency.as_dict(),
+        }
+
+
+class MirrorSet:
+    """The configured pool URL followed by its mirrors."""
+
+    def __init__(self, urls: list[str]) -> None:
+        """Initialize with the base URLs in configured order."""
+        self.mirrors = [Mirror(url) for url in dict.fromkeys(urls)]
+        self.hedges = 0
+
+    def ranked(self) -> list[Mirror]:
+        """Return the mirrors, fastest estimate first.
+
+        Unmeasured mirrors rank first, so each one is asked once and gets
+        an estimate; ties keep the configured order.
+        """
+        return sorted(
+            self.mirrors,
+            key=lambda mirror: 0.0 if mirror.ewma is None else mirror.ewma,
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a JSON serializable health summary of every mirror."""
+        return {
+            "hedged_requests": self.hedges,
+            "mirrors": [mirror.as_dict() for mirror in self.mirrors],
+        }
@@ -0,0 +1,262 @@
+"""Data model for Public Pool workers."""
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+
+def iso_to_epoch(value: str | None) -> float:
+    """Convert an ISO 8601 timestamp to epoch seconds, 0.0 if missing or invalid."""
+    if not value:
+        return 0.0
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+    except (ValueError, AttributeError):
+        return 0.0
+
+
+def _percentile(ranked: list[float], percent: float) -> float:
+    """Return a linearly interpolated percentile (0-100) of sorted values."""
+    if not ranked:
+        return 0.0
+    rank = (len(ranked) - 1) * percent / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(ranked) - 1)
+    return ranked[lower] + (ranked[upper] - ranked[lower]) * (rank - lower)
+
+
+@dataclass(frozen=True, slots=True)
+class WorkerSnapshot:
+    """Immutable view of one worker at the time of a refresh."""
+
+    name: str
+    session_id: str | None
+    hashrate: float  # GH/s
+    best_difficulty: float
+    start_time: str | None
+    last_seen: str | None
+    last_seen_epoch: float
+
+
+class WorkerTable:
+    """Workers of one address, stored column by column.
+
+    Numeric values live in parallel arrays indexed by position, with a name
+    to position index. This keeps large farms compact and makes sums and
+    percentiles over a column cheap; WorkerSnapshot objects are only built
+    when a single worker is looked up.
+    """
+
+    __slots__ = (
+        "_index",
+        "names",
+        "session_ids",
+        "start_times",
+        "last_seen",
+        "hashrate",
+        "best_difficulty",
+        "last_seen_epoch",
+        "_ranked_summary",
+    )
+
+    def __init__(self) -> None:
+        """Initialize an empty table."""
+        self._index: dict[str, int] = {}
+        self.names: list[str] = []
+        self.session_ids: list[str | None] = []
+        self.start_times: list[str | None] = []
+        self.last_seen: list[str | None] = []
+        self.hashrate = array("d")
+        self.best_difficulty = array("d")
+        self.last_seen_epoch = array("d")
+        # (top_n, buckets, aggregates) of the last summary that sorted the table
+        self._ranked_summary: tuple[int, int, dict[str, Any]] | None = None
+
+    def add(
+        self,
+        name: str,
+        session_id: str | None,
+        hashrate: float,
+        best_difficulty: float,
+        start_time: str | None,
+        last_seen: str | None,
+    ) -> None:
+        """Add a worker, replacing an earlier one with the same name."""
+        epoch = iso_to_epoch(last_seen)
+        position = self._index.get(name)
+        self._ranked_summary = None
+
+        if position is not None:
+            self.session_ids[position] = session_id
+            self.start_times[position] = start_time
+            self.last_seen[position] = last_seen
+            self.hashrate[position] = hashrate
+            self.best_difficulty[position] = best_difficulty
+            self.last_seen_epoch[position] = epoch
+            return
+
+        self._index[name] = len(self.names)
+        self.names.append(name)
+        self.session_ids.append(session_id)
+        self.start_times.append(start_time)
+        self.last_seen.append(last_seen)
+        self.hashrate.append(hashrate)
+        self.best_difficulty.append(best_difficulty)
+        self.last_seen_epoch.append(epoch)
+
+    def __len__(self) -> int:
+        """Return the number of workers."""
+        return len(self.names)
+
+    def __contains__(self, name: object) -> bool:
+        """Return whether a worker is present."""
+        return name in self._index
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over worker names."""
+        return iter(self.names)
+
+    def __eq__(self, other: object) -> bool:
+        """Compare all columns."""
+        if not isinstance(other, WorkerTable):
+            return NotImplemented
+        return (
+            self.names == other.names
+            and self.hashrate == other.hashrate
+            and self.best_difficulty == other.best_difficulty
+            and self.last_seen == other.last_seen
+            and self.session_ids == other.session_ids
+            and self.start_times == other.start_times
+        )
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def get(self, name: str) -> WorkerSnapshot | None:
+        """Return a snapshot of a worker, or None if it is not present."""
+        position = self._index.get(name)
+        if position is None:
+            return None
+        return WorkerSnapshot(
+            name=name,
+            session_id=self.session_ids[position],
+            hashrate=self.hashrate[position],
+            best_difficulty=self.best_difficulty[position],
+            start_time=self.start_times[position],
+            last_seen=self.last_seen[position],
+            last_seen_epoch=self.last_seen_epoch[position],
+        )
+
+    def percentile(self, column: str, percent: float) -> float:
+        """Return a percentile (0-100) of a numeric column, 0.0 when empty."""
+        return _percentile(sorted(getattr(self, column)), percent)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a JSON serializable column dict."""
+        return {
+            "name": self.names,
+            "session_id": self.session_ids,
+            "start_time": self.start_times,
+            "last_seen": self.last_seen,
+            "hashrate": self.hashrate.tolist(),
+            "best_difficulty": self.best_difficulty.tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> WorkerTable:
+        """Rebuild a table from as_dict output."""
+        table = cls()
+        for row in zip(
+            data["name"],
+            data["session_id"],
+            data["hashrate"],
+            data["best_difficulty"],
+            data["start_time"],
+            data["last_seen"],
+        ):
+            table.add(*row)
+        return table
+
+    def summary(
+        self, now: float, stale_after: float, top_n: int, buckets: int
+    ) -> dict[str, Any]:
+        """Return farm-level aggregates for summary sensors.
+
+        Only the stale count depends on now. The aggregates that need the
+        hashrate column sorted are kept until a worker is added, so polls
+        returning the same table do not sort it again.
+        """
+        cutoff = now - stale_after
+        stale = sum(1 for epoch in self.last_seen_epoch if epoch < cutoff)
+
+        cached = self._ranked_summary
+        if cached is None or cached[:2] != (top_n, buckets):
+            cached = self._ranked_summary = (top_n, buckets, self._rank(top_n, buckets))
+        ranked = cached[2]
+
+        return {
+            "online_workers": {"value": len(self.names) - stale, "attributes": {}},
+            "stale_workers": {
+                "value": stale,
+                "attributes": {"stale_after_seconds": stale_after},
+            },
+            **ranked,
+        }
+
+    def _rank(self, top_n: int, buckets: int) -> dict[str, Any]:
+        """Return the summaries derived from the sorted hashrate column.
+
+        Sorts the hashrate column once and derives percentiles, the histogram
+        and the top/bottom workers from that order.
+        """
+        hashrate = self.hashrate
+        order = sorted(range(len(hashrate)), key=hashrate.__getitem__)
+        ranked = [hashrate[position] for position in order]
+
+        histogram: dict[str, int] = {}
+        if ranked:
+            low, high = ranked[0], ranked[-1]
+            if low == high:
+                # All workers at one hashrate; equal buckets would have no width
+                histogram = {f"{low:.2f}-{high:.2f}": len(ranked)}
+            else:
+                width = (high - low) / buckets
+                counts = [0] * buckets
+                for value in ranked:
+                    counts[min(int((value - low) / width), buckets - 1)] += 1
+                histogram = {
+                    f"{low + width * index:.2f}-{low + width * (index + 1):.2f}": count
+                    for index, count in enumerate(counts)
+                }
+
+        def workers(positions: list[int]) -> list[dict[str, Any]]:
+            return [
+                {"name": self.names[position], "hashrate": round(hashrate[position], 2)}
+                for position in positions
+            ]
+
+        fastest = workers(order[::-1][:top_n])
+        slowest = workers(order[:top_n])
+
+        return {
+            "hashrate_median": {
+                "value": _percentile(ranked, 50),
+                "attributes": {
+                    "p10": _percentile(ranked, 10),
+                    "p25": _percentile(ranked, 25),
+                    "p75": _percentile(ranked, 75),
+                    "p90": _percentile(ranked, 90),
+                    "histogram": histogram,
+                },
+            },
+            "fastest_workers": {
+                "value": fastest[0]["hashrate"] if fastest else None,
+                "attributes": {"workers": fastest},
+            },
+            "slowest_workers": {
+                "value": slowest[0]["hashrate"] if slowest else None,
+                "attributes": {"workers": slowest},
+            },
+        }
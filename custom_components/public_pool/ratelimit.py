@@ -0,0 +1,178 @@
+"""Request rate limiting shared by every client of a pool host."""
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from collections.abc import Hashable
+from email.utils import parsedate_to_datetime
+import time
+from typing import Any
+from urllib.parse import urlsplit
+
+from .const import RATE_LIMIT_BURST, RATE_LIMIT_PER_SECOND
+from .stats import Histogram
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Return the seconds a Retry-After header asks to wait, if valid."""
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(retry_at.timestamp() - time.time(), 0.0)
+
+
+class HostRateLimiter:
+    """Token bucket for all requests to one host.
+
+    Requests take a token and wait in line when none is left. Waiting
+    requests are queued per key (a request path, so one address per queue)
+    and served round robin, so an entry with many addresses cannot starve
+    the others. A Retry-After from the host holds every request until it
+    has passed.
+    """
+
+    def __init__(self, host: str, rate: float, burst: float) -> None:
+        """Initialize a full bucket refilling at rate tokens per second."""
+        self.host = host
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated_at = time.monotonic()
+        self._blocked_until = 0.0
+        # Insertion ordered, so the first key is next in the round robin
+        self._queues: dict[Hashable, deque[asyncio.Future[None]]] = {}
+        self._timer: asyncio.TimerHandle | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self.waiting = 0
+        self.max_waiting = 0
+        self.granted = 0
+        self.rejected = 0
+        self.throttled = 0
+        self.wait_times = Histogram()
+
+    def _delay(self, now: float) -> float:
+        """Return the seconds until the next request may be sent."""
+        if now < self._blocked_until:
+            return self._blocked_until - now
+        self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+        if self._tokens >= 1:
+            return 0.0
+        return (1 - self._tokens) / self.rate
+
+    def _bind(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Drop waiters and timers left behind by a previous event loop."""
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = None
+        self._queues.clear()
+        self.waiting = 0
+        self._loop = loop
+
+    async def acquire(self, key: Hashable, max_wait: float) -> bool:
+        """Wait for a token; return False if the host blocks longer than max_wait."""
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._bind(loop)
+
+        now = time.monotonic()
+        if not self.waiting and not self._delay(now):
+            self._tokens -= 1
+            self.granted += 1
+            self.wait_times.record(0)
+            return True
+        if self._blocked_until - now > max_wait:
+            self.rejected += 1
+            return False
+
+        future: asyncio.Future[None] = loop.create_future()
+        self._queues.setdefault(key, deque()).append(future)
+        self.waiting += 1
+        self.max_waiting = max(self.max_waiting, self.waiting)
+        if self._timer is None:
+            self._dispatch()
+        try:
+            await future
+        except asyncio.CancelledError:
+            queue = self._queues.get(key)
+            if queue is not None and future in queue:
+                queue.remove(future)
+                self.waiting -= 1
+                if not queue:
+                    del self._queues[key]
+            raise
+        self.wait_times.record((time.monotonic() - now) * 1000)
+        return True
+
+    def _dispatch(self) -> None:
+        """Hand out tokens to waiting requests, one key at a time."""
+        self._timer = None
+        while self._queues:
+            delay = self._delay(time.monotonic())
+            if delay:
+                self._timer = self._loop.call_later(delay, self._dispatch)
+                return
+            key = next(iter(self._queues))
+            queue = self._queues.pop(key)
+            future = queue.popleft()
+            if queue:
+                # Back of the line for this key's next request
+                self._queues[key] = queue
+            self.waiting -= 1
+            if future.done():
+                # Cancelled, its task has not run its cleanup yet
+                continue
+            self._tokens -= 1
+            self.granted += 1
+            future.set_result(None)
+
+    def defer(self, seconds: float) -> None:
+        """Hold all requests for seconds, as asked by a 429 or Retry-After."""
+        self.throttled += 1
+        self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+        if self._timer is not None:
+            # Re-arm so waiters are not released before the block ends
+            self._timer.cancel()
+            self._timer = self._loop.call_later(seconds, self._dispatch)
+
+    @property
+    def blocked_for(self) -> float:
+        """Return the seconds left of a Retry-After hold."""
+        return max(self._blocked_until - time.monotonic(), 0.0)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a JSON serializable summary."""
+        return {
+            "rate_per_second": self.rate,
+            "burst": self.burst,
+            "tokens": round(min(self.burst, self._tokens), 2),
+            "queue_depth": self.waiting,
+            "max_queue_depth": self.max_waiting,
+            "granted": self.granted,
+            "rejected": self.rejected,
+            "throttled": self.throttled,
+            "blocked_for_s": round(self.blocked_for, 1),
+            "wait": self.wait_times.as_dict(),
+        }
+
+
+# Process wide, so every entry and the shared pollers of a host draw from one bucket
+_LIMITERS: dict[str, HostRateLimiter] = {}
+
+
+def host_rate_limiter(url: str) -> HostRateLimiter:
+    """Return the rate limiter of the host serving url."""
+    host = urlsplit(url).netloc.lower()
+    limiter = _LIMITERS.get(host)
+    if limiter is None:
+        limiter = _LIMITERS[host] = HostRateLimiter(
+            host, RATE_LIMIT_PER_SECOND, RATE_LIMIT_BURST
+        )
+    return limiter
@@ -0,0 +1,195 @@
+"""Rolling hashrate averages kept in fixed-size ring buffers."""
+from __future__ import annotations
+
+from array import array
+import base64
+import sys
+from typing import Any
+
+from .const import ROLLING_WINDOWS
+
+# Head bucket, running sum and running count precede the bucket columns
+_HEADER_SIZE = 3
+
+
+class RollingWindow:
+    """Mean of the samples of the last `buckets` time buckets.
+
+    Each bucket holds the sum and count of the samples that fell into it.
+    Running totals are kept alongside, so adding a sample and reading the
+    mean are O(1); moving forward in time only clears the buckets that
+    expired.
+    """
+
+    __slots__ = ("width", "size", "sums", "counts", "total", "count", "head")
+
+    def __init__(self, seconds: float, buckets: int) -> None:
+        """Initialize an empty window of the given length."""
+        self.width = seconds / buckets
+        self.size = buckets
+        self.sums = array("d", bytes(8 * buckets))
+        self.counts = array("d", bytes(8 * buckets))
+        self.total = 0.0
+        self.count = 0.0
+        # Absolute number of the newest bucket, -1 while empty
+        self.head = -1
+
+    def _advance(self, bucket: int) -> None:
+        """Move the head to bucket, clearing buckets that fell out."""
+        if bucket <= self.head:
+            return
+        if self.head < 0 or bucket - self.head >= self.size:
+            for index in range(self.size):
+                self.sums[index] = 0.0
+                self.counts[index] = 0.0
+            self.total = 0.0
+            self.count = 0.0
+        else:
+            for expired in range(self.head + 1, bucket + 1):
+                index = expired % self.size
+                self.total -= self.sums[index]
+                self.count -= self.counts[index]
+                self.sums[index] = 0.0
+                self.counts[index] = 0.0
+        self.head = bucket
+
+    def add(self, now: float, value: float) -> None:
+        """Add a sample taken at now (epoch seconds)."""
+        bucket = int(now // self.width)
+        self._advance(bucket)
+        index = bucket % self.size
+        self.sums[index] += value
+        self.counts[index] += 1
+        self.total += value
+        self.count += 1
+
+    @property
+    def mean(self) -> float | None:
+        """Return the mean as of the last sample, None without samples."""
+        if self.count < 1:
+            return None
+        return self.total / self.count
+
+    def to_array(self) -> array:
+        """Return the window as one array of doubles."""
+        values = array("d", (self.head, self.total, self.count))
+        values.extend(self.sums)
+        values.extend(self.counts)
+        return values
+
+    def load(self, values: array, offset: int) -> int:
+        """Restore from to_array output at offset, return the next offset."""
+        self.head = int(values[offset])
+        self.total = values[offset + 1]
+        self.count = values[offset + 2]
+        start = offset + _HEADER_SIZE
+        self.sums = values[start : start + self.size]
+        self.counts = values[start + self.size : start + 2 * self.size]
+        return start + 2 * self.size
+
+
+class RollingMeans:
+    """The ROLLING_WINDOWS means of one hashrate series."""
+
+    __slots__ = ("windows", "updated_at")
+
+    def __init__(self) -> None:
+        """Initialize empty windows."""
+        self.windows = {
+            name: RollingWindow(seconds, buckets)
+            for name, (seconds, buckets) in ROLLING_WINDOWS.items()
+        }
+        self.updated_at = 0.0
+
+    def add(self, now: float, value: float) -> None:
+        """Add a sample to every window."""
+        for window in self.windows.values():
+            window.add(now, value)
+        self.updated_at = now
+
+    def attributes(self, prefix: str) -> dict[str, float | None]:
+        """Return the means as state attributes, e.g. hashrate_1h."""
+        return {
+            f"{prefix}_{name}": None if window.mean is None else round(window.mean, 2)
+            for name, window in self.windows.items()
+        }
+
+    def to_bytes(self) -> bytes:
+        """Return all windows packed as native doubles."""
+        values = array("d", (self.updated_at,))
+        for window in self.windows.values():
+            values.extend(window.to_array())
+        return values.tobytes()
+
+    @classmethod
+    def from_bytes(cls, data: bytes, swap: bool = False) -> RollingMeans:
+        """Rebuild from to_bytes output, byte swapping if saved elsewhere."""
+        values = array("d")
+        values.frombytes(data)
+        if swap:
+            values.byteswap()
+        series = cls()
+        series.updated_at = values[0]
+        offset = 1
+        for window in series.windows.values():
+            offset = window.load(values, offset)
+        return series
+
+
+class RollingHashrates:
+    """Rolling means per address and per worker of one coordinator.
+
+    Series are keyed by address, or by (address, worker name) for workers.
+    A series without samples for longer than the longest window is dropped.
+    """
+
+    def __init__(self) -> None:
+        """Initialize without series."""
+        self.series: dict[str | tuple[str, str], RollingMeans] = {}
+        self._max_age = max(seconds for seconds, _ in ROLLING_WINDOWS.values())
+
+    def add(self, key: str | tuple[str, str], now: float, value: float) -> None:
+        """Add a sample to a series, creating it if needed."""
+        series = self.series.get(key)
+        if series is None:
+            series = self.series[key] = RollingMeans()
+        series.add(now, value)
+
+    def get(self, key: str | tuple[str, str]) -> RollingMeans | None:
+        """Return a series, or None if it has no samples."""
+        return self.series.get(key)
+
+    def prune(self, now: float) -> None:
+        """Drop series that have not had a sample within the longest window."""
+        cutoff = now - self._max_age
+        for key in [key for key, series in self.series.items() if series.updated_at < cutoff]:
+            del self.series[key]
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a JSON serializable form with base64 packed buffers."""
+        return {
+            "byteorder": sys.byteorder,
+            "series": [
+                [
+                    key if isinstance(key, str) else key[0],
+                    None if isinstance(key, str) else key[1],
+                    base64.b64encode(series.to_bytes()).decode("ascii"),
+                ]
+                for key, series in self.series.items()
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> RollingHashrates:
+        """Rebuild from as_dict output, skipping entries that do not fit."""
+        rolling = cls()
+        swap = data.get("byteorder", sys.byteorder) != sys.byteorder
+        expected = len(RollingMeans().to_bytes())
+        for address, worker, packed in data.get("series", []):
+            raw = base64.b64decode(packed)
+            # Window layout changed since the save
+            if len(raw) != expected:
+                continue
+            key = address if worker is None else (address, worker)
+            rolling.series[key] = RollingMeans.from_bytes(raw, swap)
+        return rolling
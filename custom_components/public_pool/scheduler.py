@@ -0,0 +1,76 @@
+"""Adaptive polling interval for Public Pool coordinators."""
+from __future__ import annotations
+
+from datetime import timedelta
+import random
+
+from .const import (
+    ADAPTIVE_GROWTH_FACTOR,
+    ADAPTIVE_IDLE_FACTOR,
+    BACKOFF_JITTER,
+    MAX_BACKOFF_INTERVAL,
+)
+
+
+class AdaptiveInterval:
+    """Pick the next polling interval for a coordinator.
+
+    Consecutive failures back off exponentially with jitter, so many
+    instances hitting a struggling pool do not retry in lockstep. While
+    successive snapshots are unchanged the interval grows gradually up to
+    ADAPTIVE_IDLE_FACTOR times the base interval, and it drops back to the
+    base interval as soon as values move again.
+    """
+
+    def __init__(self, base_interval: float) -> None:
+        """Initialize with the configured interval in seconds."""
+        self.base_interval = float(base_interval)
+        self.current = self.base_interval
+        self.failures = 0
+
+    @property
+    def timedelta(self) -> timedelta:
+        """Return the current interval as a timedelta."""
+        return timedelta(seconds=self.current)
+
+    def set_base_interval(self, base_interval: float) -> timedelta:
+        """Change the base interval, keeping any backoff in progress."""
+        self.base_interval = float(base_interval)
+        if not self.failures:
+            self.current = min(
+                max(self.current, self.base_interval),
+                self.base_interval * ADAPTIVE_IDLE_FACTOR,
+            )
+
+        return self.timedelta
+
+    def record_success(self, changed: bool) -> timedelta:
+        """Update the interval after a successful refresh.
+
+        The first success after failures starts over from the base interval
+        instead of growing from the backoff interval.
+        """
+        recovered = self.failures > 0
+        self.failures = 0
+
+        if changed or recovered:
+            self.current = self.base_interval
+        else:
+            self.current = min(
+                max(self.current, self.base_interval) * ADAPTIVE_GROWTH_FACTOR,
+                self.base_interval * ADAPTIVE_IDLE_FACTOR,
+            )
+
+        return self.timedelta
+
+    def record_failure(self) -> timedelta:
+        """Update the interval after a failed refresh."""
+        self.failures += 1
+
+        backoff = min(
+            self.base_interval * 2 ** self.failures,
+            max(MAX_BACKOFF_INTERVAL, self.base_interval),
+        )
+        self.current = backoff * random.uniform(1 - BACKOFF_JITTER, 1 + BACKOFF_JITTER)
+
+        return self.timedelta
@@ -1,7 +1,8 @@
 """Support for Public Pool sensors."""
 from __future__ import annotations
 
-from datetime import datetime
+from collections.abc import Hashable
+from datetime import timedelta
 import logging
 from typing import Any
 
@@ -12,17 +13,34 @@ from homeassistant.components.sensor import (
     SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import (
+    PERCENTAGE,
+    EntityCategory,
+    UnitOfInformation,
+    UnitOfTime,
+)
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.util import dt as dt_util
 
 from .const import (
+    BLOCK_CHANCE_WINDOWS,
+    CONF_SUMMARY_MODE,
+    CONF_WORKER_ALLOWLIST,
+    CONF_WORKER_ENTITIES,
+    CONF_WORKER_GRACE_PERIOD,
+    DEFAULT_SUMMARY_MODE,
+    DEFAULT_WORKER_ENTITIES,
+    DEFAULT_WORKER_GRACE_PERIOD,
     DOMAIN,
     EXA_HASH_PER_SECOND,
     GIGA_HASH_PER_SECOND,
     TERA_HASH_PER_SECOND,
 )
 from .coordinator import PublicPoolCoordinator
+from .stats import Histogram
+from .worker_registry import PublicPoolWorkerRegistry
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -48,6 +66,56 @@ POOL_SENSOR_TYPES: dict[str, SensorEntityDescription] = {
         state_class=SensorStateClass.MEASUREMENT,
         icon="mdi:cube-outline",
     ),
+    "pool_last_block_found": SensorEntityDescription(
+        key="pool_last_block_found",
+        name="Last Block Found",
+        icon="mdi:cube-send",
+    ),
+    "pool_expected_time_to_block": SensorEntityDescription(
+        key="pool_expected_time_to_block",
+        name="Pool Expected Time to Block",
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        suggested_unit_of_measurement=UnitOfTime.DAYS,
+        device_class=SensorDeviceClass.DURATION,
+        icon="mdi:timer-sand",
+        suggested_display_precision=1,
+    ),
+    "pool_block_chance_24h": SensorEntityDescription(
+        key="pool_block_chance_24h",
+        name="Pool Block Chance (24h)",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:dice-multiple",
+        suggested_display_precision=2,
+    ),
+    "pool_network_share": SensorEntityDescription(
+        key="pool_network_share",
+        name="Pool Network Share",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:chart-pie",
+        suggested_display_precision=6,
+    ),
+    "pool_top_difficulty": SensorEntityDescription(
+        key="pool_top_difficulty",
+        name="Top Share Difficulty",
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:podium-gold",
+        suggested_display_precision=0,
+    ),
+    "pool_started_at": SensorEntityDescription(
+        key="pool_started_at",
+        name="Pool Online Since",
+        device_class=SensorDeviceClass.TIMESTAMP,
+        icon="mdi:server-network",
+    ),
+}
+
+# Pool data keys shown as attributes, so their changes must write state too
+ATTRIBUTE_CHANGE_KEYS: dict[str, tuple[str, ...]] = {
+    "pool_hashrate": ("pool_blocks_found_count",),
+    "pool_top_difficulty": ("pool_top_difficulties",),
+    "pool_started_at": ("pool_version",),
 }
 
 # Network-level sensor descriptions
@@ -98,6 +166,164 @@ ADDRESS_SENSOR_TYPES: dict[str, SensorEntityDescription] = {
         icon="mdi:speedometer",
         suggested_display_precision=2,
     ),
+    "address_expected_time_to_block": SensorEntityDescription(
+        key="address_expected_time_to_block",
+        name="Expected Time to Block",
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        suggested_unit_of_measurement=UnitOfTime.DAYS,
+        device_class=SensorDeviceClass.DURATION,
+        icon="mdi:timer-sand",
+        suggested_display_precision=0,
+    ),
+    "address_block_chance_24h": SensorEntityDescription(
+        key="address_block_chance_24h",
+        name="Block Chance (24h)",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:dice-multiple",
+        suggested_display_precision=8,
+    ),
+    "address_network_share": SensorEntityDescription(
+        key="address_network_share",
+        name="Network Share",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:chart-pie",
+        suggested_display_precision=10,
+    ),
+    "address_luck": SensorEntityDescription(
+        key="address_luck",
+        name="Luck",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:clover",
+        suggested_display_precision=4,
+    ),
+}
+
+# Farm summary sensor descriptions (per address, summary mode only)
+SUMMARY_SENSOR_TYPES: dict[str, SensorEntityDescription] = {
+    "online_workers": SensorEntityDescription(
+        key="online_workers",
+        name="Online Workers",
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:worker",
+    ),
+    "stale_workers": SensorEntityDescription(
+        key="stale_workers",
+        name="Stale Workers",
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:account-clock",
+    ),
+    "hashrate_median": SensorEntityDescription(
+        key="hashrate_median",
+        name="Worker Hashrate Median",
+        native_unit_of_measurement=GIGA_HASH_PER_SECOND,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:chart-bell-curve",
+        suggested_display_precision=2,
+    ),
+    "fastest_workers": SensorEntityDescription(
+        key="fastest_workers",
+        name="Fastest Worker Hashrate",
+        native_unit_of_measurement=GIGA_HASH_PER_SECOND,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:speedometer",
+        suggested_display_precision=2,
+    ),
+    "slowest_workers": SensorEntityDescription(
+        key="slowest_workers",
+        name="Slowest Worker Hashrate",
+        native_unit_of_measurement=GIGA_HASH_PER_SECOND,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:speedometer-slow",
+        suggested_display_precision=2,
+    ),
+}
+
+# Diagnostic sensor showing the adaptive polling interval
+SCAN_INTERVAL_SENSOR = SensorEntityDescription(
+    key="effective_scan_interval",
+    name="Effective Scan Interval",
+    native_unit_of_measurement=UnitOfTime.SECONDS,
+    device_class=SensorDeviceClass.DURATION,
+    entity_category=EntityCategory.DIAGNOSTIC,
+    icon="mdi:timer-sync-outline",
+    suggested_display_precision=0,
+)
+
+# Request instrumentation, disabled by default (diagnostics has it all)
+INSTRUMENTATION_SENSOR_TYPES: dict[str, SensorEntityDescription] = {
+    "client_latency": SensorEntityDescription(
+        key="client_latency",
+        name="API Latency",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        icon="mdi:timer-outline",
+        suggested_display_precision=0,
+    ),
+    "client_response_size": SensorEntityDescription(
+        key="client_response_size",
+        name="API Response Size",
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        device_class=SensorDeviceClass.DATA_SIZE,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        icon="mdi:file-download-outline",
+    ),
+    "client_parse_time": SensorEntityDescription(
+        key="client_parse_time",
+        name="API Parse Time",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        icon="mdi:code-json",
+        suggested_display_precision=1,
+    ),
+    "client_failures": SensorEntityDescription(
+        key="client_failures",
+        name="API Request Failures",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        icon="mdi:alert-circle-outline",
+    ),
+    "request_queue_wait": SensorEntityDescription(
+        key="request_queue_wait",
+        name="API Queue Wait",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        icon="mdi:timer-sand",
+        suggested_display_precision=0,
+    ),
+    "request_queue_depth": SensorEntityDescription(
+        key="request_queue_depth",
+        name="API Queue Depth",
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        icon="mdi:tray-full",
+    ),
+    "entity_update_time": SensorEntityDescription(
+        key="entity_update_time",
+        name="Entity Update Time",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        icon="mdi:pencil-outline",
+        suggested_display_precision=1,
+    ),
 }
 
 # Worker sensor descriptions (template for each worker)
@@ -156,10 +382,43 @@ async def async_setup_entry(
             )
         )
     
-    # Add address-level sensors
-    for sensor_type, description in ADDRESS_SENSOR_TYPES.items():
+    # Add address-level sensors for every tracked address
+    summary_mode = entry.data.get(CONF_SUMMARY_MODE, DEFAULT_SUMMARY_MODE)
+    for bitcoin_address in coordinator.bitcoin_addresses:
+        for sensor_type, description in ADDRESS_SENSOR_TYPES.items():
+            entities.append(
+                PublicPoolSensor(
+                    coordinator=coordinator,
+                    description=description,
+                    entry_id=entry.entry_id,
+                    bitcoin_address=bitcoin_address,
+                )
+            )
+        
+        if not summary_mode:
+            continue
+        
+        for sensor_type, description in SUMMARY_SENSOR_TYPES.items():
+            entities.append(
+                PublicPoolSummarySensor(
+                    coordinator=coordinator,
+                    description=description,
+                    entry_id=entry.entry_id,
+                    bitcoin_address=bitcoin_address,
+                )
+            )
+    
+    entities.append(
+        PublicPoolScanIntervalSensor(
+            coordinator=coordinator,
+            description=SCAN_INTERVAL_SENSOR,
+            entry_id=entry.entry_id,
+        )
+    )
+    
+    for sensor_type, description in INSTRUMENTATION_SENSOR_TYPES.items():
         entities.append(
-            PublicPoolSensor(
+            PublicPoolInstrumentationSensor(
                 coordinator=coordinator,
                 description=description,
                 entry_id=entry.entry_id,
@@ -168,36 +427,149 @@ async def async_setup_entry(
     
     async_add_entities(entities)
     
-    # Add worker sensors dynamically after first data fetch
+    # Grace period in hours; 0 keeps departed workers forever
+    grace_hours = entry.data.get(CONF_WORKER_GRACE_PERIOD, DEFAULT_WORKER_GRACE_PERIOD)
+    worker_registry = PublicPoolWorkerRegistry(
+        hass,
+        entry.entry_id,
+        timedelta(hours=grace_hours) if grace_hours else None,
+        lambda address, worker_name: _worker_device_identifier(
+            coordinator, entry.entry_id, address, worker_name
+        ),
+    )
+    worker_registry.async_load_orphans()
+    
+    # In summary mode only allow-listed workers get their own entities
+    allowlist = (
+        set(entry.data.get(CONF_WORKER_ALLOWLIST, [])) if summary_mode else None
+    )
+    # Without worker entities every worker is departed, so existing worker
+    # devices are removed once the grace period ends
+    per_worker = entry.data.get(CONF_WORKER_ENTITIES, DEFAULT_WORKER_ENTITIES)
+    
+    # Add worker sensors dynamically as workers are discovered
     @callback
     def _async_add_worker_sensors():
-        """Add worker sensors when workers are discovered."""
+        """Add sensors for workers that do not have entities yet."""
         if not coordinator.data:
             return
         
-        workers = coordinator.data.get("workers", {})
-        worker_entities = []
+        new_workers = worker_registry.async_reconcile(
+            (bitcoin_address, worker_name)
+            for bitcoin_address, address_data in coordinator.data.get("addresses", {}).items()
+            for worker_name in address_data.get("workers", {})
+            if per_worker and (allowlist is None or worker_name in allowlist)
+        )
         
-        for worker_name, worker_data in workers.items():
-            for sensor_key, description in WORKER_SENSOR_TYPES.items():
-                worker_entities.append(
-                    PublicPoolWorkerSensor(
-                        coordinator=coordinator,
-                        description=description,
-                        entry_id=entry.entry_id,
-                        worker_name=worker_name,
-                        sensor_key=sensor_key,
-                    )
-                )
+        worker_entities = [
+            PublicPoolWorkerSensor(
+                coordinator=coordinator,
+                description=description,
+                entry_id=entry.entry_id,
+                bitcoin_address=bitcoin_address,
+                worker_name=worker_name,
+                sensor_key=sensor_key,
+            )
+            for bitcoin_address, worker_name in new_workers
+            for sensor_key, description in WORKER_SENSOR_TYPES.items()
+        ]
         
         if worker_entities:
             async_add_entities(worker_entities)
     
-    # Add worker sensors after first successful update
-    coordinator.async_add_listener(_async_add_worker_sensors)
+    _async_add_worker_sensors()
+    entry.async_on_unload(coordinator.async_add_listener(_async_add_worker_sensors))
+
+
+def _address_id_prefix(
+    coordinator: PublicPoolCoordinator, entry_id: str, bitcoin_address: str
+) -> str:
+    """Return the unique id and device prefix for an address of an entry.
+
+    The first address keeps the bare entry id so single-address entries keep
+    the ids they had before multi-address support.
+    """
+    if bitcoin_address == coordinator.bitcoin_address:
+        return entry_id
+    return f"{entry_id}_{bitcoin_address}"
+
 
+def _worker_device_identifier(
+    coordinator: PublicPoolCoordinator,
+    entry_id: str,
+    bitcoin_address: str,
+    worker_name: str,
+) -> str:
+    """Return the device identifier of a worker."""
+    prefix = _address_id_prefix(coordinator, entry_id, bitcoin_address)
+    safe_worker_name = worker_name.replace(" ", "_").lower()
+    return f"{prefix}_worker_{safe_worker_name}"
 
-class PublicPoolSensor(CoordinatorEntity, SensorEntity):
+
+def _address_data(
+    coordinator: PublicPoolCoordinator, bitcoin_address: str
+) -> dict[str, Any]:
+    """Return the parsed data for one address, or an empty dict."""
+    if not coordinator.data:
+        return {}
+    return coordinator.data.get("addresses", {}).get(bitcoin_address, {})
+
+
+class PublicPoolEntity(CoordinatorEntity):
+    """Coordinator entity that only writes state when its values changed.
+
+    Subclasses list the coordinator change keys they display in
+    _change_keys. A refresh that changed none of them, and left the
+    availability alone, does not write state.
+
+    _section names the coordinator data section ("pool", "network" or an
+    address) the values come from. While it is served from the last good
+    data the entity gets a stale attribute; once it expired the entity is
+    unavailable.
+    """
+
+    _change_keys: frozenset[Hashable] = frozenset()
+    _section: str | None = None
+    _written_available: bool | None = None
+
+    @property
+    def available(self) -> bool:
+        """Return if the coordinator is up and this entity's data not expired."""
+        if not super().available:
+            return False
+        if self._section is None:
+            return True
+        return self._section not in (self.coordinator.data or {}).get("expired", ())
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the value attributes, marked if the data is stale."""
+        attributes = self._value_attributes()
+        if self._section is not None and self._section in (
+            (self.coordinator.data or {}).get("stale", ())
+        ):
+            return {**attributes, "stale": True}
+        return attributes
+
+    def _value_attributes(self) -> dict[str, Any]:
+        """Return the attributes describing the value."""
+        return {}
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state if a value shown by this entity changed."""
+        changes = self.coordinator.changed_keys
+        available = self.available
+        if (
+            changes is None
+            or available != self._written_available
+            or not changes.isdisjoint(self._change_keys)
+        ):
+            self._written_available = available
+            self.async_write_ha_state()
+
+
+class PublicPoolSensor(PublicPoolEntity, SensorEntity):
     """Representation of a Public Pool sensor."""
 
     def __init__(
@@ -205,48 +577,232 @@ class PublicPoolSensor(CoordinatorEntity, SensorEntity):
         coordinator: PublicPoolCoordinator,
         description: SensorEntityDescription,
         entry_id: str,
+        bitcoin_address: str | None = None,
     ) -> None:
-        """Initialize the sensor."""
+        """Initialize the sensor.
+
+        Pool and network sensors pass no address; address sensors are bound
+        to one of the coordinator's addresses.
+        """
         super().__init__(coordinator)
         self.entity_description = description
-        self._attr_unique_id = f"{entry_id}_{description.key}"
+        self.bitcoin_address = bitcoin_address
         self._attr_has_entity_name = True
         
+        prefix = _address_id_prefix(
+            coordinator, entry_id, bitcoin_address or coordinator.bitcoin_address
+        )
+        self._attr_unique_id = f"{prefix}_{description.key}"
+        
+        self._section = self._entity_section()
+        self._change_keys = self._entity_change_keys()
+        
         # Device info for grouping sensors
-        short_address = coordinator.bitcoin_address[:8]
+        short_address = (bitcoin_address or coordinator.bitcoin_address)[:8]
         self._attr_device_info = {
-            "identifiers": {(DOMAIN, entry_id)},
+            "identifiers": {(DOMAIN, prefix)},
             "name": f"Public Pool ({short_address})",
             "manufacturer": "Public Pool",
             "model": "Bitcoin Mining Pool",
             "sw_version": "1.0",
         }
+        if prefix != entry_id:
+            self._attr_device_info["via_device"] = (DOMAIN, entry_id)
+
+    def _entity_section(self) -> str | None:
+        """Return the coordinator data section this sensor reads."""
+        if self.bitcoin_address is not None:
+            return self.bitcoin_address
+        if self.entity_description.key.startswith("network_"):
+            return "network"
+        return "pool"
+
+    def _entity_change_keys(self) -> frozenset[Hashable]:
+        """Return the coordinator change keys of the values this sensor shows."""
+        key = self.entity_description.key
+        stale = ("stale", self._section)
+        if self.bitcoin_address is not None:
+            return frozenset({(self.bitcoin_address, key), stale})
+        return frozenset({key, stale, *ATTRIBUTE_CHANGE_KEYS.get(key, ())})
 
     @property
     def native_value(self) -> Any:
         """Return the state of the sensor."""
         if not self.coordinator.data:
             return None
-        return self.coordinator.data.get(self.entity_description.key)
+        if self.bitcoin_address is not None:
+            return _address_data(self.coordinator, self.bitcoin_address).get(
+                self.entity_description.key
+            )
+        value = self.coordinator.data.get(self.entity_description.key)
+        # Timestamps are kept as epoch seconds so snapshots stay JSON
+        if value and self.entity_description.device_class == SensorDeviceClass.TIMESTAMP:
+            return dt_util.utc_from_timestamp(value)
+        return value
 
-    @property
-    def extra_state_attributes(self) -> dict[str, Any]:
+    def _value_attributes(self) -> dict[str, Any]:
         """Return additional attributes."""
         if not self.coordinator.data:
             return {}
         
-        # Add pool blocks found as attribute for pool sensors
+        # Longer block chance windows ride along with the 24h sensor
+        if self.entity_description.key.endswith("_block_chance_24h"):
+            prefix = self.entity_description.key.removesuffix("_24h")
+            source = (
+                _address_data(self.coordinator, self.bitcoin_address)
+                if self.bitcoin_address is not None
+                else self.coordinator.data
+            )
+            return {
+                f"block_chance_{name}": source.get(f"{prefix}_{name}")
+                for name in BLOCK_CHANCE_WINDOWS
+                if name != "24h"
+            }
+        
+        if self.entity_description.key == "address_total_hashrate":
+            rolling = self.coordinator.rolling.get(self.bitcoin_address)
+            return rolling.attributes("hashrate") if rolling else {}
+        
+        # Add the newest pool blocks found as attribute for pool sensors
         if self.entity_description.key == "pool_hashrate":
-            blocks = self.coordinator.data.get("pool_blocks_found", [])
             return {
-                "blocks_found_count": len(blocks),
-                "blocks_found": blocks,
+                "blocks_found_count": self.coordinator.data.get("pool_blocks_found_count", 0),
+                "blocks_found": list(self.coordinator.data.get("pool_recent_blocks", [])),
+            }
+        
+        if self.entity_description.key == "pool_top_difficulty":
+            return {"top_difficulties": list(self.coordinator.data.get("pool_top_difficulties", []))}
+        
+        if self.entity_description.key == "pool_started_at":
+            return {"version": self.coordinator.data.get("pool_version")}
+        
+        if self.entity_description.key == "pool_last_block_found":
+            recent = self.coordinator.data.get("pool_recent_blocks")
+            if not recent:
+                return {}
+            return {
+                "miner_address": recent[0]["miner_address"],
+                "worker": recent[0]["worker"],
             }
         
         return {}
 
 
-class PublicPoolWorkerSensor(CoordinatorEntity, SensorEntity):
+class PublicPoolSummarySensor(PublicPoolSensor):
+    """Farm-level aggregate over the workers of one address."""
+
+    def _summary(self) -> dict[str, Any]:
+        """Return this sensor's entry of the address summary."""
+        summary = _address_data(self.coordinator, self.bitcoin_address).get("summary", {})
+        return summary.get(self.entity_description.key, {})
+
+    @property
+    def native_value(self) -> Any:
+        """Return the aggregate value."""
+        return self._summary().get("value")
+
+    def _value_attributes(self) -> dict[str, Any]:
+        """Return percentiles, histogram or worker lists."""
+        return self._summary().get("attributes", {})
+
+
+class PublicPoolScanIntervalSensor(PublicPoolSensor):
+    """Diagnostic sensor for the coordinator's current polling interval."""
+
+    def _entity_section(self) -> str | None:
+        """Return no section; the interval is the coordinator's own."""
+        return None
+
+    def _entity_change_keys(self) -> frozenset[Hashable]:
+        """Return the key the coordinator sets when the interval changed."""
+        return frozenset({"effective_scan_interval"})
+
+    @property
+    def native_value(self) -> float:
+        """Return the effective scan interval in seconds."""
+        return round(self.coordinator.update_interval.total_seconds(), 1)
+
+    def _value_attributes(self) -> dict[str, Any]:
+        """Return the configured interval and failure streak."""
+        scheduler = self.coordinator.scheduler
+        return {
+            "base_interval": scheduler.base_interval,
+            "consecutive_failures": scheduler.failures,
+        }
+
+    @property
+    def available(self) -> bool:
+        """Stay available while backing off so the interval stays visible."""
+        return True
+
+
+class PublicPoolInstrumentationSensor(PublicPoolSensor):
+    """Diagnostic sensor for the request statistics of the client endpoint.
+
+    Queue sensors report the rate limiter of the pool host, which every
+    entry on that host shares.
+    """
+
+    def _entity_section(self) -> str | None:
+        """Return no section; statistics are the client's own."""
+        return None
+
+    def _entity_change_keys(self) -> frozenset[Hashable]:
+        """Return the key the coordinator sets on every refresh."""
+        return frozenset({"diagnostics"})
+
+    def _histogram(self) -> Histogram:
+        """Return the histogram this sensor reports."""
+        if self.entity_description.key == "entity_update_time":
+            return self.coordinator.listener_times
+        if self.entity_description.key == "request_queue_wait":
+            return self.coordinator.api.rate_limiter.wait_times
+        stats = self.coordinator.api.stats.endpoint("client")
+        if self.entity_description.key == "client_parse_time":
+            return stats.parse
+        return stats.latency
+
+    @property
+    def native_value(self) -> float | int | None:
+        """Return the latest value."""
+        stats = self.coordinator.api.stats.endpoint("client")
+        if self.entity_description.key == "client_response_size":
+            return stats.last_bytes
+        if self.entity_description.key == "client_failures":
+            return sum(stats.failures.values())
+        if self.entity_description.key == "request_queue_depth":
+            return self.coordinator.api.rate_limiter.waiting
+        return self._histogram().last
+
+    def _value_attributes(self) -> dict[str, Any]:
+        """Return totals, failure reasons or percentiles."""
+        stats = self.coordinator.api.stats.endpoint("client")
+        if self.entity_description.key == "client_response_size":
+            return {"total_bytes": stats.bytes, "responses": stats.responses}
+        if self.entity_description.key == "client_failures":
+            return dict(stats.failures)
+        if self.entity_description.key == "request_queue_depth":
+            limiter = self.coordinator.api.rate_limiter
+            return {
+                "host": limiter.host,
+                "max_depth": limiter.max_waiting,
+                "throttled": limiter.throttled,
+                "rejected": limiter.rejected,
+            }
+        histogram = self._histogram()
+        return {
+            "p50": histogram.quantile(50),
+            "p95": histogram.quantile(95),
+            "count": histogram.count,
+        }
+
+    @property
+    def available(self) -> bool:
+        """Stay available so failures stay visible."""
+        return True
+
+
+class PublicPoolWorkerSensor(PublicPoolEntity, SensorEntity):
     """Representation of a Public Pool worker sensor."""
 
     def __init__(
@@ -254,28 +810,36 @@ class PublicPoolWorkerSensor(CoordinatorEntity, SensorEntity):
         coordinator: PublicPoolCoordinator,
         description: SensorEntityDescription,
         entry_id: str,
+        bitcoin_address: str,
         worker_name: str,
         sensor_key: str,
     ) -> None:
         """Initialize the worker sensor."""
         super().__init__(coordinator)
         self.entity_description = description
+        self.bitcoin_address = bitcoin_address
         self.worker_name = worker_name
         self.sensor_key = sensor_key
+        self._section = bitcoin_address
+        self._change_keys = frozenset(
+            {(bitcoin_address, worker_name, sensor_key), ("stale", bitcoin_address)}
+        )
         
         # Create unique ID and name
-        safe_worker_name = worker_name.replace(" ", "_").lower()
-        self._attr_unique_id = f"{entry_id}_worker_{safe_worker_name}_{sensor_key}"
+        device_identifier = _worker_device_identifier(
+            coordinator, entry_id, bitcoin_address, worker_name
+        )
+        self._attr_unique_id = f"{device_identifier}_{sensor_key}"
         self._attr_name = f"{worker_name} {description.name}"
         
         # Device info for grouping worker sensors
-        short_address = coordinator.bitcoin_address[:8]
+        prefix = _address_id_prefix(coordinator, entry_id, bitcoin_address)
         self._attr_device_info = {
-            "identifiers": {(DOMAIN, f"{entry_id}_worker_{safe_worker_name}")},
+            "identifiers": {(DOMAIN, device_identifier)},
             "name": f"{worker_name}",
             "manufacturer": "Public Pool",
             "model": "Mining Worker",
-            "via_device": (DOMAIN, entry_id),
+            "via_device": (DOMAIN, prefix),
         }
 
     @property
@@ -284,39 +848,41 @@ class PublicPoolWorkerSensor(CoordinatorEntity, SensorEntity):
         if not self.coordinator.data:
             return None
         
-        workers = self.coordinator.data.get("workers", {})
+        workers = _address_data(self.coordinator, self.bitcoin_address).get("workers", {})
         worker_data = workers.get(self.worker_name)
         
         if not worker_data:
             return None
         
-        value = worker_data.get(self.sensor_key)
-        
-        # Convert timestamp to datetime for last_seen
-        if self.sensor_key == "last_seen" and value:
-            try:
-                return datetime.fromisoformat(value.replace("Z", "+00:00"))
-            except (ValueError, AttributeError):
+        # Use the epoch parsed once per refresh for last_seen
+        if self.sensor_key == "last_seen":
+            if not worker_data.last_seen_epoch:
                 return None
+            return dt_util.utc_from_timestamp(worker_data.last_seen_epoch)
         
-        return value
+        return getattr(worker_data, self.sensor_key)
 
-    @property
-    def extra_state_attributes(self) -> dict[str, Any]:
+    def _value_attributes(self) -> dict[str, Any]:
         """Return additional attributes."""
         if not self.coordinator.data:
             return {}
         
-        workers = self.coordinator.data.get("workers", {})
+        workers = _address_data(self.coordinator, self.bitcoin_address).get("workers", {})
         worker_data = workers.get(self.worker_name)
         
         if not worker_data:
             return {}
         
-        return {
-            "session_id": worker_data.get("session_id"),
-            "start_time": worker_data.get("start_time"),
+        attributes = {
+            "session_id": worker_data.session_id,
+            "start_time": worker_data.start_time,
         }
+        if self.sensor_key == "hashrate":
+            rolling = self.coordinator.rolling.get((self.bitcoin_address, self.worker_name))
+            if rolling:
+                attributes.update(rolling.attributes("hashrate"))
+        
+        return attributes
 
     @property
     def available(self) -> bool:
@@ -328,5 +894,5 @@ class PublicPoolWorkerSensor(CoordinatorEntity, SensorEntity):
         if not self.coordinator.data:
             return False
         
-        workers = self.coordinator.data.get("workers", {})
+        workers = _address_data(self.coordinator, self.bitcoin_address).get("workers", {})
         return self.worker_name in workers
@@ -0,0 +1,199 @@
+"""Services for the Public Pool integration."""
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import ServiceValidationError
+import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.event import async_call_later
+from homeassistant.util import dt as dt_util
+
+from .api import RequestCounts, count_requests
+from .capture import ResponseCapture
+from .const import (
+    ATTR_ADDRESS,
+    ATTR_CONFIG_ENTRY_ID,
+    ATTR_DURATION,
+    ATTR_MIN_AGE,
+    DATA_CAPTURE,
+    DEFAULT_CAPTURE_DURATION,
+    DEFAULT_REFRESH_MIN_AGE,
+    DOMAIN,
+    SERVICE_CAPTURE,
+    SERVICE_REFRESH,
+)
+from .coordinator import PublicPoolCoordinator, PublicPoolSharedCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+REFRESH_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(ATTR_ADDRESS): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(ATTR_MIN_AGE, default=DEFAULT_REFRESH_MIN_AGE): vol.All(
+            vol.Coerce(float), vol.Range(min=0)
+        ),
+    }
+)
+
+CAPTURE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(ATTR_DURATION, default=DEFAULT_CAPTURE_DURATION): vol.All(
+            vol.Coerce(float), vol.Range(min=0, max=24 * 60)
+        ),
+    }
+)
+
+
+def _target_coordinators(
+    hass: HomeAssistant, entry_ids: list[str] | None, addresses: set[str] | None
+) -> list[PublicPoolCoordinator]:
+    """Return the coordinators of the given entries and addresses, or all."""
+    coordinators = {
+        entry_id: coordinator
+        for entry_id, coordinator in hass.data.get(DOMAIN, {}).items()
+        if isinstance(coordinator, PublicPoolCoordinator)
+    }
+    if entry_ids is not None:
+        unknown = [entry_id for entry_id in entry_ids if entry_id not in coordinators]
+        if unknown:
+            raise ServiceValidationError(
+                f"No loaded Public Pool entry {', '.join(unknown)}"
+            )
+        coordinators = {entry_id: coordinators[entry_id] for entry_id in entry_ids}
+    if addresses is not None:
+        coordinators = {
+            entry_id: coordinator
+            for entry_id, coordinator in coordinators.items()
+            if addresses.intersection(coordinator.bitcoin_addresses)
+        }
+        if not coordinators:
+            raise ServiceValidationError(
+                "None of the addresses is tracked by a loaded Public Pool entry"
+            )
+    return list(coordinators.values())
+
+
+async def _async_stop_capture(hass: HomeAssistant) -> ResponseCapture | None:
+    """Stop the running capture, if any, and return it."""
+    active = hass.data.get(DOMAIN, {}).pop(DATA_CAPTURE, None)
+    if active is None:
+        return None
+    capture, unsubscribers = active
+    for unsubscribe in unsubscribers:
+        unsubscribe()
+    await capture.async_close()
+    return capture
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the Public Pool services."""
+
+    async def async_refresh(call: ServiceCall) -> ServiceResponse:
+        """Refresh entries now, without refetching anything recent.
+
+        Responses younger than min_age are reused, and concurrent calls share
+        one refresh per entry and one fetch per endpoint, so bursts of calls
+        cost one round of requests. Reports how many requests this call sent
+        and saved.
+        """
+        addresses = call.data.get(ATTR_ADDRESS)
+        addresses = set(addresses) if addresses is not None else None
+        coordinators = _target_coordinators(
+            hass, call.data.get(ATTR_CONFIG_ENTRY_ID), addresses
+        )
+        min_age = call.data[ATTR_MIN_AGE]
+        shared = list(
+            {id(coordinator.shared): coordinator.shared for coordinator in coordinators}.values()
+        )
+        counts = RequestCounts()
+        with count_requests(counts):
+            # Pool data first, so entry refreshes merge the new values
+            await asyncio.gather(
+                *(coordinator.async_refresh_requested(min_age) for coordinator in shared)
+            )
+            await asyncio.gather(
+                *(
+                    coordinator.async_refresh_requested(addresses, min_age)
+                    for coordinator in coordinators
+                )
+            )
+
+        result = {
+            "entries": len(coordinators),
+            "requests": counts.requests,
+            "reused": counts.reused,
+            "coalesced": counts.coalesced,
+        }
+        result["saved"] = result["reused"] + result["coalesced"]
+        _LOGGER.debug(f"Refresh service: {result}")
+        return result
+
+    async def async_capture(call: ServiceCall) -> ServiceResponse:
+        """Capture raw API responses of entries to a file for a while.
+
+        Replaces a running capture; a duration of 0 only stops it. Covers
+        the entries loaded when called, and the pool pollers they share.
+        """
+        stopped = await _async_stop_capture(hass)
+        duration = call.data[ATTR_DURATION]
+        if not duration:
+            if stopped is None:
+                return {"file": None, "records": 0}
+            return {"file": stopped.path, "records": stopped.records}
+
+        coordinators = _target_coordinators(hass, call.data.get(ATTR_CONFIG_ENTRY_ID), None)
+        capture = ResponseCapture(
+            hass,
+            hass.config.path(
+                DOMAIN, f"capture_{dt_util.now().strftime('%Y%m%d_%H%M%S')}.jsonl.gz"
+            ),
+        )
+        apis = {id(coordinator.api): coordinator.api for coordinator in coordinators}
+        apis.update(
+            (id(coordinator.shared.api), coordinator.shared.api) for coordinator in coordinators
+        )
+        for api in apis.values():
+            capture.attach(api)
+
+        async def _async_stop(_: Any) -> None:
+            await _async_stop_capture(hass)
+
+        hass.data.setdefault(DOMAIN, {})[DATA_CAPTURE] = (
+            capture,
+            [
+                async_call_later(hass, duration * 60, _async_stop),
+                hass.bus.async_listen(EVENT_HOMEASSISTANT_STOP, _async_stop),
+            ],
+        )
+        _LOGGER.info(f"Capturing responses of {len(apis)} clients to {capture.path}")
+        return {"file": capture.path, "records": 0}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_REFRESH,
+        async_refresh,
+        schema=REFRESH_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_CAPTURE,
+        async_capture,
+        schema=CAPTURE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
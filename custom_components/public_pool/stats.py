@@ -0,0 +1,124 @@
+"""Request and refresh timing statistics for diagnostics."""
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from typing import Any
+
+from .const import HISTOGRAM_BOUNDS_MS
+
+
+class Histogram:
+    """Fixed-bucket histogram of durations in milliseconds.
+
+    Recording is one bisect over HISTOGRAM_BOUNDS_MS and a counter bump, so
+    it is cheap enough to run on every request.
+    """
+
+    __slots__ = ("counts", "count", "total", "maximum", "last")
+
+    def __init__(self) -> None:
+        """Initialize an empty histogram."""
+        self.counts = array("L", [0]) * (len(HISTOGRAM_BOUNDS_MS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+        self.last: float | None = None
+
+    def record(self, value: float) -> None:
+        """Record one value in milliseconds."""
+        self.counts[bisect_left(HISTOGRAM_BOUNDS_MS, value)] += 1
+        self.count += 1
+        self.total += value
+        self.last = value
+        if value > self.maximum:
+            self.maximum = value
+
+    def quantile(self, percent: float) -> float | None:
+        """Return the upper bound of the bucket holding the percentile."""
+        if not self.count:
+            return None
+        target = self.count * percent / 100
+        seen = 0
+        for index, bucket in enumerate(self.counts):
+            seen += bucket
+            if seen >= target and index < len(HISTOGRAM_BOUNDS_MS):
+                return HISTOGRAM_BOUNDS_MS[index]
+        # Beyond the last bound, the maximum is the best estimate
+        return round(self.maximum, 2)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a JSON serializable summary."""
+        labels = [f"<={bound:g}" for bound in HISTOGRAM_BOUNDS_MS]
+        labels.append(f">{HISTOGRAM_BOUNDS_MS[-1]:g}")
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total / self.count, 2) if self.count else None,
+            "p50_ms": self.quantile(50),
+            "p95_ms": self.quantile(95),
+            "max_ms": round(self.maximum, 2),
+            "last_ms": None if self.last is None else round(self.last, 2),
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+
+class EndpointStats:
+    """Latency, size, parse time and failures of one API endpoint."""
+
+    __slots__ = ("responses", "bytes", "last_bytes", "latency", "parse", "failures")
+
+    def __init__(self) -> None:
+        """Initialize empty statistics."""
+        self.responses = 0
+        self.bytes = 0
+        self.last_bytes = 0
+        self.latency = Histogram()
+        self.parse = Histogram()
+        self.failures: Counter[str] = Counter()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a JSON serializable summary."""
+        return {
+            "responses": self.responses,
+            "bytes": self.bytes,
+            "last_bytes": self.last_bytes,
+            "latency": self.latency.as_dict(),
+            "parse": self.parse.as_dict(),
+            "failures": dict(self.failures),
+        }
+
+
+class RequestStats:
+    """EndpointStats of one API client, keyed by endpoint name."""
+
+    def __init__(self) -> None:
+        """Initialize without endpoints."""
+        self.endpoints: dict[str, EndpointStats] = {}
+
+    def endpoint(self, endpoint: str) -> EndpointStats:
+        """Return the statistics of an endpoint, creating them if needed."""
+        stats = self.endpoints.get(endpoint)
+        if stats is None:
+            stats = self.endpoints[endpoint] = EndpointStats()
+        return stats
+
+    def record_response(self, endpoint: str, seconds: float, size: int) -> None:
+        """Record a response and the bytes of its body (0 for a 304)."""
+        stats = self.endpoint(endpoint)
+        stats.responses += 1
+        stats.bytes += size
+        stats.last_bytes = size
+        stats.latency.record(seconds * 1000)
+
+    def record_parse(self, endpoint: str, seconds: float) -> None:
+        """Record the time spent decoding and parsing a body."""
+        self.endpoint(endpoint).parse.record(seconds * 1000)
+
+    def record_failure(self, endpoint: str, reason: str) -> None:
+        """Record a failed attempt."""
+        self.endpoint(endpoint).failures[reason] += 1
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a JSON serializable summary of every endpoint."""
+        return {endpoint: stats.as_dict() for endpoint, stats in self.endpoints.items()}
@@ -0,0 +1,105 @@
+"""Track Public Pool workers that have entities."""
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+from datetime import datetime, timedelta
+import logging
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+# A worker is identified by the address it mines to and its name
+WorkerKey = tuple[str, str]
+
+
+class PublicPoolWorkerRegistry:
+    """Diff the reported workers against the ones that already have entities.
+
+    New workers are returned so the caller can create entities for them only.
+    Workers missing for longer than the grace period have their device, and
+    with it their entities, removed from the registries.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry_id: str,
+        grace_period: timedelta | None,
+        device_identifier: Callable[[str, str], str],
+    ) -> None:
+        """Initialize the worker registry."""
+        self.hass = hass
+        self.entry_id = entry_id
+        self.grace_period = grace_period
+        self._device_identifier = device_identifier
+        self._known: set[WorkerKey] = set()
+        self._missing: dict[WorkerKey, datetime] = {}
+        # Worker devices left over from a previous run and not reported yet
+        self._orphans: dict[str, datetime] = {}
+
+    @callback
+    def async_load_orphans(self) -> None:
+        """Mark worker devices already in the device registry as missing."""
+        now = dt_util.utcnow()
+        dev_reg = dr.async_get(self.hass)
+
+        for device in dr.async_entries_for_config_entry(dev_reg, self.entry_id):
+            for domain, identifier in device.identifiers:
+                if domain == DOMAIN and "_worker_" in identifier:
+                    self._orphans[identifier] = now
+
+    @callback
+    def async_reconcile(self, current: Iterable[WorkerKey]) -> set[WorkerKey]:
+        """Update the known worker set and return workers that are new."""
+        now = dt_util.utcnow()
+        current = set(current)
+
+        new = current - self._known
+        gone = self._known - current
+
+        for key in new:
+            self._known.add(key)
+            self._orphans.pop(self._device_identifier(*key), None)
+
+        for key in [key for key in self._missing if key in current]:
+            del self._missing[key]
+
+        for key in gone:
+            self._missing.setdefault(key, now)
+
+        if self.grace_period is not None:
+            self._async_prune(now - self.grace_period)
+
+        return new
+
+    @callback
+    def _async_prune(self, cutoff: datetime) -> None:
+        """Remove devices of workers missing since before the cutoff."""
+        expired = [key for key, since in self._missing.items() if since < cutoff]
+        for key in expired:
+            del self._missing[key]
+            self._known.discard(key)
+            self._async_remove_device(self._device_identifier(*key))
+
+        expired_orphans = [
+            identifier for identifier, since in self._orphans.items() if since < cutoff
+        ]
+        for identifier in expired_orphans:
+            del self._orphans[identifier]
+            self._async_remove_device(identifier)
+
+    @callback
+    def _async_remove_device(self, identifier: str) -> None:
+        """Remove a worker device; the entity registry drops its entities."""
+        dev_reg = dr.async_get(self.hass)
+        device = dev_reg.async_get_device(identifiers={(DOMAIN, identifier)})
+        if device is None:
+            return
+
+        _LOGGER.info(f"Removing Public Pool worker device {device.name}, not seen recently")
+        dev_reg.async_update_device(device.id, remove_config_entry_id=self.entry_id)
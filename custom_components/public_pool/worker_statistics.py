@@ -0,0 +1,120 @@
+"""Hourly worker hashrate statistics written straight to the recorder."""
+from __future__ import annotations
+
+from collections.abc import Iterable
+import hashlib
+import logging
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util import dt as dt_util, slugify
+
+from .const import DOMAIN, GIGA_HASH_PER_SECOND
+
+_LOGGER = logging.getLogger(__name__)
+
+HOUR = 3600
+
+
+def _statistic_id_part(value: str) -> str:
+    """Return value as a statistic id part that no other value maps to.
+
+    Values slugify changes get a short hash of the raw value appended, so
+    workers named rig-1, rig_1 and Rig 1 keep separate statistics.
+    """
+    slug = slugify(value) or "unknown"
+    if slug == value:
+        return slug
+    return f"{slug}_{hashlib.blake2b(value.encode(), digest_size=4).hexdigest()}"
+
+
+def worker_statistic_id(address: str, worker: str) -> str:
+    """Return the external statistic id of a worker's hashrate."""
+    return f"{DOMAIN}:{_statistic_id_part(address)}_{_statistic_id_part(worker)}_hashrate"
+
+
+class WorkerStatistics:
+    """Mean, minimum and maximum hashrate of every worker per clock hour.
+
+    Samples only update four numbers per worker, so a farm costs one
+    recorder row per worker and hour instead of one state row per sample.
+    """
+
+    def __init__(self) -> None:
+        """Initialize without samples."""
+        # Epoch start of the hour being aggregated
+        self.hour: float | None = None
+        # (address, worker) -> [sum, count, min, max]
+        self.workers: dict[tuple[str, str], list[float]] = {}
+
+    def add(self, address: str, names: Iterable[str], hashrates: Iterable[float]) -> None:
+        """Add one sample per worker of an address to the current hour."""
+        workers = self.workers
+        for name, hashrate in zip(names, hashrates):
+            aggregate = workers.get((address, name))
+            if aggregate is None:
+                workers[(address, name)] = [hashrate, 1, hashrate, hashrate]
+                continue
+            aggregate[0] += hashrate
+            aggregate[1] += 1
+            if hashrate < aggregate[2]:
+                aggregate[2] = hashrate
+            elif hashrate > aggregate[3]:
+                aggregate[3] = hashrate
+
+    def roll(self, now: float) -> tuple[float, dict[tuple[str, str], list[float]]] | None:
+        """Start the hour of now; return the previous hour's aggregates if it ended."""
+        hour = now - now % HOUR
+        if self.hour == hour:
+            return None
+        completed = None
+        if self.hour is not None and self.workers:
+            completed = (self.hour, self.workers)
+        self.hour = hour
+        self.workers = {}
+        return completed
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a JSON serializable form, for the snapshot store."""
+        return {
+            "hour": self.hour,
+            "workers": [
+                [address, name, *aggregate]
+                for (address, name), aggregate in self.workers.items()
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> WorkerStatistics:
+        """Rebuild statistics saved with as_dict."""
+        statistics = cls()
+        statistics.hour = data.get("hour")
+        for address, name, *aggregate in data.get("workers", []):
+            statistics.workers[(address, name)] = aggregate
+        return statistics
+
+
+@callback
+def async_write_worker_statistics(
+    hass: HomeAssistant, hour: float, workers: dict[tuple[str, str], list[float]]
+) -> None:
+    """Queue one hour of worker aggregates as external statistics."""
+    if "recorder" not in hass.config.components:
+        return
+    # Imported here as the recorder is optional
+    from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+    from homeassistant.components.recorder.statistics import async_add_external_statistics
+
+    start = dt_util.utc_from_timestamp(hour)
+    for (address, name), (total, count, low, high) in workers.items():
+        metadata = StatisticMetaData(
+            has_mean=True,
+            has_sum=False,
+            name=f"{name} Hashrate ({address[:8]})",
+            source=DOMAIN,
+            statistic_id=worker_statistic_id(address, name),
+            unit_of_measurement=GIGA_HASH_PER_SECOND,
+        )
+        statistics = StatisticData(start=start, mean=total / count, min=low, max=high)
+        async_add_external_statistics(hass, metadata, [statistics])
+    _LOGGER.debug(f"Queued hourly hashrate statistics of {len(workers)} workers")
@@ -0,0 +1 @@
+"""Tests for the Public Pool integration."""
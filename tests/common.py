@@ -0,0 +1,80 @@
+"""Helpers shared by the Public Pool tests."""
+from __future__ import annotations
+
+from collections import Counter
+from collections.abc import Callable
+import itertools
+import json
+from typing import Any
+from urllib.parse import urlsplit
+
+from multidict import CIMultiDict, CIMultiDictProxy
+
+_hosts = itertools.count()
+
+
+def unique_url() -> str:
+    """Return a pool URL on a host no other test uses.
+
+    Rate limiters are process wide per host, so tests that share a host
+    would share tokens and Retry-After holds.
+    """
+    return f"http://pool{next(_hosts)}.invalid"
+
+
+class FakeResponse:
+    """Response as the API client reads it."""
+
+    def __init__(
+        self, status: int = 200, body: Any = None, headers: dict[str, str] | None = None
+    ) -> None:
+        """Initialize with a JSON serializable body, or raw bytes."""
+        self.status = status
+        self.body = body if isinstance(body, bytes) else json.dumps(body).encode()
+        self.headers = CIMultiDictProxy(CIMultiDict(headers or {}))
+
+    async def read(self) -> bytes:
+        """Return the body."""
+        return self.body
+
+    async def __aenter__(self) -> FakeResponse:
+        """Enter the request context."""
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        """Leave the request context."""
+
+
+Route = FakeResponse | Exception | Callable[[dict[str, str]], FakeResponse]
+
+
+class FakeSession:
+    """Answer session.get from a table of responses per path.
+
+    A route is a response, an exception to raise, or a callable taking the
+    request headers. Set a path to a list to answer successive requests
+    in order; the last entry repeats.
+    """
+
+    def __init__(self, routes: dict[str, Route | list[Route]] | None = None) -> None:
+        """Initialize with routes keyed by path."""
+        self.routes: dict[str, Route | list[Route]] = dict(routes or {})
+        self.requests: list[tuple[str, dict[str, str]]] = []
+        self.counts: Counter[str] = Counter()
+
+    def get(
+        self, url: str, headers: dict[str, str] | None = None, **kwargs: Any
+    ) -> FakeResponse:
+        """Answer a GET like aiohttp.ClientSession.get."""
+        path = urlsplit(url).path
+        headers = dict(headers or {})
+        self.requests.append((path, headers))
+        self.counts[path] += 1
+        route = self.routes.get(path, FakeResponse(404, {}))
+        if isinstance(route, list):
+            route = route[0] if len(route) == 1 else route.pop(0)
+        if isinstance(route, Exception):
+            raise route
+        if callable(route):
+            return route(headers)
+        return route
@@ -0,0 +1,361 @@
+"""Tests for the request engine of the API client."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+import time
+from typing import Any
+from urllib.parse import urlsplit
+
+import pytest
+
+from custom_components.public_pool import api as api_module
+from custom_components.public_pool import mirrors as mirrors_module
+from custom_components.public_pool.api import CircuitBreaker, PublicPoolAPI, RetryBudget
+from custom_components.public_pool.const import (
+    API_POOL,
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_RESET_TIMEOUT,
+    RETRY_BUDGET_MAX,
+    RETRY_BUDGET_RATIO,
+)
+
+from .common import FakeResponse, FakeSession, unique_url
+
+
+POOL = {"totalHashRate": 1.0}
+
+
+@pytest.fixture(autouse=True)
+def no_retry_backoff(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Retry without sleeping between attempts."""
+    monkeypatch.setattr(api_module, "RETRY_BACKOFF", 0)
+
+
+def run(session: FakeSession, test: Callable[[PublicPoolAPI], Awaitable[Any]]) -> Any:
+    """Run test with a client of a fresh host talking to session."""
+
+    async def _run() -> Any:
+        return await test(PublicPoolAPI(unique_url(), "bc1qa", session))
+
+    return asyncio.run(_run())
+
+
+def test_breaker_opens_and_recovers() -> None:
+    """The breaker opens after repeated failures and lets one trial through."""
+    breaker = CircuitBreaker("test")
+    for _ in range(BREAKER_FAILURE_THRESHOLD - 1):
+        breaker.record_failure()
+    assert breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow_request()
+
+    breaker._opened_at -= BREAKER_RESET_TIMEOUT
+    assert breaker.allow_request()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert not breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+
+    breaker._opened_at -= BREAKER_RESET_TIMEOUT
+    assert breaker.allow_request()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.failures == 0
+
+
+def test_retry_budget() -> None:
+    """Retries are limited to what requests have earned."""
+    budget = RetryBudget()
+    for _ in range(RETRY_BUDGET_MAX):
+        assert budget.withdraw()
+    assert not budget.withdraw()
+    for _ in range(round(1 / RETRY_BUDGET_RATIO)):
+        budget.deposit()
+    assert budget.withdraw()
+
+
+def test_conditional_get() -> None:
+    """Validators of the last response are sent, and a 304 reuses its result."""
+    session = FakeSession(
+        {API_POOL: [FakeResponse(200, POOL, {"ETag": '"v1"'}), FakeResponse(304)]}
+    )
+
+    async def test(api: PublicPoolAPI) -> None:
+        assert await api.fetch_pool_info() == POOL
+        assert await api.fetch_pool_info() == POOL
+        assert api.cache_hits["pool"] == 1
+
+    run(session, test)
+    assert session.requests[1][1] == {"If-None-Match": '"v1"'}
+
+
+def test_unchanged_body_is_not_parsed_again() -> None:
+    """A 200 with the cached body returns the cached result."""
+    session = FakeSession({API_POOL: FakeResponse(200, POOL)})
+    parsed = []
+
+    async def test(api: PublicPoolAPI) -> None:
+        first = await api.fetch_pool_info(lambda data: parsed.append(data) or data)
+        assert await api.fetch_pool_info(lambda data: parsed.append(data) or data) is first
+        assert api.unchanged_bodies["pool"] == 1
+
+    run(session, test)
+    assert len(parsed) == 1
+
+
+def test_uncached_304_is_refetched_once() -> None:
+    """A 304 with nothing cached is asked again without validators."""
+    session = FakeSession({API_POOL: [FakeResponse(304), FakeResponse(200, POOL)]})
+
+    async def test(api: PublicPoolAPI) -> None:
+        assert await api.fetch_pool_info() == POOL
+        assert api.breaker_states["pool"] == CircuitBreaker.CLOSED
+
+    run(session, test)
+    assert [headers for _, headers in session.requests] == [{}, {"Cache-Control": "no-cache"}]
+
+
+def test_repeated_uncached_304_fails() -> None:
+    """A second 304 to the unconditional request fails instead of looping."""
+    session = FakeSession({API_POOL: FakeResponse(304)})
+
+    async def test(api: PublicPoolAPI) -> None:
+        assert await api.fetch_pool_info() is None
+        assert api.stats.as_dict()["pool"]["failures"] == {"http_304": 1}
+
+    run(session, test)
+    assert session.counts[API_POOL] == 2
+
+
+def test_parse_errors_do_not_open_the_breaker() -> None:
+    """A response the parser rejects fails the call but not the endpoint."""
+    session = FakeSession({API_POOL: FakeResponse(200, POOL)})
+
+    def parser(data: dict[str, Any]) -> float:
+        return data["missing"]
+
+    async def test(api: PublicPoolAPI) -> None:
+        for _ in range(BREAKER_FAILURE_THRESHOLD + 1):
+            assert await api.fetch_pool_info(parser) is None
+        assert api.breaker_states["pool"] == CircuitBreaker.CLOSED
+        assert api.stats.as_dict()["pool"]["failures"] == {
+            "parse_error": BREAKER_FAILURE_THRESHOLD + 1
+        }
+
+    run(session, test)
+    # Not retried, and every call was sent
+    assert session.counts[API_POOL] == BREAKER_FAILURE_THRESHOLD + 1
+
+
+def test_invalid_json_does_not_open_the_breaker() -> None:
+    """A body that is not JSON is a rejected response, not an outage."""
+    session = FakeSession({API_POOL: FakeResponse(200, b"<html>")})
+
+    async def test(api: PublicPoolAPI) -> None:
+        for _ in range(BREAKER_FAILURE_THRESHOLD):
+            assert await api.fetch_pool_info() is None
+        assert api.breaker_states["pool"] == CircuitBreaker.CLOSED
+        assert api.was_rejected("pool")
+
+    run(session, test)
+
+
+def test_transient_errors_are_retried() -> None:
+    """Timeouts and 5xx responses are retried within the same call."""
+    session = FakeSession(
+        {API_POOL: [TimeoutError(), FakeResponse(503), FakeResponse(200, POOL)]}
+    )
+
+    async def test(api: PublicPoolAPI) -> None:
+        assert await api.fetch_pool_info() == POOL
+        assert not api.was_rejected("pool")
+
+    run(session, test)
+    assert session.counts[API_POOL] == 3
+
+
+def test_outage_opens_the_breaker() -> None:
+    """Failing calls open the breaker, after which no request is sent."""
+    session = FakeSession({API_POOL: FakeResponse(503)})
+
+    async def test(api: PublicPoolAPI) -> int:
+        for _ in range(BREAKER_FAILURE_THRESHOLD):
+            assert await api.fetch_pool_info() is None
+        assert api.breaker_states["pool"] == CircuitBreaker.OPEN
+        sent = session.counts[API_POOL]
+        assert await api.fetch_pool_info() is None
+        return sent
+
+    assert run(session, test) == session.counts[API_POOL]
+
+
+def test_retry_after_defers_the_host() -> None:
+    """A 429 holds the host as asked and is retried without counting as an outage."""
+    session = FakeSession(
+        {
+            API_POOL: [
+                FakeResponse(429, {}, {"Retry-After": "0.05"}),
+                FakeResponse(200, POOL),
+            ]
+        }
+    )
+
+    async def test(api: PublicPoolAPI) -> None:
+        assert await api.fetch_pool_info() == POOL
+        assert api.rate_limiter.throttled == 1
+        assert api.rate_limiter.as_dict()["wait"]["max_ms"] >= 40
+        assert api._breaker("pool").failures == 0
+
+    run(session, test)
+
+
+def test_long_retry_after_is_not_waited_for() -> None:
+    """A Retry-After beyond the max wait fails the call without retrying."""
+    session = FakeSession({API_POOL: FakeResponse(429, {}, {"Retry-After": "120"})})
+
+    async def test(api: PublicPoolAPI) -> None:
+        assert await api.fetch_pool_info() is None
+        assert api.rate_limiter.blocked_for > 100
+        assert api._breaker("pool").failures == 0
+        # Held requests are turned away without reaching the host
+        assert await api.fetch_pool_info() is None
+
+    run(session, test)
+    assert session.counts[API_POOL] == 1
+
+
+def test_throttled_trial_reopens_the_breaker() -> None:
+    """A half-open trial that is throttled reopens the breaker instead of sticking."""
+    session = FakeSession(
+        {
+            API_POOL: [
+                FakeResponse(429, {}, {"Retry-After": "600"}),
+                FakeResponse(200, POOL),
+            ]
+        }
+    )
+
+    async def test(api: PublicPoolAPI) -> None:
+        breaker = api._breaker("pool")
+        for _ in range(BREAKER_FAILURE_THRESHOLD):
+            breaker.record_failure()
+        breaker._opened_at -= BREAKER_RESET_TIMEOUT
+
+        assert await api.fetch_pool_info() is None
+        assert breaker.state == CircuitBreaker.OPEN
+        # Turned away by the limiter's hold, the next trial reopens it too
+        breaker._opened_at -= BREAKER_RESET_TIMEOUT
+        assert await api.fetch_pool_info() is None
+        assert breaker.state == CircuitBreaker.OPEN
+
+        api.rate_limiter._blocked_until = 0.0
+        breaker._opened_at -= BREAKER_RESET_TIMEOUT
+        assert await api.fetch_pool_info() == POOL
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    run(session, test)
+    assert session.counts[API_POOL] == 2
+
+
+def test_concurrent_callers_share_a_request() -> None:
+    """Callers of a path in flight wait for it, recent responses are reused."""
+    session = FakeSession({API_POOL: FakeResponse(200, POOL)})
+
+    async def test(api: PublicPoolAPI) -> None:
+        results = await asyncio.gather(*(api.fetch_pool_info() for _ in range(3)))
+        assert results == [POOL] * 3
+        assert api.coalesced["pool"] == 2
+        assert await api.fetch_pool_info(max_age=60) == POOL
+        assert api.fresh_hits["pool"] == 1
+
+    run(session, test)
+    assert session.counts[API_POOL] == 1
+
+
+class DelayedResponse(FakeResponse):
+    """Response that arrives after a delay."""
+
+    def __init__(self, delay: float, *args: Any) -> None:
+        """Initialize with the delay in seconds and FakeResponse's arguments."""
+        super().__init__(*args)
+        self.delay = delay
+
+    async def __aenter__(self) -> FakeResponse:
+        """Enter the request context once the response has arrived."""
+        await asyncio.sleep(self.delay)
+        return self
+
+
+class MirrorSession:
+    """Answer session.get with a fake session per host."""
+
+    def __init__(self, sessions: dict[str, FakeSession]) -> None:
+        """Initialize with sessions keyed by base URL."""
+        self.sessions = {urlsplit(url).netloc: session for url, session in sessions.items()}
+
+    def get(self, url: str, *args: Any, **kwargs: Any) -> FakeResponse:
+        """Answer from the session of the URL's host."""
+        return self.sessions[urlsplit(url).netloc].get(url, *args, **kwargs)
+
+
+def run_mirrored(
+    primary: FakeSession, mirror: FakeSession, test: Callable[[PublicPoolAPI], Awaitable[Any]]
+) -> Any:
+    """Run test with a client of a fresh pool and one mirror."""
+
+    async def _run() -> Any:
+        pool_url, mirror_url = unique_url(), unique_url()
+        session = MirrorSession({pool_url: primary, mirror_url: mirror})
+        return await test(PublicPoolAPI(pool_url, "bc1qa", session, [mirror_url]))
+
+    return asyncio.run(_run())
+
+
+def test_failing_mirror_falls_over() -> None:
+    """A transient failure asks the next mirror within the same attempt."""
+    primary = FakeSession({API_POOL: FakeResponse(503)})
+    mirror = FakeSession({API_POOL: FakeResponse(200, POOL)})
+
+    async def test(api: PublicPoolAPI) -> None:
+        assert await api.fetch_pool_info() == POOL
+        first, second = api.mirrors.mirrors
+        assert (first.failures, second.wins) == (1, 1)
+        assert api.mirrors.ranked() == [second, first]
+
+    run_mirrored(primary, mirror, test)
+    assert (primary.counts[API_POOL], mirror.counts[API_POOL]) == (1, 1)
+
+
+def test_rejection_is_not_asked_of_other_mirrors() -> None:
+    """Answers other than transient errors are final for every mirror."""
+    primary = FakeSession({API_POOL: FakeResponse(200, b"<html>")})
+    mirror = FakeSession({API_POOL: FakeResponse(200, POOL)})
+
+    async def test(api: PublicPoolAPI) -> None:
+        assert await api.fetch_pool_info() is None
+
+    run_mirrored(primary, mirror, test)
+    assert mirror.counts[API_POOL] == 0
+
+
+def test_slow_mirror_is_hedged(monkeypatch: pytest.MonkeyPatch) -> None:
+    """A mirror slower than its hedge delay races the next one, which wins."""
+    monkeypatch.setattr(mirrors_module, "HEDGE_DEFAULT_DELAY", 0.01)
+    primary = FakeSession({API_POOL: DelayedResponse(10, 200, POOL)})
+    mirror = FakeSession({API_POOL: FakeResponse(200, POOL)})
+
+    async def test(api: PublicPoolAPI) -> None:
+        start = time.monotonic()
+        assert await api.fetch_pool_info() == POOL
+        assert time.monotonic() - start < 1
+        first, second = api.mirrors.mirrors
+        assert api.mirrors.hedges == 1
+        assert (first.wins, second.wins) == (0, 1)
+        # The cancelled request still tells the ranking it was slow
+        assert first.ewma >= 0.01
+        assert first.failures == 0
+        assert api.mirrors.ranked() == [second, first]
+
+    run_mirrored(primary, mirror, test)
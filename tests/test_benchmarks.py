@@ -0,0 +1,119 @@
+"""Tests for the benchmark stub server and response replay."""
+from __future__ import annotations
+
+import asyncio
+import json
+
+import aiohttp
+import pytest
+
+from benchmarks.payloads import client_payload
+from benchmarks.replay import ReplaySession
+from benchmarks.stub_server import CLIENT_VARIANTS, StubPublicPool
+from custom_components.public_pool import api as api_module
+from custom_components.public_pool.api import PublicPoolAPI
+from custom_components.public_pool.const import API_CLIENT, API_POOL
+
+
+@pytest.fixture(autouse=True)
+def no_retry_backoff(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Retry without sleeping between attempts."""
+    monkeypatch.setattr(api_module, "RETRY_BACKOFF", 0)
+
+
+def test_client_payload_is_deterministic() -> None:
+    """Payloads depend only on the worker count and the seed."""
+    first = client_payload(5, seed=1)
+    assert first["workersCount"] == len(first["workers"]) == 5
+    assert [worker["hashRate"] for worker in client_payload(5, seed=1)["workers"]] == [
+        worker["hashRate"] for worker in first["workers"]
+    ]
+    assert client_payload(5, seed=2)["workers"] != first["workers"]
+
+
+def test_stub_serves_the_api() -> None:
+    """The API client reads every endpoint it uses from the stub."""
+
+    async def run() -> None:
+        stub = StubPublicPool(workers=4)
+        url = await stub.async_start()
+        try:
+            async with aiohttp.ClientSession() as session:
+                api = PublicPoolAPI(url, "bc1qa", session)
+                assert (await api.fetch_pool_info())["blockHeight"] > 0
+                assert (await api.fetch_network_info())["difficulty"] > 0
+                assert await api.fetch_info()
+                assert await api.fetch_top_difficulties()
+                bodies = [await api.fetch_client_info() for _ in range(CLIENT_VARIANTS + 1)]
+        finally:
+            await stub.async_stop()
+
+        assert all(len(body["workers"]) == 4 for body in bodies)
+        # Client bodies rotate, so polls see changing data
+        assert bodies[0] != bodies[1]
+        assert bodies[0] == bodies[CLIENT_VARIANTS]
+        assert stub.stats.requests == 4 + CLIENT_VARIANTS + 1
+
+    asyncio.run(run())
+
+
+def test_stub_error_rate() -> None:
+    """With an error rate of 1 every request gets a 503."""
+
+    async def run() -> None:
+        stub = StubPublicPool(error_rate=1.0)
+        url = await stub.async_start()
+        try:
+            async with aiohttp.ClientSession() as session:
+                assert await PublicPoolAPI(url, None, session).fetch_pool_info() is None
+        finally:
+            await stub.async_stop()
+
+        assert stub.stats.errors == stub.stats.requests > 0
+
+    asyncio.run(run())
+
+
+def _record(t: float, status: int, body: dict | None = None, path: str = API_POOL) -> dict:
+    """Return a capture record as read_captures yields it."""
+    return {
+        "t": t,
+        "endpoint": "pool",
+        "path": path,
+        "status": status,
+        "elapsed": 0.01,
+        "headers": {"ETag": f'"{t}"'} if status == 200 else {},
+        "body": json.dumps(body).encode() if body is not None else b"",
+    }
+
+
+def test_replay_follows_the_capture_clock() -> None:
+    """Each path answers with its latest response at the replay time."""
+    session = ReplaySession(
+        [
+            _record(100, 200, {"height": 1}),
+            _record(160, 304),
+            _record(220, 200, {"height": 2}),
+            _record(100, 200, {}, API_CLIENT.format(address="bc1qa")),
+        ]
+    )
+    assert session.addresses == ["bc1qa"]
+
+    async def body(headers: dict[str, str] | None = None) -> tuple[int, bytes]:
+        async with session.get(f"http://replay.invalid{API_POOL}", headers=headers) as response:
+            return response.status, await response.read()
+
+    async def run() -> None:
+        assert await body() == (200, b'{"height": 1}')
+        await session.async_advance(60)
+        # A captured 304 answers conditional requests only
+        assert (await body({"If-None-Match": '"100"'}))[0] == 304
+        assert await body() == (200, b'{"height": 1}')
+        await session.async_advance(60)
+        assert await body() == (200, b'{"height": 2}')
+        assert not session.finished
+        await session.async_advance(60)
+        assert session.finished
+
+    asyncio.run(run())
+    assert session.served == {200: 3, 304: 1}
@@ -0,0 +1,47 @@
+"""Tests for the block index."""
+from __future__ import annotations
+
+from custom_components.public_pool.blocks import BlockStore
+
+
+def block(height: int, miner_address: str = "bc1qa") -> dict:
+    """Return a block as /api/pool reports it."""
+    return {"height": height, "minerAddress": miner_address, "worker": "rig"}
+
+
+def test_empty_store() -> None:
+    """An empty store has no last height and no recent blocks."""
+    store = BlockStore()
+    assert len(store) == 0
+    assert store.last_height is None
+    assert store.recent(5) == ()
+
+
+def test_only_new_heights_are_added() -> None:
+    """Heights already known are skipped, whatever their order."""
+    store = BlockStore()
+    assert store.ingest([block(30), block(10), block(20)]) == 3
+    assert store.ingest([block(40), block(30, "bc1qb"), block(20)]) == 1
+    assert len(store) == 4
+    assert store.last_height == 40
+    assert store.recent(4)[1]["miner_address"] == "bc1qa"
+
+
+def test_invalid_blocks_are_skipped() -> None:
+    """Blocks without a usable height are ignored."""
+    store = BlockStore()
+    assert store.ingest([{}, {"height": None}, {"height": "high"}, block(5)]) == 1
+    assert store.last_height == 5
+
+
+def test_recent_blocks() -> None:
+    """Recent blocks are the newest ones, newest first, up to the limit."""
+    store = BlockStore()
+    store.ingest(block(height) for height in (3, 1, 5, 4, 2))
+
+    assert [entry["height"] for entry in store.recent(3)] == [5, 4, 3]
+    assert len(store.recent(10)) == 5
+    assert store.recent(0) == ()
+    assert store.recent(1) == (
+        {"height": 5, "miner_address": "bc1qa", "worker": "rig"},
+    )
@@ -0,0 +1,80 @@
+"""Tests for the change tracker."""
+from __future__ import annotations
+
+from custom_components.public_pool.changes import ChangeTracker
+
+
+def test_first_value_is_a_change() -> None:
+    """A key that was never published counts as changed."""
+    tracker = ChangeTracker(0.01)
+    assert tracker.check("pool", 1.0, hashrate=True)
+    assert not tracker.check("pool", 1.0, hashrate=True)
+
+
+def test_hashrate_threshold() -> None:
+    """Hashrates only change once they move more than the threshold."""
+    tracker = ChangeTracker(0.01)
+    tracker.check("rig", 100.0, hashrate=True)
+    assert not tracker.check("rig", 100.5, hashrate=True)
+    assert tracker.check("rig", 101.5, hashrate=True)
+
+
+def test_drift_is_compared_with_the_published_value() -> None:
+    """Small steps below the threshold are published once they add up."""
+    tracker = ChangeTracker(0.01)
+    tracker.check("rig", 100.0, hashrate=True)
+    assert not tracker.check("rig", 100.6, hashrate=True)
+    assert tracker.check("rig", 101.2, hashrate=True)
+    assert not tracker.check("rig", 101.8, hashrate=True)
+
+
+def test_hashrate_from_zero() -> None:
+    """Any hashrate after zero is a change."""
+    tracker = ChangeTracker(0.01)
+    tracker.check("rig", 0.0, hashrate=True)
+    assert tracker.check("rig", 0.001, hashrate=True)
+
+
+def test_other_values_compare_exactly() -> None:
+    """Values that are not hashrates change on any difference."""
+    tracker = ChangeTracker(0.5)
+    tracker.check("difficulty", 100.0)
+    assert tracker.check("difficulty", 100.5)
+    assert not tracker.check("difficulty", 100.5)
+
+
+def test_nested_hashrates() -> None:
+    """The threshold applies to every float inside dicts, lists and tuples."""
+    tracker = ChangeTracker(0.01)
+    value = {"value": 10.0, "attributes": {"p10": [1.0, 2.0], "workers": 3}}
+    tracker.check("summary", value, hashrate=True)
+
+    assert not tracker.check(
+        "summary",
+        {"value": 10.05, "attributes": {"p10": [1.005, 2.0], "workers": 3}},
+        hashrate=True,
+    )
+    assert tracker.check(
+        "summary",
+        {"value": 10.0, "attributes": {"p10": [1.0, 2.0], "workers": 4}},
+        hashrate=True,
+    )
+    assert tracker.check(
+        "summary",
+        {"value": 10.0, "attributes": {"p10": [1.0, 2.0, 3.0], "workers": 4}},
+        hashrate=True,
+    )
+    assert tracker.check(
+        "summary",
+        {"value": 10.0, "attributes": {"p10": (1.0, 2.0, 3.0), "workers": 4}},
+        hashrate=True,
+    )
+    assert tracker.check("summary", {"value": 10.0}, hashrate=True)
+
+
+def test_forget() -> None:
+    """A forgotten key is published again as new."""
+    tracker = ChangeTracker(0.01)
+    tracker.check("rig", 1.0, hashrate=True)
+    tracker.forget("rig")
+    assert tracker.check("rig", 1.0, hashrate=True)
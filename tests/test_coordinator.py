@@ -0,0 +1,527 @@
+"""Tests for the coordinators: stale data, snapshots and the shared poller."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+import time
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+import pytest
+
+from benchmarks.harness import async_bench_hass
+from benchmarks.payloads import client_payload, network_payload, pool_payload
+from custom_components.public_pool import api as api_module
+from custom_components.public_pool import coordinator as coordinator_module
+from custom_components.public_pool.const import (
+    API_CLIENT,
+    API_INFO,
+    API_NETWORK,
+    API_POOL,
+    API_SHARE_TOP,
+    DATA_SHARED_COORDINATORS,
+    DOMAIN,
+    INFO_TTL,
+    NETWORK_MAX_AGE,
+    SHARE_TOP_TTL,
+    STORAGE_KEY,
+    STORAGE_VERSION,
+)
+from custom_components.public_pool.coordinator import (
+    PublicPoolCoordinator,
+    PublicPoolSharedCoordinator,
+    async_acquire_shared_coordinator,
+    async_release_shared_coordinator,
+    async_store_warm_client,
+    snapshot_to_json,
+)
+from custom_components.public_pool.models import WorkerTable
+
+from .common import FakeResponse, FakeSession, unique_url
+
+
+ADDRESS = "bc1qtest"
+
+
+@pytest.fixture(autouse=True)
+def no_retry_backoff(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Retry without sleeping between attempts."""
+    monkeypatch.setattr(api_module, "RETRY_BACKOFF", 0)
+
+
+def run(test: Callable[[HomeAssistant], Awaitable[None]]) -> None:
+    """Run test with a Home Assistant instance."""
+
+    async def _run() -> None:
+        async with async_bench_hass() as hass:
+            await test(hass)
+
+    asyncio.run(_run())
+
+
+def pool_session() -> FakeSession:
+    """Return a session answering for a healthy pool."""
+    return FakeSession(
+        {
+            API_POOL: FakeResponse(200, pool_payload()),
+            API_NETWORK: FakeResponse(200, network_payload()),
+            API_CLIENT.format(address=ADDRESS): FakeResponse(200, client_payload(3)),
+        }
+    )
+
+
+def fail_all(session: FakeSession) -> None:
+    """Make every endpoint of session time out."""
+    for path in session.routes:
+        session.routes[path] = TimeoutError()
+
+
+def create_coordinators(
+    hass: HomeAssistant, session: FakeSession, stale_ttl: int = 1
+) -> tuple[PublicPoolSharedCoordinator, PublicPoolCoordinator]:
+    """Create an entry coordinator and its shared poller, as setup does."""
+    url = unique_url()
+    shared = PublicPoolSharedCoordinator(hass, url, 300, session)
+    coordinator = PublicPoolCoordinator(
+        hass, "test", [ADDRESS], url, 60, session, shared, stale_ttl=stale_ttl
+    )
+    shared.async_add_listener(coordinator.async_handle_shared_update)
+    return shared, coordinator
+
+
+async def refresh(
+    shared: PublicPoolSharedCoordinator, coordinator: PublicPoolCoordinator
+) -> None:
+    """Refresh the pool, then the entry."""
+    await shared.async_refresh()
+    await coordinator.async_refresh()
+
+
+def age(
+    shared: PublicPoolSharedCoordinator, coordinator: PublicPoolCoordinator, seconds: float
+) -> None:
+    """Move every failing section's first failure seconds into the past."""
+    for stale_since in (shared.stale_since, coordinator._stale_since):
+        for section in stale_since:
+            stale_since[section] -= seconds
+
+
+def test_failures_go_stale_then_expire() -> None:
+    """Failing sections keep their values until the stale TTL has passed."""
+
+    async def test(hass: HomeAssistant) -> None:
+        session = pool_session()
+        shared, coordinator = create_coordinators(hass, session)
+        await refresh(shared, coordinator)
+        assert (coordinator.data["stale"], coordinator.data["expired"]) == ([], [])
+        hashrate = coordinator.data["pool_hashrate"]
+
+        fail_all(session)
+        await refresh(shared, coordinator)
+        assert coordinator.last_update_success
+        assert coordinator.data["stale"] == ["pool", "network", ADDRESS]
+        assert coordinator.data["expired"] == []
+        assert coordinator.data["pool_hashrate"] == hashrate
+        assert ADDRESS in coordinator.data["addresses"]
+
+        age(shared, coordinator, 60)
+        await refresh(shared, coordinator)
+        assert not coordinator.last_update_success
+
+        await coordinator.async_shutdown()
+        await shared.async_shutdown()
+
+    run(test)
+
+
+def test_zero_stale_ttl_expires_on_first_failure() -> None:
+    """With a stale TTL of 0 nothing is kept after a failure."""
+
+    async def test(hass: HomeAssistant) -> None:
+        session = pool_session()
+        shared, coordinator = create_coordinators(hass, session, stale_ttl=0)
+        await refresh(shared, coordinator)
+
+        fail_all(session)
+        await refresh(shared, coordinator)
+        assert not coordinator.last_update_success
+
+        await coordinator.async_shutdown()
+        await shared.async_shutdown()
+
+    run(test)
+
+
+def test_expired_address_with_live_pool() -> None:
+    """An address past the TTL expires while the pool stays current."""
+
+    async def test(hass: HomeAssistant) -> None:
+        session = pool_session()
+        shared, coordinator = create_coordinators(hass, session)
+        await refresh(shared, coordinator)
+
+        session.routes[API_CLIENT.format(address=ADDRESS)] = FakeResponse(503)
+        await refresh(shared, coordinator)
+        assert coordinator.data["stale"] == [ADDRESS]
+
+        age(shared, coordinator, 60)
+        await refresh(shared, coordinator)
+        assert coordinator.last_update_success
+        assert coordinator.data["stale"] == []
+        assert coordinator.data["expired"] == [ADDRESS]
+        assert ADDRESS not in coordinator.data["addresses"]
+
+        session.routes[API_CLIENT.format(address=ADDRESS)] = FakeResponse(200, client_payload(3))
+        # Past the breaker pause, as the scheduler's backoff would be
+        coordinator.api._breaker("client")._opened_at -= api_module.BREAKER_RESET_TIMEOUT
+        await refresh(shared, coordinator)
+        assert (coordinator.data["stale"], coordinator.data["expired"]) == ([], [])
+        assert ADDRESS in coordinator.data["addresses"]
+
+        await coordinator.async_shutdown()
+        await shared.async_shutdown()
+
+    run(test)
+
+
+def test_restored_snapshot_is_stale_while_the_pool_is_down() -> None:
+    """Restored values stay up, marked stale, when the first refresh fails."""
+
+    async def test(hass: HomeAssistant) -> None:
+        session = pool_session()
+        shared, coordinator = create_coordinators(hass, session)
+        await refresh(shared, coordinator)
+        hashrate = coordinator.data["pool_hashrate"]
+        await coordinator._store.async_save(
+            {"data": snapshot_to_json(coordinator.data), "rolling": coordinator.rolling.as_dict()}
+        )
+        await coordinator.async_shutdown()
+        await shared.async_shutdown()
+
+        fail_all(session)
+        shared = PublicPoolSharedCoordinator(hass, coordinator.pool_url, 300, session)
+        restarted = PublicPoolCoordinator(
+            hass, "test", [ADDRESS], coordinator.pool_url, 60, session, shared, stale_ttl=1
+        )
+        shared.async_add_listener(restarted.async_handle_shared_update)
+        assert await restarted.async_restore()
+        await refresh(shared, restarted)
+
+        assert restarted.last_update_success
+        assert restarted.data["stale"] == ["pool", "network", ADDRESS]
+        assert restarted.data["pool_hashrate"] == hashrate
+
+        await restarted.async_shutdown()
+        await shared.async_shutdown()
+
+    run(test)
+
+
+@pytest.mark.parametrize(
+    ("version", "snapshot"),
+    [
+        (1, {"data": {"addresses": {ADDRESS: {"workers": [{"name": "rig"}]}}}}),
+        (STORAGE_VERSION, {"data": {"addresses": {ADDRESS: {"workers": {"name": ["rig"]}}}}}),
+        (STORAGE_VERSION, {"data": {"pool_hashrate": 1.0}}),
+    ],
+)
+def test_unreadable_snapshot_starts_cold(version: int, snapshot: dict) -> None:
+    """Old or truncated snapshots are ignored instead of failing setup."""
+
+    async def test(hass: HomeAssistant) -> None:
+        await Store(hass, version, STORAGE_KEY.format(entry_id="test")).async_save(snapshot)
+        shared, coordinator = create_coordinators(hass, pool_session())
+        assert not await coordinator.async_restore()
+        assert coordinator.data is None
+
+    run(test)
+
+
+def test_snapshot_missing_new_keys_gets_defaults() -> None:
+    """Keys added since a snapshot was saved are filled with their defaults."""
+
+    async def test(hass: HomeAssistant) -> None:
+        workers = WorkerTable().as_dict()
+        await Store(hass, STORAGE_VERSION, STORAGE_KEY.format(entry_id="test")).async_save(
+            {"data": {"pool_hashrate": 1.0, "addresses": {ADDRESS: {"workers": workers}}}}
+        )
+        shared, coordinator = create_coordinators(hass, pool_session())
+        assert await coordinator.async_restore()
+        assert coordinator.data["pool_hashrate"] == 1.0
+        assert coordinator.data["stale"] == []
+        assert "address_best_difficulty" in coordinator.data["addresses"][ADDRESS]
+
+    run(test)
+
+
+def test_shared_interval_follows_the_entries() -> None:
+    """The pool is polled at the shortest interval of the entries using it."""
+
+    async def test(hass: HomeAssistant) -> None:
+        url = unique_url()
+        shared = await async_acquire_shared_coordinator(hass, url, True, 300)
+        shared.scheduler.record_failure()
+        backoff = shared.scheduler.current
+
+        assert await async_acquire_shared_coordinator(hass, url, True, 60) is shared
+        assert shared.scheduler.base_interval == 60
+        # Joining an entry does not cut an outage's backoff short
+        assert shared.scheduler.current == backoff
+
+        shared.scheduler.record_success(True)
+        await async_release_shared_coordinator(hass, shared, 60)
+        assert shared.scheduler.base_interval == 300
+        assert shared.update_interval.total_seconds() == 300
+
+        await async_release_shared_coordinator(hass, shared, 300)
+        assert shared.refcount == 0
+        assert not hass.data[DOMAIN][DATA_SHARED_COORDINATORS]
+
+    run(test)
+
+
+def test_slow_endpoints_follow_their_ttl() -> None:
+    """Site info and top difficulties are only refetched once their TTL expires."""
+
+    async def test(hass: HomeAssistant) -> None:
+        session = pool_session()
+        session.routes[API_INFO] = FakeResponse(200, {"uptime": "2024-01-01T00:00:00Z"})
+        session.routes[API_SHARE_TOP] = FakeResponse(200, [{"bestDifficulty": 5e9}])
+        shared, coordinator = create_coordinators(hass, session)
+
+        for _ in range(3):
+            await shared.async_refresh()
+        assert shared.data["pool_top_difficulty"] == 5e9
+        assert shared.data["pool_started_at"] == 1704067200.0
+        assert (session.counts[API_INFO], session.counts[API_SHARE_TOP]) == (1, 1)
+
+        shared._fetched_at["share_top"] -= SHARE_TOP_TTL.total_seconds()
+        await shared.async_refresh()
+        assert (session.counts[API_INFO], session.counts[API_SHARE_TOP]) == (1, 2)
+        shared._fetched_at["info"] -= INFO_TTL.total_seconds()
+        await shared.async_refresh()
+        assert (session.counts[API_INFO], session.counts[API_SHARE_TOP]) == (2, 2)
+
+        await shared.async_shutdown()
+
+    run(test)
+
+
+def test_missing_slow_endpoints_wait_for_their_ttl() -> None:
+    """An endpoint the pool does not have is not asked on every poll.
+
+    Transient failures are retried on the next poll.
+    """
+
+    async def test(hass: HomeAssistant) -> None:
+        session = pool_session()
+        session.routes[API_SHARE_TOP] = FakeResponse(503)
+        shared, coordinator = create_coordinators(hass, session)
+
+        await shared.async_refresh()
+        top_requests = session.counts[API_SHARE_TOP]
+        await shared.async_refresh()
+        # /api/info answers 404 and waits; the 503 is asked again
+        assert session.counts[API_INFO] == 1
+        assert session.counts[API_SHARE_TOP] > top_requests
+
+        await shared.async_shutdown()
+
+    run(test)
+
+
+def test_first_refresh_reuses_the_config_flow_payload() -> None:
+    """The address fetched by the config flow is not requested again."""
+
+    async def test(hass: HomeAssistant) -> None:
+        session = pool_session()
+        shared, coordinator = create_coordinators(hass, session)
+        async_store_warm_client(hass, coordinator.pool_url, ADDRESS, client_payload(2))
+
+        await refresh(shared, coordinator)
+        assert session.counts[API_CLIENT.format(address=ADDRESS)] == 0
+        assert len(coordinator.data["addresses"][ADDRESS]["workers"]) == 2
+
+        # Only the first refresh; later ones ask the pool
+        await coordinator.async_refresh()
+        assert session.counts[API_CLIENT.format(address=ADDRESS)] == 1
+
+        await coordinator.async_shutdown()
+        await shared.async_shutdown()
+
+    run(test)
+
+
+def test_unparsable_config_flow_payload_is_fetched() -> None:
+    """A config flow payload that does not parse falls back to a request."""
+
+    async def test(hass: HomeAssistant) -> None:
+        session = pool_session()
+        shared, coordinator = create_coordinators(hass, session)
+        payload = client_payload(2)
+        payload["workers"][0]["hashRate"] = "fast"
+        async_store_warm_client(hass, coordinator.pool_url, ADDRESS, payload)
+
+        await refresh(shared, coordinator)
+        assert coordinator.last_update_success
+        assert session.counts[API_CLIENT.format(address=ADDRESS)] == 1
+        assert len(coordinator.data["addresses"][ADDRESS]["workers"]) == 3
+
+        await coordinator.async_shutdown()
+        await shared.async_shutdown()
+
+    run(test)
+
+
+def test_shared_update_publishes_address_metrics() -> None:
+    """New network data moves the address block odds without an address refresh."""
+
+    async def test(hass: HomeAssistant) -> None:
+        session = pool_session()
+        shared, coordinator = create_coordinators(hass, session)
+        await refresh(shared, coordinator)
+        address_data = coordinator.data["addresses"][ADDRESS]
+
+        session.routes[API_POOL] = FakeResponse(200, pool_payload(height=850_001))
+        session.routes[API_NETWORK] = FakeResponse(
+            200, {**network_payload(850_001), "difficulty": 9.0e13}
+        )
+        await shared.async_refresh()
+
+        updated = coordinator.data["addresses"][ADDRESS]
+        assert updated["address_luck"] < address_data["address_luck"]
+        assert {
+            (ADDRESS, "address_expected_time_to_block"),
+            (ADDRESS, "address_block_chance_24h"),
+            (ADDRESS, "address_luck"),
+        } <= coordinator.changed_keys
+        assert (ADDRESS, "address_workers_count") not in coordinator.changed_keys
+        assert session.counts[API_CLIENT.format(address=ADDRESS)] == 1
+
+        await coordinator.async_shutdown()
+        await shared.async_shutdown()
+
+    run(test)
+
+
+def create_multi_address_coordinator(
+    hass: HomeAssistant, session: FakeSession, addresses: list[str], max_concurrency: int
+) -> PublicPoolCoordinator:
+    """Create an entry coordinator tracking several addresses."""
+    url = unique_url()
+    shared = PublicPoolSharedCoordinator(hass, url, 300, session)
+    return PublicPoolCoordinator(
+        hass, "test", addresses, url, 60, session, shared, max_concurrency=max_concurrency
+    )
+
+
+class SlowResponse(FakeResponse):
+    """Response that holds its request open for a while, counting open requests."""
+
+    active = 0
+    max_active = 0
+
+    async def __aenter__(self) -> FakeResponse:
+        """Enter the request context once the response has arrived."""
+        SlowResponse.active += 1
+        SlowResponse.max_active = max(SlowResponse.max_active, SlowResponse.active)
+        await asyncio.sleep(0.01)
+        SlowResponse.active -= 1
+        return self
+
+
+def test_addresses_are_fetched_with_bounded_concurrency() -> None:
+    """No more than max_concurrency client requests are open at once."""
+    addresses = [f"bc1q{index}" for index in range(6)]
+
+    async def test(hass: HomeAssistant) -> None:
+        session = FakeSession(
+            {
+                API_CLIENT.format(address=address): SlowResponse(200, client_payload(index + 1))
+                for index, address in enumerate(addresses)
+            }
+        )
+        coordinator = create_multi_address_coordinator(hass, session, addresses, 2)
+        SlowResponse.max_active = 0
+
+        clients = await coordinator._async_fetch_clients((None, 0))
+
+        assert SlowResponse.max_active == 2
+        assert list(clients) == addresses
+        assert [len(client["workers"]) for client in clients.values()] == [1, 2, 3, 4, 5, 6]
+
+    run(test)
+
+
+def test_scheduled_client_requests_are_spread(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Scheduled refreshes stagger the addresses, requested ones do not."""
+    monkeypatch.setattr(coordinator_module, "CLIENT_POLL_SPREAD", 0.004)
+    addresses = [f"bc1q{index}" for index in range(4)]
+    started: list[float] = []
+
+    def respond(headers: dict[str, str]) -> FakeResponse:
+        started.append(time.monotonic())
+        return FakeResponse(200, client_payload(1))
+
+    async def test(hass: HomeAssistant) -> None:
+        session = FakeSession(
+            {API_CLIENT.format(address=address): respond for address in addresses}
+        )
+        coordinator = create_multi_address_coordinator(hass, session, addresses, 4)
+
+        await coordinator._async_fetch_clients(None)
+        # 60 s * 0.004 spread over four addresses
+        gaps = [later - earlier for earlier, later in zip(started, started[1:])]
+        assert len(gaps) == 3
+        assert all(gap >= 0.05 for gap in gaps)
+
+        started.clear()
+        await coordinator._async_fetch_clients((None, 0))
+        assert started[-1] - started[0] < 0.05
+
+    run(test)
+
+
+def test_network_is_fetched_for_new_blocks() -> None:
+    """Network data is refetched when the pool reports a new block, or is old."""
+
+    async def test(hass: HomeAssistant) -> None:
+        session = pool_session()
+        shared, _ = create_coordinators(hass, session)
+        await shared.async_refresh()
+        await shared.async_refresh()
+        assert session.counts[API_NETWORK] == 1
+        # Not refetched, but current as long as the pool answers
+        assert "network" not in shared.stale_since
+
+        session.routes[API_POOL] = FakeResponse(200, pool_payload(height=850_001))
+        await shared.async_refresh()
+        assert session.counts[API_NETWORK] == 2
+        await shared.async_refresh()
+        assert session.counts[API_NETWORK] == 2
+
+        shared._network_fetched_at -= NETWORK_MAX_AGE.total_seconds()
+        await shared.async_refresh()
+        assert session.counts[API_NETWORK] == 3
+        assert session.counts[API_POOL] == 5
+
+        await shared.async_shutdown()
+
+    run(test)
+
+
+def test_network_is_not_refetched_until_it_reaches_the_pool_height() -> None:
+    """A network answer behind the pool does not retrigger on every refresh."""
+
+    async def test(hass: HomeAssistant) -> None:
+        session = pool_session()
+        shared, _ = create_coordinators(hass, session)
+        session.routes[API_POOL] = FakeResponse(200, pool_payload(height=850_002))
+        await shared.async_refresh()
+        await shared.async_refresh()
+        assert session.counts[API_NETWORK] == 1
+        assert shared.data["network_block_height"] == 850_000
+
+        await shared.async_shutdown()
+
+    run(test)
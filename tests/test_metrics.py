@@ -0,0 +1,49 @@
+"""Tests for the block odds."""
+from __future__ import annotations
+
+import math
+
+import pytest
+
+from custom_components.public_pool.metrics import (
+    HASHES_PER_DIFFICULTY,
+    block_chance,
+    expected_time_to_block,
+    luck,
+    mining_metrics,
+)
+
+
+def test_expected_time_to_block() -> None:
+    """The expected time is the hashes per block over the hashrate."""
+    assert expected_time_to_block(HASHES_PER_DIFFICULTY, 600) == 600
+    assert expected_time_to_block(0, 600) is None
+    assert expected_time_to_block(HASHES_PER_DIFFICULTY, 0) is None
+
+
+def test_block_chance() -> None:
+    """The chance follows the Poisson odds and keeps precision when tiny."""
+    assert block_chance(600, 600) == pytest.approx((1 - math.exp(-1)) * 100)
+    assert block_chance(1, 1e12) == pytest.approx(1e-10)
+    assert block_chance(600, None) is None
+
+
+def test_mining_metrics() -> None:
+    """Metrics are keyed by prefix, with one chance per window."""
+    metrics = mining_metrics("address", 2 * HASHES_PER_DIFFICULTY, 86400, 4e9 * 2**32)
+
+    assert metrics["address_expected_time_to_block"] == 43200
+    assert metrics["address_network_share"] == pytest.approx(50 / 1e9)
+    assert metrics["address_block_chance_24h"] == pytest.approx((1 - math.exp(-2)) * 100)
+    assert metrics["address_block_chance_7d"] > metrics["address_block_chance_24h"]
+
+
+def test_mining_metrics_without_network_data() -> None:
+    """Without network data every metric is unknown."""
+    assert set(mining_metrics("pool", 1e15, 0, 0).values()) == {None}
+
+
+def test_luck() -> None:
+    """Luck is the best difficulty as a percentage of the network's."""
+    assert luck(5e13, 1e14) == 50
+    assert luck(5e13, 0) is None
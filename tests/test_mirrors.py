@@ -0,0 +1,79 @@
+"""Tests for the mirror latency ranking."""
+from __future__ import annotations
+
+from custom_components.public_pool.const import (
+    HEDGE_DEFAULT_DELAY,
+    HEDGE_MIN_DELAY,
+    HEDGE_MIN_SAMPLES,
+    READ_TIMEOUT,
+)
+from custom_components.public_pool.mirrors import Mirror, MirrorSet
+
+
+def urls(mirrors: list[Mirror]) -> list[str]:
+    """Return the URLs of mirrors in order."""
+    return [mirror.url for mirror in mirrors]
+
+
+def test_duplicate_urls_are_dropped() -> None:
+    """A URL configured twice is one mirror."""
+    assert urls(MirrorSet(["http://a", "http://b", "http://a"]).mirrors) == [
+        "http://a",
+        "http://b",
+    ]
+
+
+def test_unmeasured_mirrors_rank_first() -> None:
+    """Mirrors without an estimate are asked before measured ones, in order."""
+    mirrors = MirrorSet(["http://a", "http://b", "http://c"])
+    mirrors.mirrors[0].record_success(0.1)
+    assert urls(mirrors.ranked()) == ["http://b", "http://c", "http://a"]
+
+
+def test_fastest_mirror_ranks_first() -> None:
+    """Measured mirrors are ranked by their moving average."""
+    mirrors = MirrorSet(["http://a", "http://b"])
+    mirrors.mirrors[0].record_success(0.5)
+    mirrors.mirrors[1].record_success(0.1)
+    assert urls(mirrors.ranked()) == ["http://b", "http://a"]
+
+    # Failures count as slow responses until the mirror recovers
+    mirrors.mirrors[1].record_failure("timeout")
+    assert mirrors.mirrors[1].ewma > 0.5
+    assert urls(mirrors.ranked()) == ["http://a", "http://b"]
+    for _ in range(20):
+        mirrors.mirrors[1].record_success(0.1)
+    assert urls(mirrors.ranked()) == ["http://b", "http://a"]
+    assert mirrors.mirrors[1].consecutive_failures == 0
+    assert mirrors.mirrors[1].failures == 1
+
+
+def test_failure_counts_as_read_timeout() -> None:
+    """A first failure estimates the mirror at the read timeout."""
+    mirror = Mirror("http://a")
+    mirror.record_failure("timeout")
+    assert mirror.ewma == READ_TIMEOUT
+    assert mirror.last_error == "timeout"
+
+
+def test_cancelled_requests_only_move_the_estimate() -> None:
+    """A lost race slows the estimate but adds no latency sample."""
+    mirror = Mirror("http://a")
+    mirror.record_cancelled(1.0)
+    assert mirror.ewma == 1.0
+    assert mirror.latency.count == 0
+
+
+def test_hedge_delay() -> None:
+    """The hedge delay is the p95 latency once there are enough samples."""
+    mirror = Mirror("http://a")
+    assert mirror.hedge_delay == HEDGE_DEFAULT_DELAY
+
+    for _ in range(HEDGE_MIN_SAMPLES):
+        mirror.record_success(0.2)
+    assert 0.15 <= mirror.hedge_delay <= 0.25
+
+    fast = Mirror("http://b")
+    for _ in range(HEDGE_MIN_SAMPLES):
+        fast.record_success(0.001)
+    assert fast.hedge_delay == HEDGE_MIN_DELAY
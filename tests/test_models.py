@@ -0,0 +1,110 @@
+"""Tests for the worker table."""
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from custom_components.public_pool.models import WorkerTable, iso_to_epoch
+
+
+NOW = 1_700_000_000.0
+
+
+def _table(hashrates: list[float], last_seen: str = "2023-11-14T22:13:20Z") -> WorkerTable:
+    """Return a table with one worker per hashrate."""
+    table = WorkerTable()
+    for index, hashrate in enumerate(hashrates):
+        table.add(f"rig{index}", f"s{index}", hashrate, index * 10.0, None, last_seen)
+    return table
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        ("2023-11-14T22:13:20Z", NOW),
+        ("2023-11-14T22:13:20.000+00:00", NOW),
+        ("", 0.0),
+        (None, 0.0),
+        ("yesterday", 0.0),
+    ],
+)
+def test_iso_to_epoch(value: str | None, expected: float) -> None:
+    """Timestamps convert to epoch seconds, invalid ones to 0."""
+    assert iso_to_epoch(value) == expected
+
+
+def test_add_replaces_by_name() -> None:
+    """Adding a worker again updates it in place."""
+    table = _table([1.0, 2.0])
+    table.add("rig0", "s9", 5.0, 1.0, None, None)
+
+    assert len(table) == 2
+    assert list(table) == ["rig0", "rig1"]
+    worker = table.get("rig0")
+    assert (worker.session_id, worker.hashrate, worker.last_seen_epoch) == ("s9", 5.0, 0.0)
+    assert "rig1" in table
+    assert table.get("rig2") is None
+
+
+def test_round_trip_through_json() -> None:
+    """A saved table restores equal, with the derived epochs rebuilt."""
+    table = _table([1.0, 2.0, 3.0])
+    restored = WorkerTable.from_dict(json.loads(json.dumps(table.as_dict())))
+
+    assert restored == table
+    assert restored.get("rig2").last_seen_epoch == NOW
+
+
+def test_percentile() -> None:
+    """Percentiles interpolate between the sorted values."""
+    table = _table([4.0, 1.0, 3.0, 2.0])
+    assert table.percentile("hashrate", 50) == 2.5
+    assert table.percentile("hashrate", 100) == 4.0
+    assert WorkerTable().percentile("hashrate", 50) == 0.0
+
+
+def test_summary() -> None:
+    """Summaries rank workers and count the stale ones."""
+    table = _table([float(value) for value in range(1, 11)])
+    table.add("old", None, 0.5, 0.0, None, "2023-11-14T20:00:00Z")
+
+    summary = table.summary(NOW + 60, 600, 2, 5)
+
+    assert summary["online_workers"]["value"] == 10
+    assert summary["stale_workers"]["value"] == 1
+    assert summary["hashrate_median"]["value"] == 5.0
+    assert [worker["name"] for worker in summary["fastest_workers"]["attributes"]["workers"]] == [
+        "rig9",
+        "rig8",
+    ]
+    assert summary["slowest_workers"]["value"] == 0.5
+    histogram = summary["hashrate_median"]["attributes"]["histogram"]
+    assert len(histogram) == 5
+    assert sum(histogram.values()) == 11
+    assert next(iter(histogram)) == "0.50-2.40"
+
+
+def test_summary_of_equal_hashrates() -> None:
+    """Workers all at one hashrate fall into a single histogram bucket."""
+    summary = _table([2.0, 2.0, 2.0]).summary(NOW, 600, 5, 10)
+    assert summary["hashrate_median"]["attributes"]["histogram"] == {"2.00-2.00": 3}
+
+
+def test_summary_of_empty_table() -> None:
+    """An empty table summarizes to zeros and no workers."""
+    summary = WorkerTable().summary(NOW, 600, 5, 10)
+    assert summary["online_workers"]["value"] == 0
+    assert summary["hashrate_median"]["attributes"]["histogram"] == {}
+    assert summary["fastest_workers"]["value"] is None
+
+
+def test_summary_ranking_is_cached_until_add() -> None:
+    """Repeated summaries reuse the ranking until the table changes."""
+    table = _table([1.0, 2.0])
+    first = table.summary(NOW, 600, 5, 10)
+    assert table.summary(NOW + 3600, 600, 5, 10)["fastest_workers"] is first["fastest_workers"]
+    assert table.summary(NOW, 600, 1, 10)["fastest_workers"] is not first["fastest_workers"]
+
+    table.add("rig9", None, 9.0, 0.0, None, None)
+    assert table.summary(NOW, 600, 1, 10)["fastest_workers"]["value"] == 9.0
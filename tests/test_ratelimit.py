@@ -0,0 +1,113 @@
+"""Tests for the host-wide rate limiter."""
+from __future__ import annotations
+
+import asyncio
+from email.utils import formatdate
+import time
+
+import pytest
+
+from custom_components.public_pool.ratelimit import (
+    HostRateLimiter,
+    host_rate_limiter,
+    parse_retry_after,
+)
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [("5", 5.0), ("0.5", 0.5), ("-3", 0.0), ("", None), (None, None), ("soon", None)],
+)
+def test_parse_retry_after_seconds(value: str | None, expected: float | None) -> None:
+    """Retry-After in seconds is read, anything unparsable is ignored."""
+    assert parse_retry_after(value) == expected
+
+
+def test_parse_retry_after_date() -> None:
+    """Retry-After as an HTTP date is the time left until then."""
+    assert 55 <= parse_retry_after(formatdate(time.time() + 60, usegmt=True)) <= 60
+    assert parse_retry_after(formatdate(time.time() - 60, usegmt=True)) == 0.0
+
+
+def test_limiters_are_per_host() -> None:
+    """URLs on one host share a limiter, other hosts get their own."""
+    limiter = host_rate_limiter("http://Shared.invalid/api/pool")
+    assert host_rate_limiter("http://shared.invalid/api/client/x") is limiter
+    assert host_rate_limiter("http://other.invalid") is not limiter
+
+
+def test_burst_is_granted_without_waiting() -> None:
+    """Requests within the burst go through at once."""
+
+    async def run() -> None:
+        limiter = HostRateLimiter("burst.invalid", 1, 3)
+        for _ in range(3):
+            assert await asyncio.wait_for(limiter.acquire("a", 1), 0.1)
+        assert limiter.granted == 3
+        assert limiter.waiting == 0
+
+    asyncio.run(run())
+
+
+def test_waiting_keys_are_served_round_robin() -> None:
+    """A key with many queued requests does not starve a later key."""
+
+    async def run() -> list[str]:
+        limiter = HostRateLimiter("fair.invalid", 200, 1)
+        await limiter.acquire("warmup", 1)
+        served: list[str] = []
+
+        async def request(key: str) -> None:
+            await limiter.acquire(key, 1)
+            served.append(key)
+
+        tasks = [asyncio.create_task(request(key)) for key in ("a", "a", "a", "b")]
+        await asyncio.gather(*tasks)
+        assert limiter.max_waiting == 4
+        return served
+
+    assert asyncio.run(run()) == ["a", "b", "a", "a"]
+
+
+def test_retry_after_holds_every_request() -> None:
+    """A deferral holds requests until it has passed, even with tokens left."""
+
+    async def run() -> None:
+        limiter = HostRateLimiter("defer.invalid", 100, 10)
+        limiter.defer(0.05)
+        start = time.monotonic()
+        assert await limiter.acquire("a", 1)
+        assert time.monotonic() - start >= 0.04
+        assert limiter.throttled == 1
+
+    asyncio.run(run())
+
+
+def test_long_retry_after_is_rejected() -> None:
+    """Requests are not queued behind a hold longer than max_wait."""
+
+    async def run() -> None:
+        limiter = HostRateLimiter("reject.invalid", 100, 10)
+        limiter.defer(10)
+        assert not await limiter.acquire("a", 1)
+        assert limiter.rejected == 1
+        assert limiter.waiting == 0
+
+    asyncio.run(run())
+
+
+def test_cancelled_waiter_leaves_the_queue() -> None:
+    """A cancelled request gives up its place without using a token."""
+
+    async def run() -> None:
+        limiter = HostRateLimiter("cancel.invalid", 50, 1)
+        await limiter.acquire("warmup", 1)
+        cancelled = asyncio.create_task(limiter.acquire("a", 1))
+        waiting = asyncio.create_task(limiter.acquire("b", 1))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        assert await asyncio.wait_for(waiting, 1)
+        assert limiter.waiting == 0
+        assert limiter.granted == 2
+
+    asyncio.run(run())
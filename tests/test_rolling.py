@@ -0,0 +1,110 @@
+"""Tests for the rolling hashrate averages."""
+from __future__ import annotations
+
+from array import array
+import base64
+import json
+import sys
+
+from custom_components.public_pool.rolling import (
+    RollingHashrates,
+    RollingMeans,
+    RollingWindow,
+)
+
+
+NOW = 1_700_000_000.0
+
+
+def test_window_mean() -> None:
+    """The mean covers every sample within the window."""
+    window = RollingWindow(600, 10)
+    assert window.mean is None
+    window.add(NOW, 1.0)
+    window.add(NOW + 60, 3.0)
+    window.add(NOW + 120, 5.0)
+    assert window.mean == 3.0
+
+
+def test_window_expires_old_buckets() -> None:
+    """Samples older than the window drop out as time moves on."""
+    window = RollingWindow(600, 10)
+    window.add(NOW, 100.0)
+    window.add(NOW + 300, 2.0)
+    window.add(NOW + 660, 4.0)
+    assert window.mean == 3.0
+    window.add(NOW + 3600, 8.0)
+    assert window.mean == 8.0
+
+
+def test_means_attributes() -> None:
+    """Every window is reported under its name."""
+    series = RollingMeans()
+    series.add(NOW, 1.234)
+    assert series.attributes("hashrate") == {
+        "hashrate_10m": 1.23,
+        "hashrate_1h": 1.23,
+        "hashrate_24h": 1.23,
+    }
+
+
+def _filled() -> RollingHashrates:
+    """Return an address and a worker series with 90 minutes of samples."""
+    rolling = RollingHashrates()
+    for minute in range(90):
+        rolling.add("bc1qa", NOW + minute * 60, float(minute))
+        rolling.add(("bc1qa", "rig"), NOW + minute * 60, 2.0 * minute)
+    return rolling
+
+
+def test_round_trip_through_json() -> None:
+    """Saved series restore to the same means and keep averaging."""
+    rolling = _filled()
+    restored = RollingHashrates.from_dict(json.loads(json.dumps(rolling.as_dict())))
+
+    assert restored.series.keys() == rolling.series.keys()
+    for key, series in rolling.series.items():
+        assert restored.get(key).attributes("h") == series.attributes("h")
+        assert restored.get(key).updated_at == series.updated_at
+
+    later = NOW + 90 * 60
+    rolling.add("bc1qa", later, 500.0)
+    restored.add("bc1qa", later, 500.0)
+    assert restored.get("bc1qa").attributes("h") == rolling.get("bc1qa").attributes("h")
+
+
+def test_round_trip_across_byte_order() -> None:
+    """Buffers saved on a machine of the other byte order are swapped."""
+    rolling = _filled()
+    saved = rolling.as_dict()
+    swapped_series = []
+    for address, worker, packed in saved["series"]:
+        values = array("d")
+        values.frombytes(base64.b64decode(packed))
+        values.byteswap()
+        swapped_series.append([address, worker, base64.b64encode(values.tobytes()).decode()])
+
+    restored = RollingHashrates.from_dict(
+        {
+            "byteorder": "big" if sys.byteorder == "little" else "little",
+            "series": swapped_series,
+        }
+    )
+    for key, series in rolling.series.items():
+        assert restored.get(key).attributes("h") == series.attributes("h")
+
+
+def test_mismatched_layout_is_skipped() -> None:
+    """Buffers of another window layout are dropped instead of misread."""
+    restored = RollingHashrates.from_dict(
+        {"series": [["bc1qa", None, "AAAAAAAAAAA="], ["bc1qb", "rig", ""]]}
+    )
+    assert restored.series == {}
+
+
+def test_prune_drops_silent_series() -> None:
+    """Series without samples for longer than the longest window are dropped."""
+    rolling = _filled()
+    rolling.add("bc1qb", NOW + 2 * 86400, 1.0)
+    rolling.prune(NOW + 2 * 86400)
+    assert list(rolling.series) == ["bc1qb"]
@@ -0,0 +1,84 @@
+"""Tests for the adaptive polling interval."""
+from __future__ import annotations
+
+import pytest
+
+from custom_components.public_pool.const import (
+    ADAPTIVE_GROWTH_FACTOR,
+    ADAPTIVE_IDLE_FACTOR,
+    BACKOFF_JITTER,
+    MAX_BACKOFF_INTERVAL,
+)
+from custom_components.public_pool.scheduler import AdaptiveInterval
+
+
+def test_failures_back_off_with_jitter() -> None:
+    """Each failure doubles the interval, within the jitter."""
+    scheduler = AdaptiveInterval(60)
+    for failures in range(1, 4):
+        current = scheduler.record_failure().total_seconds()
+        expected = 60 * 2**failures
+        assert expected * (1 - BACKOFF_JITTER) <= current <= expected * (1 + BACKOFF_JITTER)
+
+
+def test_backoff_is_capped() -> None:
+    """Backoff stops growing at MAX_BACKOFF_INTERVAL, give or take the jitter."""
+    scheduler = AdaptiveInterval(60)
+    for _ in range(20):
+        scheduler.record_failure()
+    assert scheduler.current <= MAX_BACKOFF_INTERVAL * (1 + BACKOFF_JITTER)
+
+
+def test_unchanged_snapshots_stretch_the_interval() -> None:
+    """Unchanged successes grow the interval up to the idle ceiling."""
+    scheduler = AdaptiveInterval(60)
+    assert scheduler.record_success(False).total_seconds() == 60 * ADAPTIVE_GROWTH_FACTOR
+    for _ in range(10):
+        scheduler.record_success(False)
+    assert scheduler.current == 60 * ADAPTIVE_IDLE_FACTOR
+
+
+def test_changes_reset_to_base() -> None:
+    """A changed snapshot drops back to the base interval."""
+    scheduler = AdaptiveInterval(60)
+    for _ in range(5):
+        scheduler.record_success(False)
+    assert scheduler.record_success(True).total_seconds() == 60
+
+
+def test_recovery_restarts_from_base() -> None:
+    """The first success after failures starts over from the base interval."""
+    scheduler = AdaptiveInterval(60)
+    for _ in range(5):
+        scheduler.record_failure()
+    assert scheduler.record_success(False).total_seconds() == 60
+    assert scheduler.failures == 0
+    assert scheduler.record_success(False).total_seconds() == 60 * ADAPTIVE_GROWTH_FACTOR
+
+
+def test_set_base_interval_keeps_backoff() -> None:
+    """Changing the base interval during an outage keeps backing off."""
+    scheduler = AdaptiveInterval(300)
+    scheduler.record_failure()
+    backoff = scheduler.current
+    scheduler.set_base_interval(60)
+    assert scheduler.base_interval == 60
+    assert scheduler.failures == 1
+    assert scheduler.current == backoff
+
+
+@pytest.mark.parametrize(
+    ("current", "base_interval", "expected"),
+    [
+        (60, 300, 300),
+        (1200, 60, 60 * ADAPTIVE_IDLE_FACTOR),
+        (90, 60, 90),
+    ],
+)
+def test_set_base_interval_clamps_current(
+    current: float, base_interval: float, expected: float
+) -> None:
+    """Without failures the interval is moved into the new base's range."""
+    scheduler = AdaptiveInterval(60)
+    scheduler.current = current
+    assert scheduler.set_base_interval(base_interval).total_seconds() == expected
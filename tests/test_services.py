@@ -0,0 +1,91 @@
+"""Tests for the refresh service."""
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.public_pool.const import (
+    API_CLIENT,
+    API_NETWORK,
+    API_POOL,
+    ATTR_MIN_AGE,
+    DOMAIN,
+    SERVICE_REFRESH,
+)
+from custom_components.public_pool.services import async_setup_services
+
+from .test_coordinator import ADDRESS, create_coordinators, pool_session, run
+
+
+async def call_refresh(hass: HomeAssistant, min_age: float = 30) -> dict[str, Any]:
+    """Call the refresh service and return its response."""
+    return await hass.services.async_call(
+        DOMAIN,
+        SERVICE_REFRESH,
+        {ATTR_MIN_AGE: min_age},
+        blocking=True,
+        return_response=True,
+    )
+
+
+def test_refresh_reuses_recent_responses() -> None:
+    """Responses younger than min_age are reused instead of refetched."""
+
+    async def test(hass: HomeAssistant) -> None:
+        session = pool_session()
+        shared, coordinator = create_coordinators(hass, session)
+        hass.data[DOMAIN] = {"test": coordinator}
+        async_setup_services(hass)
+        await shared.async_refresh()
+        await coordinator.async_refresh()
+
+        result = await call_refresh(hass)
+        assert result == {
+            "entries": 1,
+            "requests": 0,
+            "reused": 2,
+            "coalesced": 0,
+            "saved": 2,
+        }
+
+        result = await call_refresh(hass, min_age=0)
+        assert (result["requests"], result["saved"]) == (2, 0)
+        assert session.counts[API_POOL] == 2
+        assert session.counts[API_CLIENT.format(address=ADDRESS)] == 2
+        # Network data is only refetched for a new block
+        assert session.counts[API_NETWORK] == 1
+
+        await coordinator.async_shutdown()
+        await shared.async_shutdown()
+
+    run(test)
+
+
+def test_concurrent_calls_count_only_their_own_requests() -> None:
+    """A call joining one in flight reports it as saved, not as sent."""
+
+    async def test(hass: HomeAssistant) -> None:
+        session = pool_session()
+        shared, coordinator = create_coordinators(hass, session)
+        hass.data[DOMAIN] = {"test": coordinator}
+        async_setup_services(hass)
+        await shared.async_refresh()
+        await coordinator.async_refresh()
+        sent = len(session.requests)
+
+        first, second = await asyncio.gather(
+            call_refresh(hass, min_age=0), call_refresh(hass, min_age=0)
+        )
+        # A scheduled poll afterwards is not added to either call
+        await shared.async_refresh()
+
+        assert (first["requests"], first["coalesced"]) == (2, 0)
+        assert (second["requests"], second["coalesced"]) == (0, 2)
+        assert len(session.requests) == sent + 2 + 1
+
+        await coordinator.async_shutdown()
+        await shared.async_shutdown()
+
+    run(test)
@@ -0,0 +1,144 @@
+"""Tests for the worker registry."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from datetime import timedelta
+
+from homeassistant import config_entries
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr
+
+from benchmarks.harness import async_bench_hass
+from custom_components.public_pool.const import DOMAIN
+from custom_components.public_pool.worker_registry import PublicPoolWorkerRegistry
+
+
+ENTRY_ID = "test"
+GRACE_PERIOD = timedelta(hours=1)
+
+
+def run(test: Callable[[HomeAssistant], Awaitable[None]]) -> None:
+    """Run test with a Home Assistant instance holding a config entry."""
+
+    async def _run() -> None:
+        async with async_bench_hass() as hass:
+            entry = config_entries.ConfigEntry(
+                version=1,
+                minor_version=1,
+                domain=DOMAIN,
+                title="test",
+                data={},
+                source="user",
+                entry_id=ENTRY_ID,
+            )
+            hass.config_entries._entries[entry.entry_id] = entry
+            await test(hass)
+
+    asyncio.run(_run())
+
+
+def identifier(address: str, worker_name: str) -> str:
+    """Return the device identifier of a worker."""
+    return f"{ENTRY_ID}_worker_{address}_{worker_name}"
+
+
+def create_device(hass: HomeAssistant, address: str, worker_name: str) -> None:
+    """Register the device of a worker."""
+    dr.async_get(hass).async_get_or_create(
+        config_entry_id=ENTRY_ID,
+        identifiers={(DOMAIN, identifier(address, worker_name))},
+        name=worker_name,
+    )
+
+
+def has_device(hass: HomeAssistant, address: str, worker_name: str) -> bool:
+    """Return whether the device of a worker is registered."""
+    device = dr.async_get(hass).async_get_device(
+        identifiers={(DOMAIN, identifier(address, worker_name))}
+    )
+    return device is not None
+
+
+def age(registry: PublicPoolWorkerRegistry, delta: timedelta) -> None:
+    """Move the time workers went missing delta into the past."""
+    for since in (registry._missing, registry._orphans):
+        for key in since:
+            since[key] -= delta
+
+
+def test_only_new_workers_are_returned() -> None:
+    """Workers are reported once, and not again after a short absence."""
+
+    async def test(hass: HomeAssistant) -> None:
+        registry = PublicPoolWorkerRegistry(hass, ENTRY_ID, GRACE_PERIOD, identifier)
+
+        assert registry.async_reconcile([("a", "rig1"), ("a", "rig2")]) == {
+            ("a", "rig1"),
+            ("a", "rig2"),
+        }
+        assert registry.async_reconcile([("a", "rig1"), ("a", "rig2")]) == set()
+        assert registry.async_reconcile([("a", "rig1"), ("b", "rig1")]) == {("b", "rig1")}
+        assert registry.async_reconcile([("a", "rig1"), ("a", "rig2")]) == set()
+        assert registry._missing.keys() == {("b", "rig1")}
+
+    run(test)
+
+
+def test_departed_workers_are_removed_after_the_grace_period() -> None:
+    """A worker missing beyond the grace period loses its device."""
+
+    async def test(hass: HomeAssistant) -> None:
+        registry = PublicPoolWorkerRegistry(hass, ENTRY_ID, GRACE_PERIOD, identifier)
+        for worker_name in ("rig1", "rig2"):
+            create_device(hass, "a", worker_name)
+        registry.async_reconcile([("a", "rig1"), ("a", "rig2")])
+
+        registry.async_reconcile([("a", "rig1")])
+        age(registry, GRACE_PERIOD / 2)
+        registry.async_reconcile([("a", "rig1")])
+        assert has_device(hass, "a", "rig2")
+
+        age(registry, GRACE_PERIOD / 2)
+        registry.async_reconcile([("a", "rig1")])
+        assert not has_device(hass, "a", "rig2")
+        assert has_device(hass, "a", "rig1")
+        # A worker coming back after removal gets entities again
+        assert registry.async_reconcile([("a", "rig1"), ("a", "rig2")]) == {("a", "rig2")}
+
+    run(test)
+
+
+def test_without_grace_period_departed_workers_are_kept() -> None:
+    """Without a grace period no device is ever removed."""
+
+    async def test(hass: HomeAssistant) -> None:
+        registry = PublicPoolWorkerRegistry(hass, ENTRY_ID, None, identifier)
+        create_device(hass, "a", "rig1")
+        registry.async_reconcile([("a", "rig1")])
+
+        registry.async_reconcile([])
+        age(registry, timedelta(days=365))
+        registry.async_reconcile([])
+        assert has_device(hass, "a", "rig1")
+
+    run(test)
+
+
+def test_orphaned_devices_are_pruned() -> None:
+    """Worker devices of a previous run are removed unless reported in time."""
+
+    async def test(hass: HomeAssistant) -> None:
+        for worker_name in ("rig1", "rig2"):
+            create_device(hass, "a", worker_name)
+        registry = PublicPoolWorkerRegistry(hass, ENTRY_ID, GRACE_PERIOD, identifier)
+        registry.async_load_orphans()
+        assert registry._orphans.keys() == {identifier("a", "rig1"), identifier("a", "rig2")}
+
+        registry.async_reconcile([("a", "rig1")])
+        age(registry, GRACE_PERIOD)
+        registry.async_reconcile([("a", "rig1")])
+        assert has_device(hass, "a", "rig1")
+        assert not has_device(hass, "a", "rig2")
+
+    run(test)
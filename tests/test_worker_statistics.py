@@ -0,0 +1,73 @@
+"""Tests for the hourly worker statistics."""
+from __future__ import annotations
+
+import json
+
+from homeassistant.components.recorder.statistics import valid_statistic_id
+
+from custom_components.public_pool.worker_statistics import (
+    HOUR,
+    WorkerStatistics,
+    worker_statistic_id,
+)
+
+
+START = 1_700_000_000 - 1_700_000_000 % HOUR
+
+
+def test_hour_aggregates() -> None:
+    """Samples within an hour are kept as sum, count, minimum and maximum."""
+    statistics = WorkerStatistics()
+    assert statistics.roll(START + 10) is None
+
+    statistics.add("a", ["rig1", "rig2"], [2.0, 5.0])
+    statistics.add("a", ["rig1", "rig2"], [1.0, 5.0])
+    statistics.add("a", ["rig1"], [3.0])
+    statistics.add("b", ["rig1"], [7.0])
+    assert statistics.roll(START + HOUR - 1) is None
+
+    hour, workers = statistics.roll(START + HOUR)
+    assert hour == START
+    assert workers == {
+        ("a", "rig1"): [6.0, 3, 1.0, 3.0],
+        ("a", "rig2"): [10.0, 2, 5.0, 5.0],
+        ("b", "rig1"): [7.0, 1, 7.0, 7.0],
+    }
+    assert statistics.workers == {}
+    assert statistics.hour == START + HOUR
+
+
+def test_hour_without_samples_writes_nothing() -> None:
+    """An hour without samples, or skipped entirely, returns no aggregates."""
+    statistics = WorkerStatistics()
+    statistics.roll(START)
+    assert statistics.roll(START + HOUR) is None
+
+    statistics.add("a", ["rig1"], [1.0])
+    # Hours the integration did not run in are skipped
+    hour, _ = statistics.roll(START + 5 * HOUR)
+    assert hour == START + HOUR
+    assert statistics.hour == START + 5 * HOUR
+
+
+def test_round_trip_through_json() -> None:
+    """A saved hour restores with its aggregates."""
+    statistics = WorkerStatistics()
+    statistics.roll(START)
+    statistics.add("a", ["rig1", "rig2"], [2.0, 5.0])
+
+    restored = WorkerStatistics.from_dict(json.loads(json.dumps(statistics.as_dict())))
+    assert restored.hour == START
+    assert restored.workers == statistics.workers
+    restored.add("a", ["rig1"], [4.0])
+    assert restored.workers[("a", "rig1")] == [6.0, 2, 2.0, 4.0]
+
+
+def test_statistic_ids() -> None:
+    """Ids are valid, and names that slugify alike keep separate ids."""
+    assert worker_statistic_id("bc1qa", "rig1") == "public_pool:bc1qa_rig1_hashrate"
+
+    ids = {worker_statistic_id("bc1qa", name) for name in ("rig-1", "rig_1", "Rig 1", "")}
+    assert len(ids) == 4
+    assert all(valid_statistic_id(statistic_id) for statistic_id in ids)
+    assert worker_statistic_id("bc1qa", "rig-1") == worker_statistic_id("bc1qa", "rig-1")